@@ -1,9 +1,5 @@
-from concurrent.futures import ThreadPoolExecutor  
 import streamlit as st  
-import tempfile  
-from pathlib import Path  
-from pptx import Presentation  
-from spellchecker import SpellChecker  
+import io  
 import language_tool_python  
 import csv  
 import re  
@@ -11,26 +7,28 @@ import string
 from pptx.dml.color import RGBColor  
 import logging  
 import time  
+import uuid  
 from pydantic import BaseModel  
-from utils.highlight import highlight_ppt, save_to_csv  
-from utils.font_validation import validate_fonts_slide  
-from utils.grammar_validation import initialize_language_tool, validate_grammar_slide  
-from utils.spelling_validation import is_exempted, validate_spelling_slide  
-from utils.decimal_validation import validate_decimal_consistency  
-from utils.million_notation_validation import validate_million_notations  # Update import  
-from utils.validation import validate_tables, validate_charts  
-from config import PREDEFINED_PASSWORD, TECHNICAL_TERMS, NUMERIC_TERMS  
-  
-# Initialize LanguageTool  
-grammar_tool = initialize_language_tool()  
-  
-# Initialize SpellChecker  
-spell = SpellChecker()  
-spell.word_frequency.load_words(TECHNICAL_TERMS.union(NUMERIC_TERMS))  
+from utils.job_service import JobRejected  
+from utils.xml_extraction import count_slides  
+from utils.resources import resources  
+from config import PREDEFINED_PASSWORD  
+  
+# LanguageTool, kamus ejaan dan job service dibuat sekali per server saat pertama dipakai (lihat utils/resources.py)  
   
 # Configure logging  
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')  
   
+def issue_row(issue):  
+    # Baris tabel live: kolom yang sama dengan laporan CSV  
+    return {  
+        'slide': issue.get('slide', ''),  
+        'issue': issue.get('issue', ''),  
+        'text': issue.get('text', ''),  
+        'corrected': str(issue.get('corrected', '')),  
+        'details': issue.get('details', ''),  
+    }  
+  
 # Password Protection  
 def password_protection():  
     if "authenticated" not in st.session_state:  
@@ -47,30 +45,6 @@ def password_protection():
         return False  
     return True  
   
-def validate_slide(slide, slide_index, default_font, spell, grammar_tool, decimal_places):  
-    slide_issues = []  
-    start_time = time.time()  
-  
-    # Validate Spelling  
-    slide_issues.extend(validate_spelling_slide(slide, slide_index + 1))  
-    # Validate Fonts  
-    slide_issues.extend(validate_fonts_slide(slide, slide_index + 1, default_font))  
-    # Validate Grammar  
-    slide_issues.extend(validate_grammar_slide(slide, slide_index + 1, grammar_tool))  
-    # Validate Decimal Consistency  
-    slide_issues.extend(validate_decimal_consistency(slide, slide_index + 1, decimal_places))  
-    # Validate Million Notations  
-    slide_issues.extend(validate_million_notations(slide, slide_index + 1))  # Update function call  
-    # Validate Tables  
-    slide_issues.extend(validate_tables(slide, slide_index + 1))  
-    # Validate Charts  
-    slide_issues.extend(validate_charts(slide, slide_index + 1))  
-  
-    elapsed_time = time.time() - start_time  
-    logging.debug(f"Slide {slide_index + 1} validation completed in {elapsed_time:.2f} seconds.")  
-  
-    return slide_issues  
-  
 def main():  
     if not password_protection():  
         return  
@@ -83,78 +57,112 @@ def main():
   
     validation_option = st.radio("Validation Option:", ["All Slides", "Custom Range"])  
   
+    job_service = resources.get('job_service')  
     if uploaded_file:  
-        with tempfile.TemporaryDirectory() as tmpdir:  
-            temp_ppt_path = Path(tmpdir) / "uploaded_ppt.pptx"  
-            with open(temp_ppt_path, "wb") as f:  
-                f.write(uploaded_file.getbuffer())  
-  
-            presentation = Presentation(temp_ppt_path)  
-            total_slides = len(presentation.slides)  
-  
-            # Rentang Slide  
-            start_slide, end_slide = 1, total_slides  
-            if validation_option == "Custom Range":  
-                start_slide = st.number_input("From Slide", min_value=1, max_value=total_slides, value=1)  
-                end_slide_default = min(total_slides, 100)  
-                end_slide = st.number_input("To Slide", min_value=start_slide, max_value=total_slides, value=end_slide_default)  
-  
-            if st.button("Run Validation"):  
-                progress_bar = st.progress(0)  
-                progress_text = st.empty()  
-                issues = []  
-  
-                # Proses Paralel  
-                with ThreadPoolExecutor() as executor:  
-                    futures = []  
-                    for slide_index in range(start_slide - 1, end_slide):  
-                        slide = presentation.slides[slide_index]  
-                        futures.append(executor.submit(validate_slide, slide, slide_index, default_font, spell, grammar_tool, decimal_places))  
-  
-                    for i, future in enumerate(futures):  
-                        slide_issues = future.result()  
-                        issues.extend(slide_issues)  
-                        progress_percent = int((i + 1) / len(futures) * 100)  
-                        progress_text.text(f"Progress: {progress_percent}%")  
-                        progress_bar.progress(progress_percent / 100)  
-  
-                # Simpan Hasil  
-                csv_output_path = Path(tmpdir) / "validation_report.csv"  
-                highlighted_ppt_path = Path(tmpdir) / "highlighted_presentation.pptx"  
-                save_to_csv(issues, csv_output_path)  
-                highlight_ppt(temp_ppt_path, highlighted_ppt_path, issues)  
-  
-                # Simpan hasil di session state  
-                st.session_state['csv_output'] = csv_output_path.read_bytes()  
-                st.session_state['ppt_output'] = highlighted_ppt_path.read_bytes()  
-                st.session_state['validation_completed'] = True  
-                st.session_state['issues'] = issues  
-                st.session_state['log_output_path'] = str(Path(tmpdir) / "validation_log.txt")  
-                st.success("Validation completed!")  
-  
-                # Tulis Log  
-                log_output_path = st.session_state['log_output_path']  
-                with open(log_output_path, "w") as log_file:  
-                    for handler in logging.root.handlers[:]:  
-                        logging.root.removeHandler(handler)  
-                    logging.basicConfig(filename=log_output_path, level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')  
-                    logging.debug(f"Validation completed with {len(issues)} issues.")  
-                    for issue in issues:  
-                        logging.debug(f"Issue: {issue}")  
-  
-    # Tampilkan Tombol Unduh jika validasi telah selesai  
-    if st.session_state.get('validation_completed', False):  
-        if 'csv_output' in st.session_state:  
-            st.download_button("Download Validation Report (CSV)", st.session_state['csv_output'], file_name="validation_report.csv")  
-        if 'ppt_output' in st.session_state:  
-            st.download_button("Download Highlighted PPT", st.session_state['ppt_output'], file_name="highlighted_presentation.pptx")  
-  
-        # Tampilkan Log  
-        log_output_path = st.session_state.get('log_output_path', None)  
-        if log_output_path and Path(log_output_path).exists():  
-            with open(log_output_path, "r") as log_file:  
-                log_content = log_file.read()  
-                st.text_area("Validation Log", value=log_content, height=300)  
+        # Hanya jumlah slide yang dibaca di sini (dari ppt/presentation.xml); deck diparse dan divalidasi oleh job service  
+        total_slides = count_slides(uploaded_file)  
+  
+        # Rentang Slide  
+        start_slide, end_slide = 1, total_slides  
+        if validation_option == "Custom Range":  
+            start_slide = st.number_input("From Slide", min_value=1, max_value=total_slides, value=1)  
+            end_slide_default = min(total_slides, 100)  
+            end_slide = st.number_input("To Slide", min_value=start_slide, max_value=total_slides, value=end_slide_default)  
+  
+        if st.button("Run Validation"):  
+            try:  
+                job_id = job_service.submit(current_user(), uploaded_file.getvalue(), uploaded_file.name, default_font, decimal_places, start_slide, end_slide)  
+            except JobRejected as e:  
+                st.error(str(e))  
+            else:  
+                # Id job juga disimpan di URL supaya hasilnya tetap bisa diambil setelah refresh  
+                st.session_state['job_id'] = job_id  
+                st.query_params['job'] = job_id  
+  
+    job_id = st.session_state.get('job_id') or st.query_params.get('job')  
+    if job_id:  
+        show_job(job_service, job_id)  
+  
+def current_user():  
+    # Kunci fairness antrean: aplikasi hanya punya satu password bersama, jadi tiap browser diberi id sendiri.  
+    # Alamat IP saja tidak cukup: semua analis di belakang satu proxy akan berbagi JOB_USER_LIMIT.  
+    # Id disimpan di URL supaya tetap sama setelah halaman di-refresh; IP disertakan untuk log.  
+    client_id = st.session_state.get('client_id') or st.query_params.get('client') or uuid.uuid4().hex  
+    st.session_state['client_id'] = client_id  
+    st.query_params['client'] = client_id  
+    return f"{st.context.ip_address or 'anonymous'}/{client_id}"  
+  
+def show_job(job_service, job_id):  
+    job = job_service.get(job_id)  
+    if job is None:  
+        st.info("This validation result is no longer available. Please run the validation again.")  
+        return  
+    st.caption(f"Deck: {job.name}")  
+    progress_bar = st.progress(0)  
+    progress_text = st.empty()  
+    issue_table = st.empty()  
+    live_rows = []  
+  
+    # Halaman hanya membaca status job; validasi berjalan di service dan tidak hilang saat halaman di-refresh  
+    while True:  
+        status = job_service.status(job_id)  
+        # Slide masuk sesuai urutan selesai; tabel tumbuh tanpa menunggu slide yang lambat  
+        live_rows.extend(issue_row(issue) for issue in job.rows_since(len(live_rows)))  
+        if status['status'] == 'queued':  
+            progress_text.text(f"Queued: {status['queued_ahead']} decks ahead")  
+        elif status['total']:  
+            done, total = status['done'], status['total']  
+            elapsed = time.time() - status['started']  
+            rate = done / elapsed if elapsed > 0 else 0.0  
+            eta = (total - done) / rate if rate else 0.0  
+            progress_text.text(f"Progress: {done}/{total} slides ({int(done / total * 100)}%) - {rate:.1f} slides/s - ETA {eta:.0f} s")  
+            progress_bar.progress(done / total)  
+        # Tabel digambar ulang paling sering tiap 0,5 detik supaya deck besar tidak melambat  
+        issue_table.dataframe(live_rows)  
+        if status['finished'] is not None:  
+            break  
+        time.sleep(0.5)  
+  
+    if job.status == 'failed':  
+        st.error(f"Validation failed: {job.error}")  
+        return  
+    run_report = job.report  
+    if run_report.get('reused_slides'):  
+        st.caption(f"{run_report['reused_slides']} of {job.total} slides unchanged since an earlier upload; their results were reused.")  
+    grammar_coverage = run_report['grammar_coverage']  
+    if grammar_coverage['partial']:  
+        st.warning(f"Grammar coverage is partial: {len(grammar_coverage['unchecked'])} of {grammar_coverage['slides']} slides were not fully checked (LanguageTool slow or unavailable). See 'Grammar Not Checked' rows in the report.")  
+    if 'grammar_cache' in run_report:  
+        grammar_report = run_report['grammar_cache']  
+        st.caption(f"Grammar cache: {grammar_report['hit_rate']:.0%} hit rate, {grammar_report['bytes_saved'] / 1024:.1f} KB not re-sent to LanguageTool")  
+    with st.expander("Startup timings"):  
+        st.table([{'resource': name, 'import (ms)': round(timing['import_ms']), 'init (ms)': round(timing['init_ms']), 'available': timing['available']}  
+                  for name, timing in resources.timings().items()])  
+    st.success("Validation completed!")  
+  
+    # Tampilkan Tombol Unduh; laporan dan deck yang di-highlight disimpan di job  
+    st.download_button("Download Validation Report (CSV)", job.csv_output, file_name="validation_report.csv")  
+    st.download_button("Download Highlighted PPT", job.ppt_output, file_name="highlighted_presentation.pptx")  
+  
+    # Tulis Log ke buffer, sekali per job  
+    if st.session_state.get('log_job_id') != job_id:  
+        log_output = io.StringIO()  
+        log_handler = logging.StreamHandler(log_output)  
+        log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))  
+        logging.root.addHandler(log_handler)  
+        try:  
+            logging.debug(f"Validation completed with {len(job.issues)} issues.")  
+            for issue in job.issues:  
+                logging.debug(f"Issue: {issue}")  
+        finally:  
+            logging.root.removeHandler(log_handler)  
+        st.session_state['log_output'] = log_output.getvalue()  
+        st.session_state['log_job_id'] = job_id  
+  
+    # Tampilkan Log  
+    log_content = st.session_state.get('log_output')  
+    if log_content:  
+        st.text_area("Validation Log", value=log_content, height=300)  
   
 if __name__ == "__main__":  
     main()  
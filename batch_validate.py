@@ -0,0 +1,293 @@
+# batch_validate.py
+#
+# Headless validation of many decks, e.g. a nightly run over a file share:
+#   python batch_validate.py /share/decks "archive/**/*.pptx" one.pptx --output-dir reports
+# Each deck gets <name>.csv and <name>.jsonl in the output directory, plus summary.csv and
+# summary.json for the whole run. Decks already listed in manifest.jsonl with the same size,
+# modification time and parameters are skipped, so an interrupted run resumes where it stopped.
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from utils.highlight import save_to_csv
+from utils.pipeline import validate_deck
+from utils.resources import resources
+from config import BATCH_OUTPUT_DIR, BATCH_WORKERS
+
+MANIFEST_NAME = "manifest.jsonl"
+
+def find_decks(inputs):
+    """
+    Expand files, directories (searched recursively) and glob patterns into a
+    sorted list of unique .pptx paths. Office lock files ("~$deck.pptx") are skipped.
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = glob.glob(os.path.join(item, '**', '*.pptx'), recursive=True)
+        elif os.path.isfile(item):
+            candidates = [item]
+        else:
+            candidates = glob.glob(item, recursive=True)
+            if not candidates:
+                logging.warning(f"No decks match {item}")
+        for path in candidates:
+            if path.lower().endswith('.pptx') and not os.path.basename(path).startswith('~$') and os.path.isfile(path):
+                paths.add(os.path.abspath(path))
+    return sorted(paths)
+
+def report_name(path):
+    # Nama file laporan unik walau dua deck di folder berbeda bernama sama
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}-{hashlib.sha1(path.encode('utf-8')).hexdigest()[:8]}"
+
+def deck_key(path, params):
+    """
+    Identity of one deck validation: the file (size and mtime) plus the parameters.
+    """
+    stat = os.stat(path)
+    return hashlib.sha1(json.dumps([path, stat.st_size, stat.st_mtime_ns, params]).encode('utf-8')).hexdigest()
+
+def load_manifest(output_dir):
+    """
+    Return {path: entry} from the manifest; later lines replace earlier ones.
+    """
+    entries = {}
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return entries
+    with open(manifest_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Baris terakhir bisa terpotong kalau proses dihentikan saat menulis
+                continue
+            entries[entry['path']] = entry
+    return entries
+
+def _write_atomic(path, write):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', newline='', encoding='utf-8') as file:
+        write(file)
+    os.replace(tmp_path, path)
+
+def _write_jsonl(issues, file):
+    for issue in issues:
+        file.write(json.dumps(issue, default=str) + '\n')
+
+# Apakah worker ini mengecek grammar, diisi oleh _init_worker
+_worker_use_grammar = True
+
+def _init_worker(use_grammar):
+    global _worker_use_grammar
+    _worker_use_grammar = use_grammar
+    resources.get('spell_checker')
+    resources.get('phrase_matcher')
+    if use_grammar:
+        resources.get('grammar_tool')
+
+def validate_deck_file(path, output_dir, default_font, decimal_places, slide_threads, backend):
+    """
+    Validate one deck in a worker and write its CSV and JSONL reports.
+
+    Returns:
+    - manifest entry (without the key) describing the result.
+    """
+    start = time.perf_counter()
+    name = report_name(path)
+    entry = {'path': path, 'name': name, 'status': 'ok', 'slides': 0, 'issues': 0, 'issue_types': {}}
+    try:
+        # Klien grammar diambil per deck, supaya LanguageTool yang sempat gagal dicoba lagi.
+        # --no-grammar mematikan cek grammar, bukan klien yang hilang: tanpa baris 'Grammar Not Checked'
+        grammar_tool = resources.get('grammar_tool') if _worker_use_grammar else None
+        _, slide_records, issues = validate_deck(path, default_font, grammar_tool, decimal_places, backend=backend, mode="thread",
+                                                 max_workers=slide_threads, check_grammar=_worker_use_grammar)
+        # Laporan ditulis di worker supaya daftar issue tidak perlu dikirim balik ke proses induk
+        _write_atomic(os.path.join(output_dir, f"{name}.csv"), lambda file: save_to_csv(issues, file))
+        _write_atomic(os.path.join(output_dir, f"{name}.jsonl"), lambda file: _write_jsonl(issues, file))
+        entry.update(slides=len(slide_records), issues=len(issues), issue_types=dict(Counter(issue['issue'] for issue in issues)))
+    except Exception as e:
+        logging.error(f"Validation of {path} failed: {e}")
+        entry.update(status='error', error=f"{type(e).__name__}: {e}")
+    entry['seconds'] = time.perf_counter() - start
+    return entry
+
+def iter_deck_entries(paths, workers, use_grammar, deck_args):
+    """
+    Validate decks in a process pool and yield their manifest entries in completion order.
+
+    At most `workers` decks are in flight. When a worker process dies (OOM killer,
+    a crash in a native library) the pool breaks and every deck in flight fails
+    with BrokenProcessPool. The pool is then recreated and those decks are run
+    again one at a time: a deck that breaks the pool on its own is recorded as
+    failed, the others still get their reports.
+
+    Parameters:
+    - paths: decks to validate.
+    - workers: number of worker processes.
+    - use_grammar: passed to the workers' initializer.
+    - deck_args: arguments after the path for validate_deck_file.
+    """
+    queue = deque((path, False) for path in paths)
+    in_flight = {}
+    executor = None
+    try:
+        while queue or in_flight:
+            if executor is None:
+                executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(use_grammar,))
+            # Deck yang dicurigai mematikan worker dijalankan sendirian, supaya tidak menyeret deck lain
+            while queue and len(in_flight) < workers:
+                path, alone = queue[0]
+                if in_flight and (alone or any(running_alone for _, running_alone, _ in in_flight.values())):
+                    break
+                queue.popleft()
+                in_flight[executor.submit(validate_deck_file, path, *deck_args)] = (path, alone, time.perf_counter())
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            broken = []
+            while done:
+                for future in done:
+                    path, alone, started = in_flight.pop(future)
+                    try:
+                        yield future.result()
+                    except BrokenProcessPool:
+                        broken.append((path, alone, started))
+                # Setelah pool rusak, semua future lain ikut selesai (dengan hasil atau BrokenProcessPool)
+                done = wait(in_flight)[0] if broken else ()
+            if not broken:
+                continue
+            executor.shutdown(wait=False, cancel_futures=True)
+            executor = None
+            logging.error(f"A worker process died; restarting the pool for {len(broken)} deck(s)")
+            for path, alone, started in reversed(broken):
+                if alone or len(broken) == 1:
+                    yield {'path': path, 'name': report_name(path), 'status': 'error', 'slides': 0, 'issues': 0, 'issue_types': {},
+                           'error': "BrokenProcessPool: the worker process died while validating this deck",
+                           'seconds': time.perf_counter() - started}
+                else:
+                    queue.appendleft((path, True))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def write_summary(output_dir, entries, run_stats):
+    """
+    Write summary.csv (one row per deck) and summary.json (totals and this run's throughput).
+    """
+    def write_rows(file):
+        writer = csv.DictWriter(file, fieldnames=['path', 'status', 'slides', 'issues', 'seconds', 'report', 'error'])
+        writer.writeheader()
+        for entry in entries:
+            writer.writerow({
+                'path': entry['path'],
+                'status': entry['status'],
+                'slides': entry.get('slides', 0),
+                'issues': entry.get('issues', 0),
+                'seconds': f"{entry.get('seconds', 0.0):.2f}",
+                'report': f"{entry['name']}.csv" if entry['status'] == 'ok' else '',
+                'error': entry.get('error', ''),
+            })
+    _write_atomic(os.path.join(output_dir, 'summary.csv'), write_rows)
+
+    issue_types = Counter()
+    for entry in entries:
+        issue_types.update(entry.get('issue_types', {}))
+    summary = {
+        'decks': len(entries),
+        'ok': sum(1 for entry in entries if entry['status'] == 'ok'),
+        'failed': [entry['path'] for entry in entries if entry['status'] != 'ok'],
+        'slides': sum(entry.get('slides', 0) for entry in entries),
+        'issues': sum(entry.get('issues', 0) for entry in entries),
+        'issue_types': dict(issue_types.most_common()),
+        'run': run_stats,
+    }
+    _write_atomic(os.path.join(output_dir, 'summary.json'), lambda file: json.dump(summary, file, indent=2))
+    return summary
+
+def throughput(decks, slides, elapsed):
+    return {
+        'decks': decks,
+        'slides': slides,
+        'seconds': elapsed,
+        'decks_per_min': decks / elapsed * 60 if elapsed > 0 else 0.0,
+        'slides_per_s': slides / elapsed if elapsed > 0 else 0.0,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Validate PowerPoint decks without the web UI.")
+    parser.add_argument('inputs', nargs='+', help=".pptx files, directories or glob patterns")
+    parser.add_argument('--output-dir', default=BATCH_OUTPUT_DIR, help="directory for the per-deck reports and the summary")
+    parser.add_argument('--font', default="Arial", help="default font for the font check")
+    parser.add_argument('--decimal-places', type=int, default=1, help="expected number of decimal places")
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS or os.cpu_count(), help="decks validated in parallel (processes)")
+    parser.add_argument('--slide-threads', type=int, default=1, help="threads per deck, useful when grammar checks wait on the network")
+    parser.add_argument('--extraction', choices=["streaming", "python-pptx"], default="streaming",
+                        help="how slide text is read; streaming skips media and the python-pptx object model")
+    parser.add_argument('--no-grammar', action='store_true', help="skip LanguageTool checks")
+    parser.add_argument('--no-resume', action='store_true', help="validate every deck again, ignoring the manifest")
+    parser.add_argument('--verbose', action='store_true', help="log debug messages")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    # force: utils.highlight sudah memanggil basicConfig(DEBUG) saat diimpor
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s', force=True)
+    output_dir = os.path.abspath(args.output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    decks = find_decks(args.inputs)
+    if not decks:
+        print("No .pptx decks found.", file=sys.stderr)
+        return 2
+    params = {'font': args.font, 'decimal_places': args.decimal_places, 'grammar': not args.no_grammar}
+    keys = {path: deck_key(path, params) for path in decks}
+    manifest = {} if args.no_resume else load_manifest(output_dir)
+    done = {path: manifest[path] for path in decks
+            if path in manifest and manifest[path]['key'] == keys[path] and manifest[path]['status'] == 'ok'
+            and os.path.exists(os.path.join(output_dir, f"{manifest[path]['name']}.csv"))}
+    pending = [path for path in decks if path not in done]
+    print(f"{len(decks)} decks, {len(done)} already validated, {len(pending)} to go", file=sys.stderr)
+
+    # Kamus dimuat sebelum fork supaya semua worker berbagi halaman memorinya
+    resources.get('spell_checker')
+    resources.get('phrase_matcher')
+    results = dict(done)
+    start = time.perf_counter()
+    deck_count = slide_count = 0
+    if pending:
+        deck_args = (output_dir, args.font, args.decimal_places, args.slide_threads, args.extraction)
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'a', encoding='utf-8') as manifest_file:
+            for entry in iter_deck_entries(pending, max(1, args.workers), not args.no_grammar, deck_args):
+                entry['key'] = keys[entry['path']]
+                results[entry['path']] = entry
+                # Satu baris per deck selesai, langsung di-flush: dasar untuk melanjutkan setelah restart
+                manifest_file.write(json.dumps(entry) + '\n')
+                manifest_file.flush()
+                deck_count += 1
+                slide_count += entry['slides']
+                rate = throughput(deck_count, slide_count, time.perf_counter() - start)
+                status = f"{entry['slides']} slides, {entry['issues']} issues" if entry['status'] == 'ok' else entry['error']
+                print(f"[{deck_count}/{len(pending)}] {os.path.basename(entry['path'])}: {status} ({entry['seconds']:.1f} s) | "
+                      f"{rate['decks_per_min']:.1f} decks/min, {rate['slides_per_s']:.1f} slides/s", file=sys.stderr)
+
+    run_stats = throughput(deck_count, slide_count, time.perf_counter() - start)
+    run_stats['skipped'] = len(done)
+    summary = write_summary(output_dir, [results[path] for path in decks], run_stats)
+    print(f"Validated {deck_count} decks ({slide_count} slides) in {run_stats['seconds']:.1f} s: "
+          f"{run_stats['decks_per_min']:.1f} decks/min, {run_stats['slides_per_s']:.1f} slides/s. "
+          f"{summary['issues']} issues in {summary['decks']} decks, {len(summary['failed'])} failed. "
+          f"Summary: {os.path.join(output_dir, 'summary.json')}", file=sys.stderr)
+    return 1 if summary['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
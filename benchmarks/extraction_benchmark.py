@@ -0,0 +1,86 @@
+# benchmarks/extraction_benchmark.py
+#
+# Compare slide extraction through the python-pptx object model with the streaming XML backend
+# on a media-heavy deck: peak RSS, time until the first slide's issues are known and total time.
+# Run from the repository root: python -m benchmarks.extraction_benchmark [n_slides] [image_mb]
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from benchmarks.highlight_writer_benchmark import make_media_deck
+
+def current_rss_mb():
+    with open('/proc/self/statm') as file:
+        return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+class RssSampler(threading.Thread):
+    # ru_maxrss tertutup oleh puncak saat kamus dimuat, jadi RSS saat ini diambil sampelnya selama ekstraksi
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = current_rss_mb()
+        self.running = True
+
+    def run(self):
+        while self.running:
+            self.peak = max(self.peak, current_rss_mb())
+            time.sleep(0.002)
+
+def run_backend(path, backend):
+    # Dijalankan di proses terpisah supaya peak RSS tiap backend tidak tercampur
+    logging.basicConfig(level=logging.WARNING, force=True)
+    from pptx import Presentation
+    from utils.extraction import extract_slide
+    from utils.xml_extraction import iter_slide_records
+    from utils.pipeline import validate_slide_record
+    from utils.resources import resources
+    resources.get('spell_checker')
+    resources.get('phrase_matcher')
+    rss_before = current_rss_mb()
+    sampler = RssSampler()
+    sampler.start()
+    start = time.perf_counter()
+    if backend == "streaming":
+        records = iter_slide_records(path)
+    else:
+        presentation = Presentation(path)
+        records = (extract_slide(slide, i + 1) for i, slide in enumerate(presentation.slides))
+    first_issue = None
+    slide_records = []
+    for slide_record in records:
+        if first_issue is None:
+            validate_slide_record(slide_record, "Calibri", None, 2)
+            first_issue = time.perf_counter() - start
+        slide_records.append(slide_record)
+    elapsed = time.perf_counter() - start
+    sampler.running = False
+    sampler.join()
+    print(json.dumps({'backend': backend, 'first_issue': first_issue, 'seconds': elapsed,
+                      'peak_rss_mb': sampler.peak, 'rss_growth_mb': sampler.peak - rss_before,
+                      'slides': len(slide_records), 'records': [list(map(list, slide_record.runs)) for slide_record in slide_records]}))
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--run':
+        run_backend(sys.argv[2], sys.argv[3])
+        return
+    n_slides = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    image_mb = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "media_deck.pptx")
+        make_media_deck(path, n_slides, image_mb)
+        print(f"deck: {n_slides} slides, {os.path.getsize(path) / 1024 / 1024:.0f} MB")
+        results = {}
+        for backend in ("python-pptx", "streaming"):
+            output = subprocess.run([sys.executable, '-m', 'benchmarks.extraction_benchmark', '--run', path, backend],
+                                    capture_output=True, text=True, check=True).stdout
+            result = results[backend] = json.loads(output.strip().splitlines()[-1])
+            print(f"{backend:>11}: first slide's issues after {result['first_issue']:.2f} s, all {result['slides']} slides "
+                  f"after {result['seconds']:.2f} s, peak RSS {result['peak_rss_mb']:.0f} MB (+{result['rss_growth_mb']:.0f} MB)")
+        print(f"same records: {results['python-pptx']['records'] == results['streaming']['records']}")
+
+if __name__ == "__main__":
+    main()
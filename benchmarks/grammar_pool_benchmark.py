@@ -0,0 +1,78 @@
+# benchmarks/grammar_pool_benchmark.py
+#
+# Measure grammar throughput against local mock LanguageTool servers.
+# Run from the repository root: python -m benchmarks.grammar_pool_benchmark [n_texts] [latency_ms]
+
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+from utils.grammar_client import LanguageToolPool
+from utils.grammar_validation import check_texts
+
+class MockLanguageToolHandler(BaseHTTPRequestHandler):
+    latency = 0.05
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+        text = form.get('text', [''])[0]
+        time.sleep(self.latency)
+        matches = [{
+            'message': 'Possible spelling mistake found.',
+            'replacements': [{'value': 'the'}],
+            'offset': match.start(),
+            'length': len(match.group()),
+            'context': {'text': text, 'offset': match.start(), 'length': len(match.group())},
+            'sentence': text,
+            'rule': {'id': 'MORFOLOGIK_RULE_EN_US', 'category': {'id': 'TYPOS'}, 'issueType': 'misspelling'},
+        } for match in re.finditer(r'\bteh\b', text)]
+        body = json.dumps({'matches': matches}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_mock_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockLanguageToolHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def main():
+    n_texts = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    MockLanguageToolHandler.latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    texts = [f"Run {i} of teh slide with some revenue commentary." for i in range(n_texts)]
+
+    servers = [start_mock_server() for _ in range(2)]
+    urls = [url for _, url in servers]
+
+    # Cara lama: satu request per run, berurutan
+    single = LanguageToolPool(urls[:1], max_in_flight=1)
+    start = time.perf_counter()
+    expected = [single.check(text) for text in texts]
+    sequential_time = time.perf_counter() - start
+
+    # max_chars=1 sends every run on its own, so only the pool concurrency helps
+    for max_chars in (1, 2000, 15000):
+        pool = LanguageToolPool(urls, max_in_flight=8)
+        start = time.perf_counter()
+        results = check_texts(pool, texts, max_chars=max_chars)
+        pooled_time = time.perf_counter() - start
+        same = [len(matches) for matches in results] == [len(matches) for matches in expected]
+        print(f"pool, max_chars={max_chars:>5}:  {pooled_time:.2f} s, {n_texts / pooled_time:.0f} texts/s, same matches: {same}")
+        pool.close()
+
+    print(f"sequential, one per run: {sequential_time:.2f} s, {n_texts / sequential_time:.0f} texts/s")
+    for server, _ in servers:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
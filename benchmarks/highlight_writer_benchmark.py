@@ -0,0 +1,137 @@
+# benchmarks/highlight_writer_benchmark.py
+#
+# Compare presentation.save() with the zip passthrough writer on a media-heavy deck, after
+# checking that both writers give the same slides on a deck whose slides were reordered.
+# Run from the repository root: python -m benchmarks.highlight_writer_benchmark [n_slides] [image_mb]
+
+import io
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Inches
+
+def make_media_deck(path, n_slides, image_mb):
+    from PIL import Image
+    side = int((image_mb * 1024 * 1024 / 3) ** 0.5)
+    presentation = Presentation()
+    layout = presentation.slide_layouts[5]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(n_slides):
+            # Noise tidak bisa dikompresi, seperti foto di deck klien
+            image_path = os.path.join(tmpdir, f"image{i}.png")
+            Image.frombytes('RGB', (side, side), os.urandom(side * side * 3)).save(image_path, compress_level=1)
+            slide = presentation.slides.add_slide(layout)
+            slide.shapes.title.text = f"Revenue bridge {i}"
+            slide.shapes.add_picture(image_path, Inches(1), Inches(1.5), Inches(4))
+            body = slide.shapes.add_textbox(Inches(5.5), Inches(1.5), Inches(4), Inches(2)).text_frame
+            body.text = "The companny reported 1.25m revenue and 3mn EBITDA" if i % 3 == 0 else "Net debt stable year on year"
+    presentation.save(path)
+
+def reorder_slides(path, order):
+    """
+    Rewrite p:sldIdLst of the deck at `path` so slide `order[k]` (1-based) comes
+    k-th, like moving slides in PowerPoint: the members keep their names, so
+    slide1.xml is no longer the first slide.
+    """
+    with zipfile.ZipFile(path) as package:
+        members = [(info, package.read(info.filename)) for info in package.infolist()]
+    for index, (info, data) in enumerate(members):
+        if info.filename == 'ppt/presentation.xml':
+            root = etree.fromstring(data)
+            slide_list = root.find('{http://schemas.openxmlformats.org/presentationml/2006/main}sldIdLst')
+            slide_ids = list(slide_list)
+            slide_list[:] = [slide_ids[number - 1] for number in order]
+            members[index] = (info, etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True))
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as package:
+        for info, data in members:
+            package.writestr(info, data)
+
+def deck_summary(data):
+    # Per slide: teks, run yang di-highlight dan hash gambar, untuk membandingkan hasil kedua writer
+    summary = []
+    for slide in Presentation(io.BytesIO(data)).slides:
+        texts, highlighted, images = [], [], []
+        for shape in slide.shapes:
+            if shape.shape_type == 13:  # MSO_SHAPE_TYPE.PICTURE
+                images.append(hashlib.sha1(shape.image.blob).hexdigest())
+            if shape.has_text_frame:
+                texts.append(shape.text_frame.text)
+                highlighted.extend(run.text for paragraph in shape.text_frame.paragraphs for run in paragraph.runs
+                                   if run.font.color.type is not None and str(run.font.color.rgb) == 'FFFF00')
+        summary.append((texts, highlighted, images))
+    return summary
+
+def check_reordered_deck(tmpdir):
+    """
+    Highlight a deck with reordered slides with both writers and check that the
+    passthrough output has the same slides, highlights and pictures as the
+    save() output, in the same order.
+    """
+    from utils.highlight import highlight_to_buffer
+    from utils.pipeline import validate_deck
+    path = os.path.join(tmpdir, "reordered_deck.pptx")
+    make_media_deck(path, 4, 0.05)
+    reorder_slides(path, (3, 1, 4, 2))
+    summaries = {}
+    for mode in ("save", "passthrough"):
+        presentation, _, issues = validate_deck(path, "Calibri", None, 2, mode="thread", backend="python-pptx")
+        summaries[mode] = deck_summary(highlight_to_buffer(path, presentation, issues, output_mode=mode).getvalue())
+    titles = [texts[0] for texts, _, _ in summaries["save"]]
+    if summaries["passthrough"] != summaries["save"]:
+        raise SystemExit(f"reordered deck: passthrough output differs from save()\n"
+                         f"  save:        {summaries['save']}\n  passthrough: {summaries['passthrough']}")
+    if not any(highlighted for _, highlighted, _ in summaries["save"]):
+        raise SystemExit("reordered deck: no run was highlighted")
+    print(f"reordered deck ({', '.join(titles)}): passthrough matches save()")
+
+def run_mode(path, mode):
+    # Dijalankan di proses terpisah supaya peak RSS tiap mode tidak tercampur
+    from utils.extraction import extract_slide
+    from utils.pipeline import validate_slides
+    from utils.highlight import highlight_to_buffer
+    presentation = Presentation(path)
+    records = [extract_slide(slide, i + 1) for i, slide in enumerate(presentation.slides)]
+    issues = validate_slides(records, "Calibri", None, 2, mode="thread")
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    buffer = highlight_to_buffer(path, presentation, issues, output_mode=mode)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    highlighted = sum(
+        1 for slide in Presentation(io.BytesIO(buffer.getvalue())).slides for shape in slide.shapes if shape.has_text_frame
+        for paragraph in shape.text_frame.paragraphs for run in paragraph.runs
+        if run.font.color.type is not None and str(run.font.color.rgb) == 'FFFF00'
+    )
+    print(json.dumps({'mode': mode, 'seconds': elapsed, 'peak_rss_mb': rss_after / 1024,
+                      'rss_growth_mb': (rss_after - rss_before) / 1024, 'bytes': len(buffer.getvalue()),
+                      'highlighted_runs': highlighted, 'issues': len(issues)}))
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--run':
+        run_mode(sys.argv[2], sys.argv[3])
+        return
+    n_slides = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    image_mb = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with tempfile.TemporaryDirectory() as tmpdir:
+        check_reordered_deck(tmpdir)
+        path = os.path.join(tmpdir, "media_deck.pptx")
+        make_media_deck(path, n_slides, image_mb)
+        print(f"deck: {n_slides} slides, {os.path.getsize(path) / 1024 / 1024:.0f} MB")
+        for mode in ("save", "passthrough"):
+            output = subprocess.run([sys.executable, '-m', 'benchmarks.highlight_writer_benchmark', '--run', path, mode],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:>11}: {result['seconds']:.2f} s, peak RSS {result['peak_rss_mb']:.0f} MB "
+                  f"(+{result['rss_growth_mb']:.0f} MB while writing), {result['bytes'] / 1024 / 1024:.0f} MB out, "
+                  f"{result['highlighted_runs']} highlighted runs for {result['issues']} issues")
+
+if __name__ == "__main__":
+    main()
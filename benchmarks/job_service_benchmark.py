@@ -0,0 +1,129 @@
+# benchmarks/job_service_benchmark.py
+#
+# Load test: N analysts submit a deck at the same moment. Compares one thread pool per session
+# (the old Streamlit flow) with the shared job service, and measures how long small decks wait
+# while a large deck is being validated. Grammar checks are off so only the CPU side is measured.
+# Run from the repository root: python -m benchmarks.job_service_benchmark [max_users] [slides]
+
+import io
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from pptx import Presentation
+from pptx.util import Inches
+from utils.highlight import highlight_to_buffer, save_to_csv
+from utils.pipeline import validate_deck
+from utils.resources import resources
+
+WORDS = ("revenue increased by 5M in FY24 versus 3mn in FY23 the companny reported EBITDA of $1.25 Million "
+         "and net debt of 12,5 Juta while working capitl improved 1,000 units adjustmnts normalised 1Q21").split()
+
+def no_grammar_tool():
+    return None
+
+def make_text_deck(n_slides, seed=0):
+    presentation = Presentation()
+    layout = presentation.slide_layouts[5]
+    for i in range(n_slides):
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = f"Revenue bridge {i}"
+        body = slide.shapes.add_textbox(Inches(0.5), Inches(1.5), Inches(5), Inches(3)).text_frame
+        for p in range(6):
+            paragraph = body.paragraphs[0] if p == 0 else body.add_paragraph()
+            paragraph.text = " ".join(WORDS[(seed + i * 7 + p * 3 + k) % len(WORDS)] for k in range(14))
+        table = slide.shapes.add_table(4, 4, Inches(5.5), Inches(1.5), Inches(4), Inches(2)).table
+        for r in range(4):
+            for c in range(4):
+                table.cell(r, c).text = WORDS[(seed + i + r * 4 + c) % len(WORDS)] + f" {r * c + i}.5m"
+    buffer = io.BytesIO()
+    presentation.save(buffer)
+    return buffer.getvalue()
+
+def summarize(latencies, elapsed):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))]
+    return (f"p50 {statistics.median(latencies):6.2f} s, p95 {p95:6.2f} s, max {latencies[-1]:6.2f} s, "
+            f"{len(latencies) / elapsed * 60:6.1f} decks/min")
+
+def session_flow(data):
+    # Cara lama: setiap sesi membuat ThreadPoolExecutor sendiri, lalu menulis CSV dan deck yang di-highlight
+    presentation, _, issues = validate_deck(io.BytesIO(data), "Arial", None, 1, mode="thread")
+    save_to_csv(issues, io.StringIO())
+    highlight_to_buffer(io.BytesIO(data), presentation, issues)
+
+def run_per_session(decks):
+    latencies = []
+    lock = threading.Lock()
+    start = time.perf_counter()
+
+    def session(data):
+        session_flow(data)
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(data,)) for data in decks]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - start
+
+def run_job_service(service, decks, users=None):
+    start = time.perf_counter()
+    users = users or [f"user{i}" for i in range(len(decks))]
+    job_ids = [service.submit(user, data, f"{user}.pptx", "Arial", 1) for user, data in zip(users, decks)]
+    latencies = {}
+    while len(latencies) < len(job_ids):
+        for job_id in job_ids:
+            if job_id not in latencies:
+                status = service.status(job_id)
+                if status['finished'] is not None:
+                    latencies[job_id] = status['finished'] - status['submitted']
+        time.sleep(0.01)
+    return [latencies[job_id] for job_id in job_ids], time.perf_counter() - start
+
+def main():
+    logging.basicConfig(level=logging.WARNING, force=True)
+    max_users = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    n_slides = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    # Tanpa LanguageTool: yang diukur hanya pembagian CPU
+    resources.register('grammar_tool', 'benchmarks.job_service_benchmark', 'no_grammar_tool', per_process=True)
+    from utils.job_service import JobService
+    service = JobService(max_queued=4 * max_users, max_per_user=max_users)
+    print(f"{os.cpu_count()} CPUs, {n_slides}-slide decks, shared pool of {service.workers} {service.mode} workers")
+
+    users = 1
+    while users <= max_users:
+        decks = [make_text_deck(n_slides, seed) for seed in range(users)]
+        per_session = summarize(*run_per_session(decks))
+        shared = summarize(*run_job_service(service, decks))
+        print(f"{users:2d} users  per-session pools: {per_session}")
+        print(f"{'':9}job service:       {shared}")
+        users *= 2
+
+    # Deck kecil dari analis lain tidak menunggu sampai deck besar selesai
+    large = make_text_deck(n_slides * 10, seed=99)
+    small = [make_text_deck(max(1, n_slides // 6), seed) for seed in range(3)]
+    for name, runner in (("per-session pools", None), ("job service", service)):
+        start = time.perf_counter()
+        if runner is None:
+            threads = [threading.Thread(target=session_flow, args=(large,))]
+            threads[0].start()
+            time.sleep(0.2)
+            latencies, _ = run_per_session(small)
+            threads[0].join()
+        else:
+            large_id = service.submit("analyst-large", large, "large.pptx", "Arial", 1)
+            time.sleep(0.2)
+            latencies, _ = run_job_service(service, small, [f"analyst-{i}" for i in range(len(small))])
+            while service.status(large_id)['finished'] is None:
+                time.sleep(0.01)
+        total = time.perf_counter() - start
+        print(f"small decks next to a {n_slides * 10}-slide deck, {name}: small p50 {statistics.median(latencies):.2f} s, "
+              f"max {max(latencies):.2f} s; everything done after {total:.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/million_notation_benchmark.py
+#
+# Compare the old per-pattern million notation and decimal regexes with the shared numeric lexer.
+# Run from the repository root: python -m benchmarks.million_notation_benchmark [n_runs]
+
+import random
+import re
+import sys
+import time
+from utils.million_notation_validation import scan_million_notations
+from utils.numeric_lexer import lex_numbers
+
+# Pola lama: tujuh regex, masing-masing dijalankan ulang per run
+LEGACY_PATTERNS = {
+    r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*[Mm]\b': 'M',
+    r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*Million\b': 'Million',
+    r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*mn\b': 'mn',
+    r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*m\b': 'm',
+    r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*MM\b': 'MM',
+    r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*Millions\b': 'Millions',
+    r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*Juta\b': 'Juta',
+}
+
+TEMPLATES = [
+    "Revenue grew to {v}{s} in FY23 driven by volume",
+    "Normalised EBITDA of {c}{v} {s} after adjustments",
+    "Net debt {v}{s}",
+    "Capex remained flat year on year",
+    "Working capital of {c}{v}{s} at close, see appendix",
+    "Headcount increased by 12% to 1,250 FTEs",
+]
+SUFFIXES = ["M", "m", "mn", "MM", "Million", "Millions", "Juta", ""]
+
+def make_runs(n_runs, seed=11):
+    random.seed(seed)
+    runs = []
+    for _ in range(n_runs):
+        value = random.choice(["5", "12.5", "1,250", "1,250.75", "300"])
+        text = random.choice(TEMPLATES).format(v=value, s=random.choice(SUFFIXES), c=random.choice(["", "$", "€ "]))
+        # Setiap run unik supaya cache lexer tidak ikut diukur
+        runs.append(f"{text} ref{len(runs)}")
+    return runs
+
+LEGACY_DECIMAL_PATTERN = re.compile(r'\b\d+[\.,]\d+\b')
+
+def legacy_scan(text):
+    matches = []
+    for pattern in LEGACY_PATTERNS:
+        matches.extend(re.findall(pattern, text, re.IGNORECASE))
+    return matches
+
+def main():
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    runs = make_runs(n_runs)
+
+    start = time.perf_counter()
+    legacy = [legacy_scan(text) for text in runs]
+    legacy_time = time.perf_counter() - start
+
+    lex_numbers.cache_clear()
+    start = time.perf_counter()
+    scanned = [scan_million_notations(text) for text in runs]
+    scan_time = time.perf_counter() - start
+
+    # Teks lama bisa diawali spasi, jadi bandingkan set teks yang sudah di-strip
+    differences = sum(
+        1 for old, new in zip(legacy, scanned)
+        if {match.strip() for match in old} != {notation.text for notation in new}
+    )
+    print(f"runs: {n_runs}, runs with different matches: {differences}")
+    print(f"legacy (7 patterns): {legacy_time:.2f} s, {legacy_time / n_runs * 1e6:.2f} us/run")
+    print(f"single scanner:      {scan_time:.2f} s, {scan_time / n_runs * 1e6:.2f} us/run ({legacy_time / scan_time:.1f}x)")
+
+    # Kedua aturan angka pada run yang sama: regex terpisah vs satu kali lexing
+    lex_numbers.cache_clear()
+    start = time.perf_counter()
+    for text in runs:
+        legacy_scan(text)
+        LEGACY_DECIMAL_PATTERN.findall(text)
+    legacy_both = time.perf_counter() - start
+
+    lex_numbers.cache_clear()
+    start = time.perf_counter()
+    for text in runs:
+        scan_million_notations(text)
+        [token for token in lex_numbers(text) if token.separator]
+    lexer_both = time.perf_counter() - start
+    print(f"million + decimal, separate regexes: {legacy_both / n_runs * 1e6:.2f} us/run")
+    print(f"million + decimal, shared lexer:     {lexer_both / n_runs * 1e6:.2f} us/run ({legacy_both / lexer_both:.1f}x)")
+
+if __name__ == "__main__":
+    main()
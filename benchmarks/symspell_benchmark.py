@@ -0,0 +1,64 @@
+# benchmarks/symspell_benchmark.py
+#
+# Compare SpellChecker.correction() with the SymSpell index on a reference word list.
+# Run from the repository root: python -m benchmarks.symspell_benchmark [n_words]
+
+import random
+import sys
+import time
+from utils.spelling_validation import spell
+from utils.symspell import SymSpellIndex
+
+# Token yang sering muncul di deck keuangan
+DECK_WORDS = ["companny", "teh", "summry", "adjustmnts", "capitl", "Recrod", "ngagement", "ransaction",
+              "EBIDTA", "recuring", "accurals", "normalsed", "Revenu", "xyzzyq", "4q23x", "FY2O"]
+
+def make_reference_words(n_words, seed=3):
+    random.seed(seed)
+    words = sorted(word for word in spell.word_frequency.dictionary if word.isalpha())
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    reference = []
+    for _ in range(n_words):
+        word = random.choice(words)
+        for _ in range(random.choice([1, 1, 2, 3])):
+            op = random.randrange(4)
+            i = random.randrange(len(word) + 1)
+            if op == 0 and len(word) > 1:
+                word = word[:i] + word[i + 1:]
+            elif op == 1:
+                word = word[:i] + random.choice(letters) + word[i:]
+            elif op == 2 and i < len(word):
+                word = word[:i] + random.choice(letters) + word[i + 1:]
+            elif i < len(word) - 1:
+                word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        reference.append(word)
+    return reference + DECK_WORDS
+
+def main():
+    n_words = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    reference = make_reference_words(n_words)
+
+    start = time.perf_counter()
+    index = SymSpellIndex(spell.word_frequency.dictionary, spell.distance)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [spell.correction(word) for word in reference]
+    pyspell_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [index.correction(word) for word in reference]
+    symspell_time = time.perf_counter() - start
+
+    mismatches = [(word, a, b) for word, a, b in zip(reference, expected, actual) if a != b]
+    print(f"Reference words:      {len(reference)}")
+    print(f"Index build:          {build_time:.2f} s ({len(index)} delete keys)")
+    print(f"pyspellchecker:       {pyspell_time:.2f} s ({pyspell_time / len(reference) * 1000:.2f} ms/word)")
+    print(f"SymSpell index:       {symspell_time:.2f} s ({symspell_time / len(reference) * 1000:.2f} ms/word)")
+    print(f"Speedup:              {pyspell_time / symspell_time:.1f}x")
+    print(f"Top-suggestion diffs: {len(mismatches)}")
+    for word, a, b in mismatches[:20]:
+        print(f"  {word!r}: pyspellchecker={a!r} symspell={b!r}")
+
+if __name__ == "__main__":
+    main()
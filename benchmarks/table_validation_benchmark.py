@@ -0,0 +1,63 @@
+# benchmarks/table_validation_benchmark.py
+#
+# Validate a databook-style table (repeated headers and row labels, numbers in every column)
+# with the old per-cell loop plus the whole-slide million notation rescan, and with the
+# cell-deduplicated, column-wise table validation.
+# Run from the repository root: python -m benchmarks.table_validation_benchmark [rows] [cols]
+
+import logging
+import sys
+import time
+from utils.extraction import RunRecord, SlideRecord, TABLE_CELL, TEXT_FRAME
+from utils.million_notation_validation import validate_million_notations
+from utils.spelling_validation import build_deck_vocabulary, validate_spelling_in_text
+from utils.validation import validate_tables
+
+LABELS = ("Revenue", "Cost of sales", "Gross proffit", "EBITDA", "Depreciation", "Net debt", "Working capitl", "Headcount")
+
+def make_table_slide(n_rows, n_cols):
+    runs = [RunRecord("Financial overview (EUR m)", None, 1, 0, 0, TEXT_FRAME, None),
+            RunRecord("Revenue of 5.2m versus 3 mn", None, 1, 1, 0, TEXT_FRAME, None)]
+    for row in range(n_rows):
+        for col in range(n_cols):
+            if row % 20 == 0:
+                # Header diulang per blok, seperti tabel databook yang dipotong per halaman
+                text = "Entity" if col == 0 else f"FY{20 + col % 5} Actual"
+            elif col == 0:
+                text = LABELS[row % len(LABELS)]
+            else:
+                value = (row * 7 + col * 3) % 50
+                text = f"{value}.{row % 10}m" if (row + col) % 97 else f"{value}.{row % 10}5 mn"
+            runs.append(RunRecord(text, None, 2, None, None, TABLE_CELL, (row, col)))
+    return SlideRecord(1, tuple(runs))
+
+def legacy_validate_tables(slide_record, slide_index, vocabulary=None):
+    issues = []
+    for cell in slide_record.runs:
+        if cell.origin == TABLE_CELL and cell.text.strip():
+            issues.extend(validate_spelling_in_text(cell.text, slide_index, vocabulary, cell))
+    issues.extend(validate_million_notations(slide_record, slide_index))
+    return issues
+
+def main():
+    logging.basicConfig(level=logging.WARNING, force=True)
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    n_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    slide_record = make_table_slide(n_rows, n_cols)
+    print(f"{n_rows} x {n_cols} table, {len({run.text for run in slide_record.runs})} distinct cell texts")
+    # Mode "deck" memakai vocabulary yang sudah diselesaikan; mode "run" mencari tiap kata di kamus
+    for spelling_mode, vocabulary in (("deck", build_deck_vocabulary([slide_record])), ("run", None)):
+        for name, validate in (("per-cell", legacy_validate_tables), ("column-wise", validate_tables)):
+            validate(slide_record, 1, vocabulary)
+            start = time.perf_counter()
+            for _ in range(10):
+                issues = validate(slide_record, 1, vocabulary)
+            elapsed = (time.perf_counter() - start) / 10
+            counts = {}
+            for issue in issues:
+                counts[issue['issue']] = counts.get(issue['issue'], 0) + 1
+            print(f"{spelling_mode:>4} {name:>11}: {elapsed * 1000:7.1f} ms per slide, {len(issues)} issues "
+                  f"({sum(len(issue.get('locations', [])) for issue in issues)} locations) {counts}")
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,19 @@
 # config.py
 
+import os
+
 PREDEFINED_PASSWORD = "securepassword123"  
   
 TECHNICAL_TERMS = {  
-    "23-Sep", "dt", "Nov", "FY20", "FY21", "eriod", "PPC", "Baorong", "22-May", "22-Dec", "23-Feb", "outturn", "11m23", "€", 
-    "NWC", "payables", "Q", "illustrative", "VDR", "Srl", "Sep23A", "cont", "SKU", "Normalised", "Jul22A", "Jul23A", 
-    "Sep22A", "Ene", "rgy", "Jun23A", "Adj", "accruals", "MBO", "FY23", "0m", "recuring", "DC", "OctA22", "adj", "EUR", "IFRS", 
+    "dt", "Nov", "eriod", "PPC", "Baorong", "outturn", "€", 
+    "NWC", "payables", "Q", "illustrative", "VDR", "Srl", "cont", "SKU", "Normalised", 
+    "Ene", "rgy", "Adj", "accruals", "MBO", "recuring", "DC", "adj", "EUR", "IFRS", 
     "R", "COVID19", "Unabsorbed", "unabsorbed", "FX", "G", "EPC", "indemnities", "DD", "Accruals", "EOSB", "St", "Yorre", "adequacy", 
-    "unaudited", "LFL", "Overstock", "23-Jan", "Nov23A", "LTM", "Reclassification", "CAPEX", "BNP", "Intesa", "v", "DTA", "CIT", 
-    "quantification", "Luxco", "litigations", "PPCAI", "capex", "FY14", "PPA", "HR", "USD", "RMB", "lockdowns", "1Q21", "2Q21", "23-Jul", "btain", 
-    "FDD", "w", "r", "FY24", "FY28", "CAGR", "ackaging", "SP", "excl", "BP", "G", "overestimation", "refurbishments", "DSO", "invoicing", "DPO", "reve", 
-    "nue", "4Q23", "X", "3_Seves", "NCI", "AFS", "Ctrl", "K",
-    "m", "b", "c", "d", "vs", "Apr", "22-May", "22-Dec", "23-Feb", "Forex", "forex", "OWC",
+    "unaudited", "LFL", "Overstock", "LTM", "Reclassification", "CAPEX", "BNP", "Intesa", "v", "DTA", "CIT", 
+    "quantification", "Luxco", "litigations", "PPCAI", "capex", "PPA", "HR", "USD", "RMB", "lockdowns", "btain", 
+    "FDD", "w", "r", "CAGR", "ackaging", "SP", "excl", "BP", "G", "overestimation", "refurbishments", "DSO", "invoicing", "DPO", "reve", 
+    "nue", "X", "3_Seves", "NCI", "AFS", "Ctrl", "K",
+    "m", "b", "c", "d", "vs", "Apr", "Forex", "forex", "OWC",
     "Sediver", "CoV", "quantitatively", "th", "databooks", "ngagement", "ransaction", "fr", "T", "Appendices", 
     "LATAM", "insulators", "Sediver", "Acquiror", "Nusco", "P", "LTDA", "roposed",
     "IfError", "s", "Sarl", "SEVES", "XYZG", "Galova", "galova", "fayet", "Fayet", "Sarl", "KMPG",
@@ -31,206 +33,78 @@ TECHNICAL_TERMS = {
     "Quantum Computing", "Augmented Reality", "Virtual Reality", "3D Printing", "Cybersecurity",  
     "Penetration Testing", "Phishing", "Malware", "Ransomware", "Firewall", "VPN", "SSL", "Encryption",  
     "Decryption", "Hashing", "Digital Signature", "Data Privacy", "GDPR", "FVDD", "UpSlide", "QRM", "PDF", "PPT", "COVID", "KPMG", "LLC", "VDD", "Ltd", "EBITDA",  
-    "1M", "2M", "3M", "4M", "5M", "6M", "7M", "8M", "9M", "10M",  
-    "11M", "12M", "13M", "14M", "15M", "16M", "17M", "18M", "19M", "20M",  
-    "21M", "22M", "23M", "24M", "25M", "26M", "27M", "28M", "29M", "30M",  
-    "31M", "32M", "33M", "34M", "35M", "36M", "37M", "38M", "39M", "40M",  
-    "41M", "42M", "43M", "44M", "45M", "46M", "47M", "48M", "49M", "50M",  
-    "51M", "52M", "53M", "54M", "55M", "56M", "57M", "58M", "59M", "60M",  
-    "61M", "62M", "63M", "64M", "65M", "66M", "67M", "68M", "69M", "70M",  
-    "71M", "72M", "73M", "74M", "75M", "76M", "77M", "78M", "79M", "80M",  
-    "81M", "82M", "83M", "84M", "85M", "86M", "87M", "88M", "89M", "90M",  
-    "91M", "92M", "93M", "94M", "95M", "96M", "97M", "98M", "99M", "100M",  
-    "101M", "102M", "103M", "104M", "105M", "106M", "107M", "108M", "109M", "110M",  
-    "111M", "112M", "113M", "114M", "115M", "116M", "117M", "118M", "119M", "120M",  
-    "121M", "122M", "123M", "124M", "125M", "126M", "127M", "128M", "129M", "130M",  
-    "131M", "132M", "133M", "134M", "135M", "136M", "137M", "138M", "139M", "140M",  
-    "141M", "142M", "143M", "144M", "145M", "146M", "147M", "148M", "149M", "150M",  
-    "151M", "152M", "153M", "154M", "155M", "156M", "157M", "158M", "159M", "160M",  
-    "161M", "162M", "163M", "164M", "165M", "166M", "167M", "168M", "169M", "170M",  
-    "171M", "172M", "173M", "174M", "175M", "176M", "177M", "178M", "179M", "180M",  
-    "181M", "182M", "183M", "184M", "185M", "186M", "187M", "188M", "189M", "190M",  
-    "191M", "192M", "193M", "194M", "195M", "196M", "197M", "198M", "199M", "200M",  
-    "201M", "202M", "203M", "204M", "205M", "206M", "207M", "208M", "209M", "210M",  
-    "211M", "212M", "213M", "214M", "215M", "216M", "217M", "218M", "219M", "220M",  
-    "221M", "222M", "223M", "224M", "225M", "226M", "227M", "228M", "229M", "230M",  
-    "231M", "232M", "233M", "234M", "235M", "236M", "237M", "238M", "239M", "240M",  
-    "241M", "242M", "243M", "244M", "245M", "246M", "247M", "248M", "249M", "250M",  
-    "251M", "252M", "253M", "254M", "255M", "256M", "257M", "258M", "259M", "260M",  
-    "261M", "262M", "263M", "264M", "265M", "266M", "267M", "268M", "269M", "270M",  
-    "271M", "272M", "273M", "274M", "275M", "276M", "277M", "278M", "279M", "280M",  
-    "281M", "282M", "283M", "284M", "285M", "286M", "287M", "288M", "289M", "290M",  
-    "291M", "292M", "293M", "294M", "295M", "296M", "297M", "298M", "299M", "300M",  
-    "301M", "302M", "303M", "304M", "305M", "306M", "307M", "308M", "309M", "310M",  
-    "311M", "312M", "313M", "314M", "315M", "316M", "317M", "318M", "319M", "320M",  
-    "321M", "322M", "323M", "324M", "325M", "326M", "327M", "328M", "329M", "330M",  
-    "331M", "332M", "333M", "334M", "335M", "336M", "337M", "338M", "339M", "340M",  
-    "341M", "342M", "343M", "344M", "345M", "346M", "347M", "348M", "349M", "350M",  
-    "351M", "352M", "353M", "354M", "355M", "356M", "357M", "358M", "359M", "360M",  
-    "361M", "362M", "363M", "364M", "365M", "366M", "367M", "368M", "369M", "370M",  
-    "371M", "372M", "373M", "374M", "375M", "376M", "377M", "378M", "379M", "380M",  
-    "381M", "382M", "383M", "384M", "385M", "386M", "387M", "388M", "389M", "390M",  
-    "391M", "392M", "393M", "394M", "395M", "396M", "397M", "398M", "399M", "400M",  
-    "401M", "402M", "403M", "404M", "405M", "406M", "407M", "408M", "409M", "410M",  
-    "411M", "412M", "413M", "414M", "415M", "416M", "417M", "418M", "419M", "420M",  
-    "421M", "422M", "423M", "424M", "425M", "426M", "427M", "428M", "429M", "430M",  
-    "431M", "432M", "433M", "434M", "435M", "436M", "437M", "438M", "439M", "440M",  
-    "441M", "442M", "443M", "444M", "445M", "446M", "447M", "448M", "449M", "450M",  
-    "451M", "452M", "453M", "454M", "455M", "456M", "457M", "458M", "459M", "460M",  
-    "461M", "462M", "463M", "464M", "465M", "466M", "467M", "468M", "469M", "470M",  
-    "471M", "472M", "473M", "474M", "475M", "476M", "477M", "478M", "479M", "480M",  
-    "481M", "482M", "483M", "484M", "485M", "486M", "487M", "488M", "489M", "490M",  
-    "491M", "492M", "493M", "494M", "495M", "496M", "497M", "498M", "499M", "500M",  
-    "501M", "502M", "503M", "504M", "505M", "506M", "507M", "508M", "509M", "510M",  
-    "511M", "512M", "513M", "514M", "515M", "516M", "517M", "518M", "519M", "520M",  
-    "521M", "522M", "523M", "524M", "525M", "526M", "527M", "528M", "529M", "530M",  
-    "531M", "532M", "533M", "534M", "535M", "536M", "537M", "538M", "539M", "540M",  
-    "541M", "542M", "543M", "544M", "545M", "546M", "547M", "548M", "549M", "550M",  
-    "551M", "552M", "553M", "554M", "555M", "556M", "557M", "558M", "559M", "560M",  
-    "561M", "562M", "563M", "564M", "565M", "566M", "567M", "568M", "569M", "570M",  
-    "571M", "572M", "573M", "574M", "575M", "576M", "577M", "578M", "579M", "580M",  
-    "581M", "582M", "583M", "584M", "585M", "586M", "587M", "588M", "589M", "590M",  
-    "591M", "592M", "593M", "594M", "595M", "596M", "597M", "598M", "599M", "600M",  
-    "601M", "602M", "603M", "604M", "605M", "606M", "607M", "608M", "609M", "610M",  
-    "611M", "612M", "613M", "614M", "615M", "616M", "617M", "618M", "619M", "620M",  
-    "621M", "622M", "623M", "624M", "625M", "626M", "627M", "628M", "629M", "630M",  
-    "631M", "632M", "633M", "634M", "635M", "636M", "637M", "638M", "639M", "640M",  
-    "641M", "642M", "643M", "644M", "645M", "646M", "647M", "648M", "649M", "650M",  
-    "651M", "652M", "653M", "654M", "655M", "656M", "657M", "658M", "659M", "660M",  
-    "661M", "662M", "663M", "664M", "665M", "666M", "667M", "668M", "669M", "670M",  
-    "671M", "672M", "673M", "674M", "675M", "676M", "677M", "678M", "679M", "680M",  
-    "681M", "682M", "683M", "684M", "685M", "686M", "687M", "688M", "689M", "690M",  
-    "691M", "692M", "693M", "694M", "695M", "696M", "697M", "698M", "699M", "700M",  
-    "701M", "702M", "703M", "704M", "705M", "706M", "707M", "708M", "709M", "710M",  
-    "711M", "712M", "713M", "714M", "715M", "716M", "717M", "718M", "719M", "720M",  
-    "721M", "722M", "723M", "724M", "725M", "726M", "727M", "728M", "729M", "730M",  
-    "731M", "732M", "733M", "734M", "735M", "736M", "737M", "738M", "739M", "740M",  
-    "741M", "742M", "743M", "744M", "745M", "746M", "747M", "748M", "749M", "750M",  
-    "751M", "752M", "753M", "754M", "755M", "756M", "757M", "758M", "759M", "760M",  
-    "761M", "762M", "763M", "764M", "765M", "766M", "767M", "768M", "769M", "770M",  
-    "771M", "772M", "773M", "774M", "775M", "776M", "777M", "778M", "779M", "780M",  
-    "781M", "782M", "783M", "784M", "785M", "786M", "787M", "788M", "789M", "790M",  
-    "791M", "792M", "793M", "794M", "795M", "796M", "797M", "798M", "799M", "800M",  
-    "801M", "802M", "803M", "804M", "805M", "806M", "807M", "808M", "809M", "810M",  
-    "811M", "812M", "813M", "814M", "815M", "816M", "817M", "818M", "819M", "820M",  
-    "821M", "822M", "823M", "824M", "825M", "826M", "827M", "828M", "829M", "830M",  
-    "831M", "832M", "833M", "834M", "835M", "836M", "837M", "838M", "839M", "840M",  
-    "841M", "842M", "843M", "844M", "845M", "846M", "847M", "848M", "849M", "850M",  
-    "851M", "852M", "853M", "854M", "855M", "856M", "857M", "858M", "859M", "860M",  
-    "861M", "862M", "863M", "864M", "865M", "866M", "867M", "868M", "869M", "870M",  
-    "871M", "872M", "873M", "874M", "875M", "876M", "877M", "878M", "879M", "880M",  
-    "881M", "882M", "883M", "884M", "885M", "886M", "887M", "888M", "889M", "890M",  
-    "891M", "892M", "893M", "894M", "895M", "896M", "897M", "898M", "899M", "900M",  
-    "901M", "902M", "903M", "904M", "905M", "906M", "907M", "908M", "909M", "910M",  
-    "911M", "912M", "913M", "914M", "915M", "916M", "917M", "918M", "919M", "920M",  
-    "921M", "922M", "923M", "924M", "925M", "926M", "927M", "928M", "929M", "930M",  
-    "931M", "932M", "933M", "934M", "935M", "936M", "937M", "938M", "939M", "940M",  
-    "941M", "942M", "943M", "944M", "945M", "946M", "947M", "948M", "949M", "950M",  
-    "951M", "952M", "953M", "954M", "955M", "956M", "957M", "958M", "959M", "960M",  
-    "961M", "962M", "963M", "964M", "965M", "966M", "967M", "968M", "969M", "970M",  
-    "971M", "972M", "973M", "974M", "975M", "976M", "977M", "978M", "979M", "980M",  
-    "981M", "982M", "983M", "984M", "985M", "986M", "987M", "988M", "989M", "990M",  
-    "991M", "992M", "993M", "994M", "995M", "996M", "997M", "998M", "999M", "1000M", 
-    "1MN", "2MN", "3MN", "4MN", "5MN", "6MN", "7MN", "8MN", "9MN", "10MN",  
-    "11MN", "12MN", "13MN", "14MN", "15MN", "16MN", "17MN", "18MN", "19MN", "20MN",  
-    "21MN", "22MN", "23MN", "24MN", "25MN", "26MN", "27MN", "28MN", "29MN", "30MN",  
-    "31MN", "32MN", "33MN", "34MN", "35MN", "36MN", "37MN", "38MN", "39MN", "40MN",  
-    "41MN", "42MN", "43MN", "44MN", "45MN", "46MN", "47MN", "48MN", "49MN", "50MN",  
-    "51MN", "52MN", "53MN", "54MN", "55MN", "56MN", "57MN", "58MN", "59MN", "60MN",  
-    "61MN", "62MN", "63MN", "64MN", "65MN", "66MN", "67MN", "68MN", "69MN", "70MN",  
-    "71MN", "72MN", "73MN", "74MN", "75MN", "76MN", "77MN", "78MN", "79MN", "80MN",  
-    "81MN", "82MN", "83MN", "84MN", "85MN", "86MN", "87MN", "88MN", "89MN", "90MN",  
-    "91MN", "92MN", "93MN", "94MN", "95MN", "96MN", "97MN", "98MN", "99MN", "100MN",  
-    "101MN", "102MN", "103MN", "104MN", "105MN", "106MN", "107MN", "108MN", "109MN", "110MN",  
-    "111MN", "112MN", "113MN", "114MN", "115MN", "116MN", "117MN", "118MN", "119MN", "120MN",  
-    "121MN", "122MN", "123MN", "124MN", "125MN", "126MN", "127MN", "128MN", "129MN", "130MN",  
-    "131MN", "132MN", "133MN", "134MN", "135MN", "136MN", "137MN", "138MN", "139MN", "140MN",  
-    "141MN", "142MN", "143MN", "144MN", "145MN", "146MN", "147MN", "148MN", "149MN", "150MN",  
-    "151MN", "152MN", "153MN", "154MN", "155MN", "156MN", "157MN", "158MN", "159MN", "160MN",  
-    "161MN", "162MN", "163MN", "164MN", "165MN", "166MN", "167MN", "168MN", "169MN", "170MN",  
-    "171MN", "172MN", "173MN", "174MN", "175MN", "176MN", "177MN", "178MN", "179MN", "180MN",  
-    "181MN", "182MN", "183MN", "184MN", "185MN", "186MN", "187MN", "188MN", "189MN", "190MN",  
-    "191MN", "192MN", "193MN", "194MN", "195MN", "196MN", "197MN", "198MN", "199MN", "200MN",  
-    "201MN", "202MN", "203MN", "204MN", "205MN", "206MN", "207MN", "208MN", "209MN", "210MN",  
-    "211MN", "212MN", "213MN", "214MN", "215MN", "216MN", "217MN", "218MN", "219MN", "220MN",  
-    "221MN", "222MN", "223MN", "224MN", "225MN", "226MN", "227MN", "228MN", "229MN", "230MN",  
-    "231MN", "232MN", "233MN", "234MN", "235MN", "236MN", "237MN", "238MN", "239MN", "240MN",  
-    "241MN", "242MN", "243MN", "244MN", "245MN", "246MN", "247MN", "248MN", "249MN", "250MN",  
-    "251MN", "252MN", "253MN", "254MN", "255MN", "256MN", "257MN", "258MN", "259MN", "260MN",  
-    "261MN", "262MN", "263MN", "264MN", "265MN", "266MN", "267MN", "268MN", "269MN", "270MN",  
-    "271MN", "272MN", "273MN", "274MN", "275MN", "276MN", "277MN", "278MN", "279MN", "280MN",  
-    "281MN", "282MN", "283MN", "284MN", "285MN", "286MN", "287MN", "288MN", "289MN", "290MN",  
-    "291MN", "292MN", "293MN", "294MN", "295MN", "296MN", "297MN", "298MN", "299MN", "300MN",  
-    "301MN", "302MN", "303MN", "304MN", "305MN", "306MN", "307MN", "308MN", "309MN", "310MN",  
-    "311MN", "312MN", "313MN", "314MN", "315MN", "316MN", "317MN", "318MN", "319MN", "320MN",  
-    "321MN", "322MN", "323MN", "324MN", "325MN", "326MN", "327MN", "328MN", "329MN", "330MN",  
-    "331MN", "332MN", "333MN", "334MN", "335MN", "336MN", "337MN", "338MN", "339MN", "340MN",  
-    "341MN", "342MN", "343MN", "344MN", "345MN", "346MN", "347MN", "348MN", "349MN", "350MN",  
-    "351MN", "352MN", "353MN", "354MN", "355MN", "356MN", "357MN", "358MN", "359MN", "360MN",  
-    "361MN", "362MN", "363MN", "364MN", "365MN", "366MN", "367MN", "368MN", "369MN", "370MN",  
-    "371MN", "372MN", "373MN", "374MN", "375MN", "376MN", "377MN", "378MN", "379MN", "380MN",  
-    "381MN", "382MN", "383MN", "384MN", "385MN", "386MN", "387MN", "388MN", "389MN", "390MN",  
-    "391MN", "392MN", "393MN", "394MN", "395MN", "396MN", "397MN", "398MN", "399MN", "400MN",  
-    "401MN", "402MN", "403MN", "404MN", "405MN", "406MN", "407MN", "408MN", "409MN", "410MN",  
-    "411MN", "412MN", "413MN", "414MN", "415MN", "416MN", "417MN", "418MN", "419MN", "420MN",  
-    "421MN", "422MN", "423MN", "424MN", "425MN", "426MN", "427MN", "428MN", "429MN", "430MN",  
-    "431MN", "432MN", "433MN", "434MN", "435MN", "436MN", "437MN", "438MN", "439MN", "440MN",  
-    "441MN", "442MN", "443MN", "444MN", "445MN", "446MN", "447MN", "448MN", "449MN", "450MN",  
-    "451MN", "452MN", "453MN", "454MN", "455MN", "456MN", "457MN", "458MN", "459MN", "460MN",  
-    "461MN", "462MN", "463MN", "464MN", "465MN", "466MN", "467MN", "468MN", "469MN", "470MN",  
-    "471MN", "472MN", "473MN", "474MN", "475MN", "476MN", "477MN", "478MN", "479MN", "480MN",  
-    "481MN", "482MN", "483MN", "484MN", "485MN", "486MN", "487MN", "488MN", "489MN", "490MN",  
-    "491MN", "492MN", "493MN", "494MN", "495MN", "496MN", "497MN", "498MN", "499MN", "500MN",  
-    "501MN", "502MN", "503MN", "504MN", "505MN", "506MN", "507MN", "508MN", "509MN", "510MN",  
-    "511MN", "512MN", "513MN", "514MN", "515MN", "516MN", "517MN", "518MN", "519MN", "520MN",  
-    "521MN", "522MN", "523MN", "524MN", "525MN", "526MN", "527MN", "528MN", "529MN", "530MN",  
-    "531MN", "532MN", "533MN", "534MN", "535MN", "536MN", "537MN", "538MN", "539MN", "540MN",  
-    "541MN", "542MN", "543MN", "544MN", "545MN", "546MN", "547MN", "548MN", "549MN", "550MN",  
-    "551MN", "552MN", "553MN", "554MN", "555MN", "556MN", "557MN", "558MN", "559MN", "560MN",  
-    "561MN", "562MN", "563MN", "564MN", "565MN", "566MN", "567MN", "568MN", "569MN", "570MN",  
-    "571MN", "572MN", "573MN", "574MN", "575MN", "576MN", "577MN", "578MN", "579MN", "580MN",  
-    "581MN", "582MN", "583MN", "584MN", "585MN", "586MN", "587MN", "588MN", "589MN", "590MN",  
-    "591MN", "592MN", "593MN", "594MN", "595MN", "596MN", "597MN", "598MN", "599MN", "600MN",  
-    "601MN", "602MN", "603MN", "604MN", "605MN", "606MN", "607MN", "608MN", "609MN", "610MN",  
-    "611MN", "612MN", "613MN", "614MN", "615MN", "616MN", "617MN", "618MN", "619MN", "620MN",  
-    "621MN", "622MN", "623MN", "624MN", "625MN", "626MN", "627MN", "628MN", "629MN", "630MN",  
-    "631MN", "632MN", "633MN", "634MN", "635MN", "636MN", "637MN", "638MN", "639MN", "640MN",  
-    "641MN", "642MN", "643MN", "644MN", "645MN", "646MN", "647MN", "648MN", "649MN", "650MN",  
-    "651MN", "652MN", "653MN", "654MN", "655MN", "656MN", "657MN", "658MN", "659MN", "660MN",  
-    "661MN", "662MN", "663MN", "664MN", "665MN", "666MN", "667MN", "668MN", "669MN", "670MN",  
-    "671MN", "672MN", "673MN", "674MN", "675MN", "676MN", "677MN", "678MN", "679MN", "680MN",  
-    "681MN", "682MN", "683MN", "684MN", "685MN", "686MN", "687MN", "688MN", "689MN", "690MN",  
-    "691MN", "692MN", "693MN", "694MN", "695MN", "696MN", "697MN", "698MN", "699MN", "700MN",  
-    "701MN", "702MN", "703MN", "704MN", "705MN", "706MN", "707MN", "708MN", "709MN", "710MN",  
-    "711MN", "712MN", "713MN", "714MN", "715MN", "716MN", "717MN", "718MN", "719MN", "720MN",  
-    "721MN", "722MN", "723MN", "724MN", "725MN", "726MN", "727MN", "728MN", "729MN", "730MN",  
-    "731MN", "732MN", "733MN", "734MN", "735MN", "736MN", "737MN", "738MN", "739MN", "740MN",  
-    "741MN", "742MN", "743MN", "744MN", "745MN", "746MN", "747MN", "748MN", "749MN", "750MN",  
-    "751MN", "752MN", "753MN", "754MN", "755MN", "756MN", "757MN", "758MN", "759MN", "760MN",  
-    "761MN", "762MN", "763MN", "764MN", "765MN", "766MN", "767MN", "768MN", "769MN", "770MN",  
-    "771MN", "772MN", "773MN", "774MN", "775MN", "776MN", "777MN", "778MN", "779MN", "780MN",  
-    "781MN", "782MN", "783MN", "784MN", "785MN", "786MN", "787MN", "788MN", "789MN", "790MN",  
-    "791MN", "792MN", "793MN", "794MN", "795MN", "796MN", "797MN", "798MN", "799MN", "800MN",  
-    "801MN", "802MN", "803MN", "804MN", "805MN", "806MN", "807MN", "808MN", "809MN", "810MN",  
-    "811MN", "812MN", "813MN", "814MN", "815MN", "816MN", "817MN", "818MN", "819MN", "820MN",  
-    "821MN", "822MN", "823MN", "824MN", "825MN", "826MN", "827MN", "828MN", "829MN", "830MN",  
-    "831MN", "832MN", "833MN", "834MN", "835MN", "836MN", "837MN", "838MN", "839MN", "840MN",  
-    "841MN", "842MN", "843MN", "844MN", "845MN", "846MN", "847MN", "848MN", "849MN", "850MN",  
-    "851MN", "852MN", "853MN", "854MN", "855MN", "856MN", "857MN", "858MN", "859MN", "860MN",  
-    "861MN", "862MN", "863MN", "864MN", "865MN", "866MN", "867MN", "868MN", "869MN", "870MN",  
-    "871MN", "872MN", "873MN", "874MN", "875MN", "876MN", "877MN", "878MN", "879MN", "880MN",  
-    "881MN", "882MN", "883MN", "884MN", "885MN", "886MN", "887MN", "888MN", "889MN", "890MN",  
-    "891MN", "892MN", "893MN", "894MN", "895MN", "896MN", "897MN", "898MN", "899MN", "900MN",  
-    "901MN", "902MN", "903MN", "904MN", "905MN", "906MN", "907MN", "908MN", "909MN", "910MN",  
-    "911MN", "912MN", "913MN", "914MN", "915MN", "916MN", "917MN", "918MN", "919MN", "920MN",  
-    "921MN", "922MN", "923MN", "924MN", "925MN", "926MN", "927MN", "928MN", "929MN", "930MN",  
-    "931MN", "932MN", "933MN", "934MN", "935MN", "936MN", "937MN", "938MN", "939MN", "940MN",  
-    "941MN", "942MN", "943MN", "944MN", "945MN", "946MN", "947MN", "948MN", "949MN", "950MN",  
-    "951MN", "952MN", "953MN", "954MN", "955MN", "956MN", "957MN", "958MN", "959MN", "960MN",  
-    "961MN", "962MN", "963MN", "964MN", "965MN", "966MN", "967MN", "968MN", "969MN", "970MN",  
-    "971MN", "972MN", "973MN", "974MN", "975MN", "976MN", "977MN", "978MN", "979MN", "980MN",  
-    "981MN", "982MN", "983MN", "984MN", "985MN", "986MN", "987MN", "988MN", "989MN", "990MN",  
-    "991MN", "992MN", "993MN", "994MN", "995MN", "996MN", "997MN", "998MN", "999MN", "1000MN"
 }  
   
-NUMERIC_TERMS = {f"{i}+" for i in range(1, 101)}  
+
+# Slide validation engine: "thread" or "process" (process pool escapes the GIL)
+EXECUTION_MODE = "thread"
+MAX_WORKERS = None  # None = default of the executor (CPU count based)
+CHUNK_SIZE = 4  # slides sent to a worker per task
+
+# Slide text extraction: "python-pptx" loads the whole Presentation (required for highlighting),
+# "streaming" reads only the slide, table and chart XML from the zip (reports without a highlighted deck)
+EXTRACTION_BACKEND = "python-pptx"
+
+# Spelling correction cache (LRU), one per process. Set a path to persist it between restarts
+# and to share new corrections between process workers.
+SPELLING_CACHE_SIZE = 50000
+SPELLING_CACHE_PATH = None  # e.g. ".cache/spelling_corrections.json"
+
+# Prebuilt spelling dictionary (rebuilt automatically when config.py changes); None = build from the bundled JSON
+SPELLING_DICTIONARY_PATH = ".cache/spelling_dictionary.bin"
+
+# Spelling mode: "deck" checks each distinct word of the deck once, "run" checks token by token
+SPELLING_MODE = "deck"
+CORRECTION_CHUNK_SIZE = 50  # unknown words corrected per worker task in "deck" mode
+
+# Correction backend for unknown words: "pyspellchecker" or "symspell" (precomputed symmetric-delete index)
+SPELLING_BACKEND = "pyspellchecker"
+
+# Grammar checking: runs are joined into one request per "slide", "paragraph" or "run"
+GRAMMAR_BATCH_SCOPE = "slide"
+GRAMMAR_MAX_REQUEST_CHARS = 15000  # public LanguageTool API accepts up to 20KB per request
+GRAMMAR_LANGUAGE = "en-US"
+GRAMMAR_RULESET = "default"  # change when enabling/disabling rules so cached results are not reused
+
+# Grammar result cache (SQLite). Set to None to disable.
+GRAMMAR_CACHE_PATH = ".cache/grammar_cache.sqlite"
+GRAMMAR_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Local LanguageTool servers, e.g. "http://localhost:8081,http://localhost:8082".
+# Start one with: java -cp languagetool-server.jar org.languagetool.server.HTTPServer --port 8081
+# Empty = public LanguageTool API.
+LANGUAGETOOL_SERVERS = [url.strip() for url in os.environ.get("LANGUAGETOOL_SERVERS", "").split(",") if url.strip()]
+LANGUAGETOOL_MAX_IN_FLIGHT = 8  # concurrent requests over all servers
+LANGUAGETOOL_TIMEOUT = 30  # seconds per request
+
+# Grammar stage limits
+GRAMMAR_REQUEST_TIMEOUT = 30  # seconds per request
+GRAMMAR_MAX_ABANDONED_CALLS = 8  # timed-out backend calls still running before new calls are refused
+GRAMMAR_DECK_BUDGET = 600  # seconds of grammar checking per deck; None = no limit
+GRAMMAR_BREAKER_THRESHOLD = 5  # consecutive failures before grammar checks are paused
+GRAMMAR_BREAKER_RESET = 60  # seconds before the backend is tried again
+RESOURCE_RETRY_INTERVAL = 60  # seconds before a resource whose creation failed (e.g. LanguageTool) is created again
+
+# Per-slide result store for re-validating revised decks. Set to None to disable.
+RESULT_STORE_PATH = ".cache/slide_results.sqlite"
+RESULT_STORE_MAX_BYTES = 256 * 1024 * 1024
+RESULT_STORE_VERSION = 6  # bump when validation rules change so stored results are not reused
+
+# Highlighted deck output: "passthrough" rewrites only highlighted slides and copies other zip members as is,
+# "save" re-serializes the whole package with python-pptx
+HIGHLIGHT_OUTPUT = "passthrough"
+
+# Batch command line (batch_validate.py): report directory and number of decks validated in parallel
+BATCH_OUTPUT_DIR = "validation_reports"
+BATCH_WORKERS = None  # None = CPU count
+
+# Validation job service shared by all web sessions (utils/job_service.py)
+JOB_EXECUTION_MODE = "process"  # pool for slide chunks: "process" or "thread"
+JOB_START_METHOD = "forkserver"  # how process workers start: "forkserver" or "spawn" (not "fork": the server is multithreaded)
+JOB_WORKERS = None  # size of the shared pool; None = CPU count
+JOB_MAX_RUNNING = 4  # decks extracted/validated/highlighted at the same time
+JOB_QUEUE_LIMIT = 20  # queued plus running decks before new uploads are turned away
+JOB_QUEUE_BYTES = 1024 * 1024 * 1024  # total size of queued plus running decks (held in memory until validated)
+JOB_USER_LIMIT = 3  # queued plus running decks per user
+JOB_RETENTION = 3600  # seconds a finished result stays available (e.g. after a page refresh)
+JOB_RESULT_DIR = None  # where finished reports and highlighted decks are kept; None = a temporary directory
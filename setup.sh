@@ -1,2 +1,3 @@
 #!/bin/bash  
 python -m spacy download en_core_web_sm  
+python -m utils.dictionary_artifact  
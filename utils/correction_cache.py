@@ -0,0 +1,143 @@
+# utils/correction_cache.py
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:
+    # Windows: file cache tetap ditulis atomik, tetapi tanpa lock antar proses
+    fcntl = None
+
+class CorrectionCache:
+    """
+    Bounded LRU cache for spelling corrections, keyed on the normalized word.
+
+    The cache lives in one process. Process workers share entries only through
+    `path`: each loads the file and merges its new entries back with `save`.
+
+    Parameters:
+    - maxsize: maximum number of words kept in memory (and on disk).
+    - path: optional JSON file used to start warm and to persist new entries.
+    """
+
+    def __init__(self, maxsize=50000, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._local = threading.local()
+        if path:
+            self.load()
+
+    def get(self, key, compute):
+        """
+        Return the cached value for `key`, calling `compute(key)` on a miss.
+        """
+        with self._lock:
+            counts = getattr(self._local, 'counts', None)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if counts is not None:
+                    counts['hits'] += 1
+                return self._entries[key]
+            self.misses += 1
+            if counts is not None:
+                counts['misses'] += 1
+
+        # Hitung di luar lock supaya thread lain tidak menunggu spell.correction
+        value = compute(key)
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._dirty = True
+        return value
+
+    @contextmanager
+    def counting(self):
+        """
+        Count the lookups made by the current thread inside the block, e.g. for
+        one chunk of a run; yields a dict with 'hits' and 'misses'.
+        """
+        counts = {'hits': 0, 'misses': 0}
+        previous = getattr(self._local, 'counts', None)
+        self._local.counts = counts
+        try:
+            yield counts
+        finally:
+            self._local.counts = previous
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                entries = json.load(file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not load spelling cache {self.path}: {e}")
+            return
+        with self._lock:
+            for key, value in entries.items():
+                self._entries.setdefault(key, value)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        logging.debug(f"Loaded {len(entries)} spelling corrections from {self.path}")
+
+    def save(self):
+        """
+        Merge the in-memory entries into the cache file. Entries written by other
+        processes are kept: the read-merge-write runs under an exclusive lock on
+        "<path>.lock", and the file is replaced atomically.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = OrderedDict(self._entries)
+            self._dirty = False
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Tanpa lock, dua worker yang menyimpan bersamaan saling menimpa entri baru
+        with open(self.path + '.lock', 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            merged = OrderedDict()
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as file:
+                        merged.update(json.load(file))
+                except (OSError, ValueError):
+                    pass
+            for key, value in entries.items():
+                merged.pop(key, None)
+                merged[key] = value
+            while len(merged) > self.maxsize:
+                merged.popitem(last=False)
+
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(merged, file)
+            os.replace(tmp_path, self.path)
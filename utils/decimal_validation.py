@@ -1,32 +1,114 @@
-import re
 import logging
+import re
+from utils.extraction import iter_runs, run_location
+from utils.numeric_lexer import lex_numbers
 
-# Save regex pattern in a variable
-decimal_pattern = re.compile(r'\b\d+[\.,]\d+\b')
+# Bagian format angka Excel yang tidak menampilkan digit: teks literal, [warna/kondisi], escape, padding
+FORMAT_LITERALS = re.compile(r'"[^"]*"|\[[^\]]*\]|\\.|_.|\*.')
 
-def validate_decimal_consistency(slide, slide_index, decimal_places):
+def validate_decimal_consistency(slide_record, slide_index, decimal_places):
     issues = []
     
-    for shape in slide.shapes:
-        if shape.has_text_frame:
-            for paragraph in shape.text_frame.paragraphs:
-                for run in paragraph.runs:
-                    text = run.text
-                    # Find all decimal numbers with either a dot or comma as the decimal separator
-                    matches = decimal_pattern.findall(text)
-                    logging.debug(f"Slide {slide_index}: Found matches: {matches}")
-                    for match in matches:
-                        # Replace comma with dot for consistency
-                        match = match.replace(',', '.')
-                        # Count the number of digits after the dot
-                        decimal_part = match.split('.')[-1]
-                        if len(decimal_part) != decimal_places:
-                            issues.append({
-                                'slide': slide_index,
-                                'issue': 'Inconsistent Decimal Points',
-                                'text': match,
-                                'details': f'Expected {decimal_places} decimal place(s), found {len(decimal_part)} in "{match}".'
-                            })
-                            logging.debug(f"Slide {slide_index}: Inconsistent decimal points found in \"{match}\". Expected {decimal_places}, found {len(decimal_part)}.")
+    for run in iter_runs(slide_record):
+        # Decimal numbers with either a dot or comma as the decimal separator; thousands grouping is not a decimal
+        matches = [token for token in lex_numbers(run.text) if token.separator]
+        logging.debug(f"Slide {slide_index}: Found matches: {[token.number for token in matches]}")
+        for token in matches:
+            match = token.number
+            # Count the number of digits after the decimal separator
+            if len(token.decimals) != decimal_places:
+                issues.append({
+                    'slide': slide_index,
+                    'issue': 'Inconsistent Decimal Points',
+                    'text': match,
+                    'details': f'Expected {decimal_places} decimal place(s), found {len(token.decimals)} in "{match}".',
+                    'locations': [run_location(run, token.span[0], token.span[0] + len(match))]
+                })
+                logging.debug(f"Slide {slide_index}: Inconsistent decimal points found in \"{match}\". Expected {decimal_places}, found {len(token.decimals)}.")
     
     return issues
+
+def validate_decimals_in_text(text, slide_index, decimal_places, runs):
+    """
+    Decimal issues of one text, located in every run that holds the same text
+    (repeated chart labels and categories are checked once).
+    """
+    issues = []
+    for token in lex_numbers(text):
+        if token.separator and len(token.decimals) != decimal_places:
+            end = token.span[0] + len(token.number)
+            issues.append({
+                'slide': slide_index,
+                'issue': 'Inconsistent Decimal Points',
+                'text': token.number,
+                'details': f'Expected {decimal_places} decimal place(s), found {len(token.decimals)} in "{token.number}".',
+                'locations': [run_location(run, token.span[0], end) for run in runs]
+            })
+    return issues
+
+def validate_column_decimals(column, slide_index, column_number, decimal_places=None):
+    """
+    Decimal precision consistency inside one table column.
+
+    The precision most values of the column use is taken as the column's own;
+    values written with another precision are reported, once per distinct value
+    with every cell holding it in 'locations'. Whole numbers are not compared,
+    as in the slide check. On a tie the configured `decimal_places` wins.
+
+    Parameters:
+    - column: TABLE_CELL RunRecords of the column, in row order.
+    - column_number: 1-based column number used in the details.
+    """
+    # Teks sel yang sama hanya di-lex sekali; locations baru dibuat untuk nilai yang menyimpang
+    cells = {}
+    for run in column:
+        cells.setdefault(run.text, []).append(run)
+    counts = {}
+    for text, runs in cells.items():
+        for token in lex_numbers(text):
+            if token.separator:
+                counts[len(token.decimals)] = counts.get(len(token.decimals), 0) + len(runs)
+    if len(counts) < 2:
+        return []
+    expected = max(counts, key=lambda places: (counts[places], places == decimal_places))
+    outliers = {}
+    for text, runs in cells.items():
+        for token in lex_numbers(text):
+            if token.separator and len(token.decimals) != expected:
+                end = token.span[0] + len(token.number)
+                outliers.setdefault((token.number, len(token.decimals)), []).extend(run_location(run, token.span[0], end) for run in runs)
+    issues = []
+    for (number, places), locations in outliers.items():
+        issues.append({
+            'slide': slide_index,
+            'issue': 'Inconsistent Decimal Points',
+            'text': number,
+            'details': f'Column {column_number} of the table uses {expected} decimal place(s) '
+                       f'({counts[expected]} of {sum(counts.values())} values), found {places} in "{number}".',
+            'locations': locations
+        })
+    return issues
+
+def format_decimal_places(format_code):
+    """
+    Number of decimals an Excel number format shows for positive numbers, or
+    None when the format has no digit placeholder (text or "General").
+    """
+    section = FORMAT_LITERALS.sub('', format_code.split(';')[0])
+    if not re.search(r'[0#?]', section):
+        return None
+    match = re.search(r'\.([0#?]+)', section)
+    return len(match.group(1)) if match else 0
+
+def validate_number_format(format_code, slide_index, decimal_places, runs):
+    # Format tanpa desimal (jumlah, persen bulat) tidak dilaporkan, sama seperti angka tanpa pemisah desimal
+    shown = format_decimal_places(format_code)
+    if not shown or shown == decimal_places:
+        return []
+    return [{
+        'slide': slide_index,
+        'issue': 'Inconsistent Decimal Points',
+        'text': format_code,
+        'details': f'Expected {decimal_places} decimal place(s), chart number format "{format_code}" shows {shown}.',
+        'locations': [run_location(run) for run in runs]
+    }]
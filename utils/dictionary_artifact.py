@@ -0,0 +1,112 @@
+# utils/dictionary_artifact.py
+#
+# Prebuilt spelling dictionary. Build ahead of time from the repository root with:
+#   python -m utils.dictionary_artifact
+
+import hashlib
+import logging
+import marshal
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+import spellchecker
+from spellchecker import SpellChecker
+import config
+from config import TECHNICAL_TERMS, SPELLING_DICTIONARY_PATH
+
+ARTIFACT_FORMAT = 1
+
+def artifact_key():
+    """
+    Hash of everything the merged frequency table depends on: config.py (the
+    technical terms), the pyspellchecker version and the Python version (marshal
+    format).
+    """
+    digest = hashlib.sha256()
+    with open(config.__file__, 'rb') as file:
+        digest.update(file.read())
+    digest.update(f"{ARTIFACT_FORMAT}\0{spellchecker.__version__}\0{sys.version_info[:2]}".encode('utf-8'))
+    return digest.hexdigest()
+
+def build_spell_checker():
+    # Cara lama: JSON terkompresi bawaan pyspellchecker lalu istilah teknis
+    spell = SpellChecker()
+    spell.word_frequency.load_words(TECHNICAL_TERMS)
+    return spell
+
+def write_artifact(spell, path, key):
+    """
+    Write the frequency table and its derived counters to `path` atomically.
+    """
+    word_frequency = spell.word_frequency
+    payload = (
+        ARTIFACT_FORMAT,
+        key,
+        dict(word_frequency.dictionary),
+        word_frequency.total_words,
+        word_frequency.unique_words,
+        ''.join(sorted(word_frequency.letters)),
+        word_frequency.longest_word_length,
+    )
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as file:
+        marshal.dump(payload, file)
+    os.replace(tmp_path, path)
+
+def read_artifact(path, key):
+    """
+    Return a SpellChecker loaded from `path`, or None when the file is missing,
+    unreadable or was built for another key.
+    """
+    try:
+        with open(path, 'rb') as file:
+            payload = marshal.loads(file.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(payload, tuple) or len(payload) != 7 or payload[:2] != (ARTIFACT_FORMAT, key):
+        return None
+    _, _, dictionary, total_words, unique_words, letters, longest_word_length = payload
+    spell = SpellChecker(language=None)
+    word_frequency = spell.word_frequency
+    # Isi langsung, tanpa _update_dictionary() yang menghitung ulang semua huruf
+    word_frequency._dictionary = Counter(dictionary)
+    word_frequency._total_words = total_words
+    word_frequency._unique_words = unique_words
+    word_frequency._letters = set(letters)
+    word_frequency._longest_word_length = longest_word_length
+    return spell
+
+def load_spell_checker(path=SPELLING_DICTIONARY_PATH):
+    """
+    Load the merged dictionary from the prebuilt artifact, rebuilding it when
+    config.py (or pyspellchecker) changed since it was written.
+
+    Parameters:
+    - path: artifact file, or None to always build from the bundled JSON.
+    """
+    if not path:
+        return build_spell_checker()
+    start = time.perf_counter()
+    key = artifact_key()
+    spell = read_artifact(path, key)
+    if spell is not None:
+        logging.debug(f"Loaded spelling dictionary from {path} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return spell
+    spell = build_spell_checker()
+    try:
+        write_artifact(spell, path, key)
+        logging.info(f"Rebuilt spelling dictionary {path} in {(time.perf_counter() - start) * 1000:.0f} ms")
+    except OSError as e:
+        logging.warning(f"Could not write spelling dictionary {path}: {e}")
+    return spell
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    target = sys.argv[1] if len(sys.argv) > 1 else SPELLING_DICTIONARY_PATH
+    checker = build_spell_checker()
+    write_artifact(checker, target, artifact_key())
+    print(f"Wrote {len(checker.word_frequency.dictionary)} words to {target}")
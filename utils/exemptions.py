@@ -0,0 +1,56 @@
+# utils/exemptions.py
+
+import re
+from functools import lru_cache
+from config import TECHNICAL_TERMS
+from utils.phrase_matcher import PhraseMatcher, merge_spans
+from utils.resources import resources
+
+# Istilah yang memang harus dikenali apa adanya (peka huruf besar/kecil)
+EXEMPT_TERMS = frozenset(TECHNICAL_TERMS)
+
+# Istilah yang terpecah oleh tokenizer ejaan ("REST API", "Scikit-learn", "CI/CD") dicocokkan sebagai frasa
+PHRASE_TERMS = tuple(sorted(term for term in TECHNICAL_TERMS if not re.fullmatch(r'[\w+]+', term)))
+
+def build_phrase_matcher():
+    return PhraseMatcher(PHRASE_TERMS)
+
+MONTHS = r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)'
+
+# Kelas token yang dikenali lewat pola, bukan daftar literal; digabung jadi satu regex
+EXEMPTION_CLASSES = (
+    # Angka dengan satuan atau penanda: 12, 12+, 1M, 250MN, 3.5bn, 2k, 15%, 3x
+    ('numeric', r'\d+(?:[.,]\d+)*(?:\+|%|x|k|m|mn|mm|bn)?'),
+    # Kode periode: FY24, FY2024, CY23, 1Q21, Q4 2023, 11m23, Jul23A, Sep22A, OctA22
+    ('period', r'(?:FY|CY|LTM|YTD|H[12]|Q[1-4]|[1-4]Q)\s?\d{2}(?:\d{2})?[ABEF]?|\d{1,2}m\d{2}[ABEF]?'
+               r'|' + MONTHS + r'(?:\d{2}(?:\d{2})?[ABEF]?|[ABEF]\d{2})'),
+    # Tanggal: 23-Sep, Sep-23, 31/12/2023, 2023-12-31
+    ('date', r'\d{1,2}-' + MONTHS + r'|' + MONTHS + r'-\d{2}(?:\d{2})?|\d{1,4}[/.-]\d{1,2}[/.-]\d{2,4}'),
+)
+EXEMPTION_PATTERN = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in EXEMPTION_CLASSES), re.IGNORECASE)
+
+@lru_cache(maxsize=65536)
+def classify_token(token):
+    """
+    Classify a token with one call.
+
+    Returns:
+    - 'term' for a listed technical term, 'numeric', 'period' or 'date' for a
+      token matching one of the pattern classes, or None when the token is an
+      ordinary word that should be spell checked.
+    """
+    if token in EXEMPT_TERMS:
+        return 'term'
+    match = EXEMPTION_PATTERN.fullmatch(token)
+    return match.lastgroup if match else None
+
+def is_exempt(token):
+    return classify_token(token) is not None
+
+@lru_cache(maxsize=16384)
+def exempt_phrase_spans(text):
+    """
+    Spans of `text` covered by multi-word technical terms, merged and sorted.
+    Tokens inside these spans are not spell checked.
+    """
+    return tuple(merge_spans(resources.get('phrase_matcher').find(text)))
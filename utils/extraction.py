@@ -0,0 +1,213 @@
+# utils/extraction.py
+
+from collections import namedtuple
+from lxml import etree
+
+# Asal teks di dalam slide
+TEXT_FRAME = 'text'
+TABLE_CELL = 'table'
+CHART_LABEL = 'chart'
+CHART_TITLE = 'chart_title'
+CHART_AXIS_TITLE = 'chart_axis_title'
+CHART_SERIES_NAME = 'chart_series_name'
+CHART_CATEGORY = 'chart_category'
+CHART_NUMBER_FORMAT = 'chart_number_format'
+CHART_ORIGINS = (CHART_TITLE, CHART_AXIS_TITLE, CHART_SERIES_NAME, CHART_CATEGORY, CHART_NUMBER_FORMAT, CHART_LABEL)
+
+# Satu run teks yang sudah diekstrak. `cell` berisi (row, col) untuk sel tabel,
+# (series, point) untuk label data chart, (series,) untuk nama series dan format
+# angka, (series, point, level) untuk kategori dan (axis,) untuk judul sumbu;
+# None untuk run di text frame dan judul chart. `shape_index` adalah posisi shape di
+# slide.shapes: shape_id tidak selalu unik (shape hasil copy-paste antar deck).
+RunRecord = namedtuple('RunRecord', ['text', 'font_name', 'shape_id', 'paragraph_index', 'run_index', 'origin', 'cell', 'shape_index'],
+                       defaults=(None,))
+SlideRecord = namedtuple('SlideRecord', ['slide_index', 'runs'])
+
+def extract_slide(slide, slide_index):
+    """
+    Walk the slide once and collect every piece of text the validators look at.
+
+    Parameters:
+    - slide: python-pptx Slide object.
+    - slide_index: 1-based slide number used in the issues.
+
+    Returns:
+    - SlideRecord holding a tuple of RunRecord in document order.
+    """
+    runs = []
+    for shape_index, shape in enumerate(slide.shapes):
+        if shape.has_text_frame:
+            for paragraph_index, paragraph in enumerate(shape.text_frame.paragraphs):
+                for run_index, run in enumerate(paragraph.runs):
+                    runs.append(RunRecord(run.text, run.font.name, shape.shape_id, paragraph_index, run_index, TEXT_FRAME, None, shape_index))
+        if shape.has_table:
+            for row_index, row in enumerate(shape.table.rows):
+                for col_index, cell in enumerate(row.cells):
+                    runs.append(RunRecord(cell.text, None, shape.shape_id, None, None, TABLE_CELL, (row_index, col_index), shape_index))
+        if shape.has_chart:
+            # Dibaca langsung dari XML chart part, tanpa objek Point/DataLabel per titik
+            runs.extend(chart_records(shape.chart_part._element, shape.shape_id, shape_index))
+    return SlideRecord(slide_index, tuple(runs))
+
+_NS = {
+    'a': "http://schemas.openxmlformats.org/drawingml/2006/main",
+    'c': "http://schemas.openxmlformats.org/drawingml/2006/chart",
+}
+_BREAK = f"{{{_NS['a']}}}br"
+_TEXT_RUNS = (f"{{{_NS['a']}}}r", f"{{{_NS['a']}}}fld")
+_PLOT_TAGS = frozenset(f"{{{_NS['c']}}}{name}" for name in (
+    'area3DChart', 'areaChart', 'bar3DChart', 'barChart', 'bubbleChart', 'doughnutChart', 'line3DChart', 'lineChart',
+    'ofPieChart', 'pie3DChart', 'pieChart', 'radarChart', 'scatterChart', 'stockChart', 'surface3DChart', 'surfaceChart',
+))
+_AXIS_TAGS = frozenset(f"{{{_NS['c']}}}{name}" for name in ('catAx', 'valAx', 'dateAx', 'serAx'))
+
+def text_body_text(text_body):
+    """
+    Text of an lxml a:txBody / c:rich element the way python-pptx's TextFrame.text
+    reads it: paragraphs joined with "\n", line breaks as "\v".
+    """
+    if text_body is None:
+        return ''
+    paragraphs = []
+    for paragraph in text_body.iterfind('a:p', _NS):
+        parts = []
+        for child in paragraph:
+            if child.tag == _BREAK:
+                parts.append('\v')
+            elif child.tag in _TEXT_RUNS:
+                parts.append(child.findtext('a:t', '', _NS))
+        paragraphs.append(''.join(parts))
+    return '\n'.join(paragraphs)
+
+# XPath terkompilasi: elemen oxml python-pptx mengganti xpath() dengan versi tanpa argumen namespaces
+_PT_COUNTS = {name: etree.XPath(f"./c:{name}//c:ptCount/@val", namespaces=_NS) for name in ('cat', 'xVal', 'yVal', 'bubbleSize')}
+_CATEGORY_LEVELS = etree.XPath("./c:cat/c:strRef/c:strCache | ./c:cat/c:multiLvlStrRef/c:multiLvlStrCache/c:lvl", namespaces=_NS)
+
+def _point_count(series, plot_tag):
+    # Jumlah titik seperti len(series.points) di python-pptx
+    def count(name):
+        values = _PT_COUNTS[name](series)
+        return int(values[0]) if values else 0
+    if plot_tag.endswith('}scatterChart'):
+        return min(count('xVal'), count('yVal'))
+    if plot_tag.endswith('}bubbleChart'):
+        return min(count('xVal'), count('yVal'), count('bubbleSize'))
+    return count('cat')
+
+def chart_records(chart_space, shape_id, shape_index=None):
+    """
+    Collect all the text of a chart in one pass over its XML.
+
+    Reads the chart title, axis titles, series names, category labels (text
+    categories of the first series of each plot), cached number formats and
+    custom data labels. Series are numbered in python-pptx `chart.series` order
+    (plots in document order, c:order within a plot), and data labels are kept
+    only for existing points, as `point.data_label` would.
+
+    Parameters:
+    - chart_space: lxml c:chartSpace element of the chart part.
+    - shape_id: id of the graphic frame holding the chart.
+    - shape_index: position of the graphic frame in slide.shapes.
+
+    Returns:
+    - list of RunRecord with one of the CHART_ORIGINS.
+    """
+    def record(text, origin, cell):
+        records.append(RunRecord(text, None, shape_id, None, None, origin, cell, shape_index))
+
+    records = []
+    chart = chart_space.find('c:chart', _NS)
+    if chart is None:
+        return records
+    title = chart.find('c:title/c:tx/c:rich', _NS)
+    if title is not None:
+        record(text_body_text(title), CHART_TITLE, None)
+    plot_area = chart.find('c:plotArea', _NS)
+    if plot_area is None:
+        return records
+
+    series_index = 0
+    axis_index = 0
+    for element in plot_area:
+        if element.tag in _AXIS_TAGS:
+            axis_title = element.find('c:title/c:tx/c:rich', _NS)
+            if axis_title is not None:
+                record(text_body_text(axis_title), CHART_AXIS_TITLE, (axis_index,))
+            axis_index += 1
+            continue
+        if element.tag not in _PLOT_TAGS:
+            continue
+        plot_series = sorted(element.iterfind('c:ser', _NS), key=lambda series: int(series.find('c:order', _NS).get('val')))
+        plot_label_format = element.find('c:dLbls/c:numFmt', _NS)
+        for position, series in enumerate(plot_series):
+            name = series.findtext('c:tx/c:strRef/c:strCache/c:pt/c:v', None, _NS) or series.findtext('c:tx/c:v', None, _NS)
+            if name:
+                record(name, CHART_SERIES_NAME, (series_index,))
+            if position == 0:
+                # Kategori biasanya sama untuk semua series dalam satu plot
+                for level_index, level in enumerate(_CATEGORY_LEVELS(series)):
+                    for point in level.iterfind('c:pt', _NS):
+                        record(point.findtext('c:v', '', _NS), CHART_CATEGORY, (series_index, int(point.get('idx')), level_index))
+            formats = [series.findtext('c:val/c:numRef/c:numCache/c:formatCode', None, _NS)]
+            # Format label milik series, kalau tidak ada format label plot
+            label_format = series.find('c:dLbls/c:numFmt', _NS)
+            if label_format is None:
+                label_format = plot_label_format
+            if label_format is not None:
+                formats.append(label_format.get('formatCode'))
+            for format_code in dict.fromkeys(formats):
+                if format_code and format_code != 'General':
+                    record(format_code, CHART_NUMBER_FORMAT, (series_index,))
+
+            labels = {}
+            for label in series.iterfind('c:dLbls/c:dLbl', _NS):
+                labels.setdefault(int(label.find('c:idx', _NS).get('val')), label)
+            point_count = _point_count(series, element.tag) if labels else 0
+            for point_index in sorted(labels):
+                rich = labels[point_index].find('c:tx/c:rich', _NS)
+                if point_index < point_count and rich is not None:
+                    record(text_body_text(rich), CHART_LABEL, (series_index, point_index))
+            series_index += 1
+    return records
+
+def iter_runs(slide_record, origin=TEXT_FRAME):
+    """
+    Yield the runs of a SlideRecord that come from the given origin.
+    """
+    for run in slide_record.runs:
+        if run.origin == origin:
+            yield run
+
+def table_columns(slide_record):
+    """
+    Column-major view of the tables of a SlideRecord, built in one pass over the cells.
+
+    Returns:
+    - dict mapping each table's (shape_id, shape_index) to a list of columns; a
+      column is the list of its TABLE_CELL RunRecords in row order.
+    """
+    tables = {}
+    for run in iter_runs(slide_record, TABLE_CELL):
+        columns = tables.setdefault((run.shape_id, run.shape_index), [])
+        col_index = run.cell[1]
+        while len(columns) <= col_index:
+            columns.append([])
+        columns[col_index].append(run)
+    return tables
+
+def run_location(run, start=0, end=None):
+    """
+    Address of a character span inside a RunRecord, stored in an issue's
+    'locations' list so the highlighter can go straight to the run (or the
+    table cell) instead of searching for the text.
+    """
+    return {
+        'shape_id': run.shape_id,
+        'shape_index': run.shape_index,
+        'paragraph_index': run.paragraph_index,
+        'run_index': run.run_index,
+        'origin': run.origin,
+        'cell': list(run.cell) if run.cell is not None else None,
+        'start': start,
+        'end': len(run.text) if end is None else end,
+    }
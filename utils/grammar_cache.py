@@ -0,0 +1,241 @@
+# utils/grammar_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+class GrammarCache:
+    """
+    Content-addressed cache of LanguageTool results stored in a local SQLite file.
+
+    Parameters:
+    - path: SQLite file; the directory is created when needed.
+    - max_bytes: size budget for stored results; least recently used rows are evicted.
+    - language, ruleset: part of the key so results of other settings are never reused.
+    - claim_timeout: seconds after which a text claimed by another process that
+      never stored a result (e.g. the worker died) may be checked again.
+    """
+
+    # Ukuran total baru dihitung ulang (SUM) setelah sebanyak ini bagian dari max_bytes ditulis proses ini
+    EVICT_CHECK_FRACTION = 1 / 16
+
+    # Bagian dari key; naikkan kalau arti hasil yang disimpan berubah (2: offset dalam karakter, bukan UTF-16)
+    FORMAT_VERSION = 2
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024, language='en-US', ruleset='default', claim_timeout=120):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.language = language
+        self.ruleset = ruleset
+        self.claim_timeout = claim_timeout
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+        # Teks yang sedang dicek thread lain di proses ini
+        self._in_flight = {}
+        # Dimulai dari ambang supaya put_many pertama di proses ini langsung memeriksa ukuran
+        self._written = self.max_bytes * self.EVICT_CHECK_FRACTION
+        self._local = threading.local()
+
+    def _connect(self):
+        # Koneksi dibuat ulang setelah fork supaya worker proses tidak berbagi handle
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS grammar_cache ("
+                "key TEXT PRIMARY KEY, matches TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS grammar_cache_last_used ON grammar_cache (last_used)")
+            connection.execute("CREATE TABLE IF NOT EXISTS grammar_cache_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            # Teks yang sedang dicek, dibagi antar proses (worker pool memakai file yang sama)
+            connection.execute("CREATE TABLE IF NOT EXISTS grammar_in_flight (key TEXT PRIMARY KEY, claimed REAL NOT NULL, pid INTEGER NOT NULL)")
+            connection.commit()
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def key(self, text):
+        normalized = text.strip()
+        payload = f"{self.FORMAT_VERSION}\0{self.language}\0{self.ruleset}\0{normalized}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def get_many(self, texts, budget=None):
+        """
+        Look texts up in the cache.
+
+        Waiting for a text another caller is checking stops when `budget`
+        (utils.grammar_guard.GrammarBudget) runs out; the text is then returned as
+        missing and the caller's own budget check skips it.
+
+        Returns:
+        - (found, missing) where found maps text to its serialized matches (list of
+          dicts) and missing lists the texts this caller must check and `put_many`,
+          both in the order of `texts`. Texts already being checked by another
+          thread or another process using the same cache file are waited for, so
+          the same text is not sent to the backend twice (unless that check fails).
+        """
+        found = {}
+        missing = []
+        waiting = []
+        # dict.fromkeys: urutan teks slide dipertahankan, jadi request batch sama di setiap run
+        keys = {text: self.key(text) for text in dict.fromkeys(texts)}
+        with self._lock:
+            connection = self._connect()
+            now = time.time()
+            for text, key in keys.items():
+                row = connection.execute("SELECT matches FROM grammar_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    found[text] = json.loads(row[0])
+                    connection.execute("UPDATE grammar_cache SET last_used = ? WHERE key = ?", (now, key))
+                elif key in self._in_flight:
+                    waiting.append((text, self._in_flight[key]))
+                elif self._claim(connection, key, now):
+                    self._in_flight[key] = threading.Event()
+                    missing.append(text)
+                else:
+                    # Dicek proses lain
+                    waiting.append((text, None))
+            connection.commit()
+
+        for text, event in waiting:
+            if event is not None:
+                event.wait(budget.remaining() if budget else None)
+            else:
+                self._wait_for_other_process(keys[text], budget)
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute("SELECT matches FROM grammar_cache WHERE key = ?", (keys[text],)).fetchone()
+                if row is None:
+                    # Pemilik gagal mengecek; caller ini yang mencoba
+                    self._in_flight.setdefault(keys[text], threading.Event())
+                    connection.execute("INSERT OR REPLACE INTO grammar_in_flight (key, claimed, pid) VALUES (?, ?, ?)",
+                                       (keys[text], time.time(), os.getpid()))
+                    connection.commit()
+            if row is not None:
+                found[text] = json.loads(row[0])
+            else:
+                missing.append(text)
+        order = {text: position for position, text in enumerate(keys)}
+        missing.sort(key=order.get)
+
+        counts = {
+            'hits': len(found),
+            'misses': len(missing),
+            'bytes_saved': sum(len(text.encode('utf-8')) for text in found),
+        }
+        self._add_stats(**counts)
+        run_counts = getattr(self._local, 'counts', None)
+        if run_counts is not None:
+            for name, value in counts.items():
+                run_counts[name] += value
+        return found, missing
+
+    def _claim(self, connection, key, now):
+        # Klaim yang kedaluwarsa (prosesnya mati sebelum menyimpan hasil) boleh diambil alih
+        connection.execute("DELETE FROM grammar_in_flight WHERE key = ? AND claimed < ?", (key, now - self.claim_timeout))
+        cursor = connection.execute("INSERT OR IGNORE INTO grammar_in_flight (key, claimed, pid) VALUES (?, ?, ?)", (key, now, os.getpid()))
+        return cursor.rowcount == 1
+
+    def _wait_for_other_process(self, key, budget=None, poll_interval=0.05):
+        # Proses lain tidak bisa membangunkan Event di sini, jadi file cache dipantau
+        while not (budget and budget.expired()):
+            with self._lock:
+                connection = self._connect()
+                if connection.execute("SELECT 1 FROM grammar_cache WHERE key = ?", (key,)).fetchone() is not None:
+                    return
+                row = connection.execute("SELECT claimed FROM grammar_in_flight WHERE key = ?", (key,)).fetchone()
+            if row is None or time.time() - row[0] > self.claim_timeout:
+                return
+            time.sleep(poll_interval)
+
+    def put_many(self, results):
+        """
+        Store serialized matches for the texts returned as missing by get_many.
+        """
+        with self._lock:
+            connection = self._connect()
+            now = time.time()
+            for text, matches in results.items():
+                serialized = json.dumps(matches)
+                connection.execute(
+                    "INSERT OR REPLACE INTO grammar_cache (key, matches, size, last_used) VALUES (?, ?, ?, ?)",
+                    (self.key(text), serialized, len(serialized) + len(text), now),
+                )
+                self._written += len(serialized) + len(text)
+            connection.commit()
+            # Scan SUM(size) hanya setelah cukup banyak data baru, bukan di setiap put_many
+            if self._written >= self.max_bytes * self.EVICT_CHECK_FRACTION:
+                self._written = 0
+                self._evict(connection)
+        self.release(results)
+
+    def release(self, texts):
+        # Lepaskan klaim dan bangunkan thread yang menunggu teks ini, berhasil atau tidak
+        with self._lock:
+            keys = [self.key(text) for text in texts]
+            connection = self._connect()
+            connection.executemany("DELETE FROM grammar_in_flight WHERE key = ?", [(key,) for key in keys])
+            connection.commit()
+            for key in keys:
+                event = self._in_flight.pop(key, None)
+                if event is not None:
+                    event.set()
+
+    def _evict(self, connection):
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM grammar_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        rows = connection.execute("SELECT key, size FROM grammar_cache ORDER BY last_used").fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= target:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM grammar_cache WHERE key = ?", evicted)
+        connection.commit()
+        logging.debug(f"Grammar cache evicted {len(evicted)} entries")
+
+    def _add_stats(self, **values):
+        with self._lock:
+            connection = self._connect()
+            for name, value in values.items():
+                connection.execute(
+                    "INSERT INTO grammar_cache_stats (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    (name, value),
+                )
+            connection.commit()
+
+    @contextmanager
+    def counting(self):
+        """
+        Count the lookups made by the current thread inside the block (one chunk
+        of one run); yields a dict with 'hits', 'misses' and 'bytes_saved'.
+        """
+        counts = {'hits': 0, 'misses': 0, 'bytes_saved': 0}
+        previous = getattr(self._local, 'counts', None)
+        self._local.counts = counts
+        try:
+            yield counts
+        finally:
+            self._local.counts = previous
+
+    def stats(self):
+        """
+        Cumulative counters (hits, misses, bytes_saved) shared by all processes.
+        """
+        with self._lock:
+            rows = self._connect().execute("SELECT name, value FROM grammar_cache_stats").fetchall()
+        stats = {'hits': 0, 'misses': 0, 'bytes_saved': 0}
+        stats.update(dict(rows))
+        return stats
@@ -0,0 +1,68 @@
+# utils/grammar_client.py
+
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from language_tool_python.match import Match
+
+class LanguageToolPool:
+    """
+    Client for one or more LanguageTool servers speaking the /v2/check protocol.
+
+    Requests go round-robin over the servers through one keep-alive session, with
+    at most `max_in_flight` requests open at the same time.
+
+    Parameters:
+    - urls: base URLs such as "http://localhost:8081" (with or without "/v2").
+    - language: language code sent with every request.
+    - max_in_flight: bound on concurrent requests over all servers.
+    - timeout: per-request timeout in seconds.
+    """
+
+    def __init__(self, urls, language='en-US', max_in_flight=8, timeout=30):
+        if not urls:
+            raise ValueError("LanguageToolPool needs at least one server URL")
+        self.urls = [self._check_url(url) for url in urls]
+        self.language = language
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.urls), pool_maxsize=max_in_flight)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._next_url = itertools.cycle(self.urls)
+        self._url_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight)
+
+    @staticmethod
+    def _check_url(url):
+        url = url.rstrip('/')
+        if not url.endswith('/v2'):
+            url += '/v2'
+        return url + '/check'
+
+    def check(self, text):
+        """
+        Check one text; returns language_tool_python Match objects.
+        """
+        with self._url_lock:
+            url = next(self._next_url)
+        with self._slots:
+            response = self._session.post(url, data={'text': text, 'language': self.language}, timeout=self.timeout)
+        response.raise_for_status()
+        return [Match(match) for match in response.json()['matches']]
+
+    def check_many(self, texts):
+        """
+        Check texts concurrently over the pool; results keep the order of `texts`.
+        """
+        if len(texts) <= 1:
+            return [self.check(text) for text in texts]
+        return list(self._executor.map(self.check, texts))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self._session.close()
@@ -0,0 +1,105 @@
+# utils/grammar_guard.py
+
+import logging
+import threading
+import time
+
+class GrammarUnavailable(Exception):
+    """
+    Raised when the grammar backend is skipped (open breaker, exhausted budget) or fails.
+    """
+
+class CircuitBreaker:
+    """
+    Stop calling a failing backend for a while.
+
+    After `failure_threshold` consecutive failures the breaker opens and `allow()`
+    returns False until `reset_timeout` seconds have passed. Then one trial call is
+    let through (half-open); success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return 'closed'
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logging.warning(f"Grammar backend failed {self._failures} times in a row; pausing grammar checks")
+                self._opened_at = time.monotonic()
+
+class GrammarBudget:
+    """
+    Total time budget for the grammar stage of one deck.
+
+    The clock starts with `start()`, or at the first `remaining()`/`expired()`,
+    so time spent waiting in a queue before the first chunk runs is not counted.
+    The deadline is a wall-clock timestamp and is fixed when the budget is pickled
+    to a worker process, so every copy of the deck's budget shares it. Slides whose
+    grammar check was skipped or cut short are recorded in `incomplete` (per process).
+
+    Parameters:
+    - seconds: budget in seconds, or None for no limit.
+    """
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.deadline = None
+        self.incomplete = {}
+
+    def start(self):
+        if self.deadline is None and self.seconds is not None:
+            self.deadline = time.time() + self.seconds
+
+    def __getstate__(self):
+        # Chunk dikirim ke worker saat dijalankan: jam dimulai paling lambat di sini
+        self.start()
+        return self.__dict__
+
+    def remaining(self):
+        if self.seconds is None:
+            return None
+        self.start()
+        return max(0.0, self.deadline - time.time())
+
+    def expired(self):
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def mark_incomplete(self, slide_index, reason):
+        self.incomplete.setdefault(slide_index, reason)
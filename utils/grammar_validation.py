@@ -1,28 +1,259 @@
 # utils/grammar_validation.py
 
+import bisect
+import logging
+import math
+import re
+import threading
+from collections import namedtuple
 import language_tool_python
+from utils.extraction import iter_runs, run_location
+from utils.grammar_cache import GrammarCache
+from utils.grammar_client import LanguageToolPool
+from utils.grammar_guard import CircuitBreaker, GrammarUnavailable
+from config import (GRAMMAR_BATCH_SCOPE, GRAMMAR_MAX_REQUEST_CHARS, GRAMMAR_LANGUAGE, GRAMMAR_RULESET,
+                    GRAMMAR_CACHE_PATH, GRAMMAR_CACHE_MAX_BYTES, LANGUAGETOOL_SERVERS,
+                    LANGUAGETOOL_MAX_IN_FLIGHT, LANGUAGETOOL_TIMEOUT, GRAMMAR_REQUEST_TIMEOUT, GRAMMAR_MAX_ABANDONED_CALLS,
+                    GRAMMAR_BREAKER_THRESHOLD, GRAMMAR_BREAKER_RESET)
+
+# Pemisah antar run di dalam satu dokumen; LanguageTool memperlakukannya sebagai batas paragraf
+GRAMMAR_SEPARATOR = "\n\n"
+
+# Bagian dari Match LanguageTool yang dipakai validator dan disimpan di cache
+GrammarMatch = namedtuple('GrammarMatch', ['offset', 'errorLength', 'replacements', 'ruleId', 'message'])
+
+grammar_cache = GrammarCache(GRAMMAR_CACHE_PATH, GRAMMAR_CACHE_MAX_BYTES, GRAMMAR_LANGUAGE, GRAMMAR_RULESET) if GRAMMAR_CACHE_PATH else None
+
+# Dipakai bersama semua slide di proses ini: setelah gagal berturut-turut backend tidak dipanggil dulu
+grammar_breaker = CircuitBreaker(GRAMMAR_BREAKER_THRESHOLD, GRAMMAR_BREAKER_RESET)
+
+# Panggilan backend yang melewati timeout tidak bisa dihentikan; jumlahnya dibatasi
+_abandoned_lock = threading.Lock()
+_abandoned_calls = 0
 
 def initialize_language_tool():
     try:
-        return language_tool_python.LanguageToolPublicAPI('en-US')
+        if LANGUAGETOOL_SERVERS:
+            # Server LanguageTool lokal (atau pengganti yang memakai protokol /v2/check)
+            return LanguageToolPool(LANGUAGETOOL_SERVERS, GRAMMAR_LANGUAGE, LANGUAGETOOL_MAX_IN_FLIGHT, LANGUAGETOOL_TIMEOUT)
+        return language_tool_python.LanguageToolPublicAPI(GRAMMAR_LANGUAGE)
     except Exception as e:
-        st.error(f"LanguageTool initialization failed: {e}")
+        logging.error(f"LanguageTool initialization failed: {e}")
         return None
 
-def validate_grammar_slide(slide, slide_index, grammar_tool):
+def build_grammar_batches(texts, max_chars=GRAMMAR_MAX_REQUEST_CHARS):
+    """
+    Join texts into as few documents as possible without exceeding max_chars.
+
+    Parameters:
+    - texts: list of strings to check.
+    - max_chars: request-size cap; a single longer text is sent on its own.
+
+    Returns:
+    - list of (document, offsets); offsets holds a (start, position) tuple for
+      every text in the document, position being its index in `texts`.
+    """
+    batches = []
+    document = []
+    offsets = []
+    length = 0
+    for position, text in enumerate(texts):
+        extra = len(text) + (len(GRAMMAR_SEPARATOR) if document else 0)
+        if document and length + extra > max_chars:
+            batches.append((GRAMMAR_SEPARATOR.join(document), offsets))
+            document, offsets, length = [], [], 0
+            extra = len(text)
+        start = length + (len(GRAMMAR_SEPARATOR) if document else 0)
+        document.append(text)
+        offsets.append((start, position))
+        length += extra
+    if document:
+        batches.append((GRAMMAR_SEPARATOR.join(document), offsets))
+    return batches
+
+# Karakter di luar BMP (emoji dsb.): satu karakter Python, dua code unit UTF-16
+_ASTRAL = re.compile('[\U00010000-\U0010FFFF]')
+
+def utf16_to_index(document):
+    """
+    Return a function that turns an offset in UTF-16 code units (what LanguageTool,
+    a Java server, reports) into an index of the Python string `document`.
+    """
+    # Posisi UTF-16 setiap karakter astral: indeks Python ditambah jumlah karakter astral sebelumnya
+    astral = [match.start() + count for count, match in enumerate(_ASTRAL.finditer(document))]
+    if not astral:
+        return lambda offset: offset
+    return lambda offset: offset - bisect.bisect_left(astral, offset)
+
+def _call_backend(function, argument, timeout):
+    """
+    Call the backend in a daemon thread and wait at most `timeout` seconds.
+
+    A call that times out keeps running in its thread until the backend answers;
+    being a daemon it does not hold up interpreter exit. While
+    GRAMMAR_MAX_ABANDONED_CALLS such calls are still running, new calls are
+    refused instead of piling more threads onto a backend that does not answer.
+    """
+    global _abandoned_calls
+    with _abandoned_lock:
+        if _abandoned_calls >= GRAMMAR_MAX_ABANDONED_CALLS:
+            raise GrammarUnavailable(f"{_abandoned_calls} earlier grammar calls still running after their timeout")
+    outcome = {}
+    finished = threading.Event()
+
+    def call():
+        global _abandoned_calls
+        try:
+            outcome['result'] = function(argument)
+        except Exception as e:
+            outcome['error'] = e
+        finally:
+            with _abandoned_lock:
+                finished.set()
+                if outcome.get('abandoned'):
+                    _abandoned_calls -= 1
+
+    threading.Thread(target=call, name='grammar-call', daemon=True).start()
+    finished.wait(timeout)
+    with _abandoned_lock:
+        # Dicek lagi di bawah lock: panggilan bisa selesai tepat setelah wait() habis
+        if not finished.is_set():
+            outcome['abandoned'] = True
+            _abandoned_calls += 1
+    if outcome.get('abandoned'):
+        grammar_breaker.record_failure()
+        raise GrammarUnavailable(f"no answer within {timeout:.0f} s")
+    if 'error' in outcome:
+        grammar_breaker.record_failure()
+        raise GrammarUnavailable(str(outcome['error'])) from outcome['error']
+    grammar_breaker.record_success()
+    return outcome['result']
+
+def _check_documents(grammar_tool, documents, budget=None):
+    def timeout_for(requests):
+        timeout = GRAMMAR_REQUEST_TIMEOUT * requests
+        remaining = budget.remaining() if budget else None
+        return timeout if remaining is None else min(timeout, remaining)
+
+    def guard():
+        if budget and budget.expired():
+            raise GrammarUnavailable("grammar time budget exhausted")
+        if not grammar_breaker.allow():
+            raise GrammarUnavailable("grammar backend circuit open")
+
+    if hasattr(grammar_tool, 'check_many'):
+        # Pool server: semua dokumen dikirim bersamaan
+        guard()
+        rounds = math.ceil(len(documents) / getattr(grammar_tool, 'max_in_flight', 1))
+        return _call_backend(grammar_tool.check_many, documents, timeout_for(rounds))
+    responses = []
+    for document in documents:
+        guard()
+        responses.append(_call_backend(grammar_tool.check, document, timeout_for(1)))
+    return responses
+
+def check_texts(grammar_tool, texts, max_chars=GRAMMAR_MAX_REQUEST_CHARS, budget=None):
+    """
+    Check many texts with few requests.
+
+    Returns:
+    - list with, for every text, the GrammarMatch objects whose offset falls inside
+      that text. Offsets and lengths are in characters (LanguageTool's UTF-16 code
+      units converted), relative to the text; a match never runs past its text.
+
+    Raises GrammarUnavailable when the budget is exhausted, the circuit breaker is
+    open, or a request fails or times out.
+    """
+    results = [[] for _ in texts]
+    batches = build_grammar_batches(texts, max_chars)
+    if not batches:
+        return results
+    responses = _check_documents(grammar_tool, [document for document, _ in batches], budget)
+    for (document, offsets), matches in zip(batches, responses):
+        starts = [start for start, _ in offsets]
+        to_index = utf16_to_index(document)
+        for match in matches:
+            offset = to_index(match.offset)
+            i = bisect.bisect_right(starts, offset) - 1
+            if i < 0:
+                continue
+            start, position = offsets[i]
+            end = start + len(texts[position])
+            # Match yang jatuh di pemisah tidak milik run mana pun
+            if offset >= end:
+                continue
+            results[position].append(GrammarMatch(
+                offset - start,
+                min(to_index(match.offset + match.errorLength), end) - offset,
+                list(match.replacements),
+                getattr(match, 'ruleId', None),
+                getattr(match, 'message', None),
+            ))
+    return results
+
+def check_texts_cached(grammar_tool, texts, budget=None):
+    """
+    Same as check_texts, but texts already in the grammar cache are not sent again.
+    """
+    if grammar_cache is None:
+        return check_texts(grammar_tool, texts, budget=budget)
+    found, missing = grammar_cache.get_many(texts, budget)
+    try:
+        fresh = check_texts(grammar_tool, missing, budget=budget)
+    except Exception:
+        grammar_cache.release(missing)
+        raise
+    grammar_cache.put_many({text: [match._asdict() for match in matches] for text, matches in zip(missing, fresh)})
+
+    checked = dict(zip(missing, fresh))
+    results = []
+    for text in texts:
+        if text in checked:
+            results.append(checked[text])
+        else:
+            results.append([GrammarMatch(**match) for match in found[text]])
+    return results
+
+def _group_key(run):
+    if GRAMMAR_BATCH_SCOPE == "paragraph":
+        return (run.shape_id, run.shape_index, run.paragraph_index)
+    if GRAMMAR_BATCH_SCOPE == "run":
+        return (run.shape_id, run.shape_index, run.paragraph_index, run.run_index)
+    return None
+
+def validate_grammar_slide(slide_record, slide_index, grammar_tool, budget=None):
     issues = []
-    for shape in slide.shapes:
-        if shape.has_text_frame:
-            for paragraph in shape.text_frame.paragraphs:
-                for run in paragraph.runs:
-                    text = run.text.strip()
-                    if text and grammar_tool:
-                        matches = grammar_tool.check(text)
-                        for match in matches:
-                            issues.append({
-                                'slide': slide_index,
-                                'issue': 'Grammar Error',
-                                'text': text,
-                                'corrected': match.replacements
-                            })
+    # Satu dokumen per slide (atau per paragraf), bukan satu request per run
+    groups = {}
+    for run in iter_runs(slide_record):
+        text = run.text.strip()
+        if text:
+            groups.setdefault(_group_key(run), []).append((text, run))
+
+    if not grammar_tool:
+        # Tanpa klien (inisialisasi gagal atau grammar dimatikan) slide ini tidak dicek sama sekali
+        if groups and budget is not None:
+            budget.mark_incomplete(slide_index, "grammar checker unavailable")
+        return issues
+
+    for group in groups.values():
+        group_texts = [text for text, _ in group]
+        try:
+            results = check_texts_cached(grammar_tool, group_texts, budget)
+        except GrammarUnavailable as e:
+            logging.warning(f"Slide {slide_index}: grammar check skipped ({e})")
+            if budget is not None:
+                budget.mark_incomplete(slide_index, str(e))
+            continue
+        for (text, run), matches in zip(group, results):
+            # Offset LanguageTool relatif ke teks yang sudah di-strip
+            lead = len(run.text) - len(run.text.lstrip())
+            for match in matches:
+                issues.append({
+                    'slide': slide_index,
+                    'issue': 'Grammar Error',
+                    'text': text,
+                    'corrected': match.replacements,
+                    'locations': [run_location(run, lead + match.offset, lead + match.offset + match.errorLength)]
+                })
     return issues
@@ -1,54 +1,171 @@
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 import csv
+import io
 import logging
+import zipfile
+from config import HIGHLIGHT_OUTPUT
+from utils.package_writer import write_package, changed_slide_parts
+from utils.xml_extraction import slide_partnames
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
+HIGHLIGHT_COLOR = RGBColor(255, 255, 0)
+
+def highlight_presentation(presentation, issues):
+    """
+    Highlight the runs the issues point at, directly in a loaded Presentation.
+
+    Issues carry 'locations' (see utils.extraction.run_location), so every run is
+    addressed by shape position, paragraph index and run index instead of searched
+    for. The shape id is checked as well, but not used to find the shape: copied
+    shapes can share an id on one slide.
+    Issues without locations (results stored by older versions) fall back to
+    matching their text against the runs of their slide.
+
+    Parameters:
+    - presentation: python-pptx Presentation, modified in place.
+    - issues: List of issues found in the presentation.
+
+    Returns:
+    - set of slide numbers (1-based) where at least one run was coloured.
+    """
+    by_slide = {}
+    for issue in issues:
+        if isinstance(issue, dict) and (issue.get('locations') or issue.get('text')):  # Issue tanpa teks (mis. ringkasan) tidak di-highlight
+            by_slide.setdefault(issue['slide'], []).append(issue)
+
+    changed = set()
+    for slide_number, slide_issues in by_slide.items():
+        slide = presentation.slides[slide_number - 1]
+        shapes = list(slide.shapes)
+        # Paragraf per shape dan run per paragraf diambil sekali; python-pptx membangunnya ulang di setiap akses
+        runs = {}
+        for issue in slide_issues:
+            locations = issue.get('locations')
+            if not locations:
+                if _highlight_by_text(slide, issue['text']):
+                    changed.add(slide_number)
+                continue
+            for location in locations:
+                for run in _location_runs(shapes, runs, location):
+                    run.font.color.rgb = HIGHLIGHT_COLOR
+                    changed.add(slide_number)
+    return changed
+
+def _location_shape(shapes, location):
+    shape_index = location.get('shape_index')
+    if shape_index is not None:
+        if shape_index < len(shapes) and shapes[shape_index].shape_id == location['shape_id']:
+            return shape_index
+        return None
+    # Location tanpa posisi shape (hasil versi lama): shape pertama dengan id ini
+    return next((index for index, shape in enumerate(shapes) if shape.shape_id == location['shape_id']), None)
+
+def _location_runs(shapes, runs, location):
+    shape_index = _location_shape(shapes, location)
+    if shape_index is None:
+        return []
+    shape = shapes[shape_index]
+    if location['origin'] == 'text':
+        paragraphs_key = (shape_index, None)
+        if paragraphs_key not in runs:
+            runs[paragraphs_key] = shape.text_frame.paragraphs
+        paragraphs = runs[paragraphs_key]
+        key = (shape_index, location['paragraph_index'])
+        if key not in runs:
+            runs[key] = paragraphs[location['paragraph_index']].runs if location['paragraph_index'] < len(paragraphs) else ()
+        paragraph_runs = runs[key]
+        return [paragraph_runs[location['run_index']]] if location['run_index'] < len(paragraph_runs) else []
+    if location['origin'] == 'table':
+        row, col = location['cell']
+        return [run for paragraph in shape.table.cell(row, col).text_frame.paragraphs for run in paragraph.runs]
+    # Label chart tidak diwarnai
+    return []
+
+def _highlight_by_text(slide, text):
+    found = False
+    for shape in slide.shapes:
+        if shape.has_text_frame:
+            for paragraph in shape.text_frame.paragraphs:
+                for run in paragraph.runs:
+                    if text in run.text:
+                        run.font.color.rgb = HIGHLIGHT_COLOR
+                        found = True
+    return found
+
 def highlight_ppt(input_ppt, output_ppt, issues):
     """
     Highlight text in the PowerPoint presentation based on the issues found.
 
     Parameters:
-    - input_ppt: Path to the input PowerPoint file.
-    - output_ppt: Path to save the highlighted PowerPoint file.
+    - input_ppt: Path to the input PowerPoint file, or an already loaded Presentation
+      (highlighted in place, so the deck is not parsed a second time).
+    - output_ppt: Path (or file-like object) to save the highlighted PowerPoint file.
     - issues: List of issues found in the presentation.
     """
-    presentation = Presentation(input_ppt)
-    for issue in issues:
-        if isinstance(issue, dict):
-            slide_index = issue['slide'] - 1
-            slide = presentation.slides[slide_index]
-            for shape in slide.shapes:
-                if shape.has_text_frame:
-                    for paragraph in shape.text_frame.paragraphs:
-                        for run in paragraph.runs:
-                            if issue.get('text', '') in run.text:  # Gunakan .get() untuk menghindari KeyError
-                                run.font.color.rgb = RGBColor(255, 255, 0)  # Highlight in yellow
+    presentation = input_ppt if hasattr(input_ppt, 'slides') else Presentation(input_ppt)
+    highlight_presentation(presentation, issues)
 
     # Save the highlighted presentation
     presentation.save(output_ppt)
 
+def highlight_to_buffer(source, presentation, issues, output_mode=None):
+    """
+    Highlight the issues and return the highlighted deck as a BytesIO, ready for
+    st.download_button.
+
+    Parameters:
+    - source: path or binary file object of the original .pptx that `presentation` was loaded from.
+    - presentation: the loaded Presentation (modified in place).
+    - issues: List of issues found in the presentation.
+    - output_mode: "passthrough" rewrites only the slide XML parts that got
+      highlights and copies every other zip member unchanged (embedded media is
+      not recompressed); "save" re-serializes the whole package with
+      presentation.save(). Default config.HIGHLIGHT_OUTPUT.
+    """
+    changed = highlight_presentation(presentation, issues)
+    buffer = io.BytesIO()
+    if (output_mode or HIGHLIGHT_OUTPUT) == "passthrough":
+        # Nama member slide dibaca dari zip asli; nama part python-pptx bisa sudah di-rename
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        with zipfile.ZipFile(source) as package:
+            partnames = slide_partnames(package)
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        write_package(source, changed_slide_parts(presentation, changed, partnames), buffer)
+    else:
+        presentation.save(buffer)
+    buffer.seek(0)
+    return buffer
+
 def save_to_csv(issues, output_csv):
     """
     Save the validation issues to a CSV file.
 
     Parameters:
     - issues: List of issues found in the presentation.
-    - output_csv: Path to save the CSV file.
+    - output_csv: Path to save the CSV file, or a text file object (e.g. io.StringIO).
     """
+    if hasattr(output_csv, 'write'):
+        _write_csv(issues, output_csv)
+        return
     with open(output_csv, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.DictWriter(file, fieldnames=['slide', 'issue', 'text', 'corrected', 'details'])
-        writer.writeheader()
-        for issue in issues:
-            if isinstance(issue, dict):
-                # Tambahkan logging untuk memeriksa isi issue
-                logging.debug(f"Issue: {issue}")  # Log isi dari issue
-                writer.writerow({
-                    'slide': issue.get('slide', ''),  # Gunakan .get() untuk menghindari KeyError
-                    'issue': issue.get('issue', ''),
-                    'text': issue.get('text', 'N/A'),  # Ganti dengan 'N/A' jika tidak ada
-                    'corrected': issue.get('corrected', ''),
-                    'details': issue.get('details', '')
-                })
+        _write_csv(issues, file)
+
+def _write_csv(issues, file):
+    writer = csv.DictWriter(file, fieldnames=['slide', 'issue', 'text', 'corrected', 'details'])
+    writer.writeheader()
+    for issue in issues:
+        if isinstance(issue, dict):
+            # Tambahkan logging untuk memeriksa isi issue
+            logging.debug(f"Issue: {issue}")  # Log isi dari issue
+            writer.writerow({
+                'slide': issue.get('slide', ''),  # Gunakan .get() untuk menghindari KeyError
+                'issue': issue.get('issue', ''),
+                'text': issue.get('text', 'N/A'),  # Ganti dengan 'N/A' jika tidak ada
+                'corrected': issue.get('corrected', ''),
+                'details': issue.get('details', '')
+            })
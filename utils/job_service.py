@@ -0,0 +1,400 @@
+# utils/job_service.py
+
+import io
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from utils.highlight import highlight_to_buffer, save_to_csv
+from utils.pipeline import validate_deck, _init_worker
+from utils.resources import resources
+from config import (JOB_EXECUTION_MODE, JOB_START_METHOD, JOB_WORKERS, JOB_MAX_RUNNING, JOB_QUEUE_LIMIT, JOB_QUEUE_BYTES,
+                    JOB_USER_LIMIT, JOB_RETENTION, JOB_RESULT_DIR)
+
+class JobRejected(Exception):
+    """
+    Raised by JobService.submit when the queue, or the user's share of it, is full.
+    """
+
+class FairScheduler:
+    """
+    Hands tasks to one executor round-robin over users.
+
+    Tasks wait in a queue per user; at most `max_in_flight` of them are inside the
+    executor at a time. A user with a 300-slide deck therefore gets one slot per
+    turn like everybody else instead of filling the pool ahead of a 5-slide deck.
+
+    When the executor breaks (a process worker died, e.g. out of memory on a huge
+    deck) a new one is created and the tasks that were inside the broken pool are
+    retried once; a task that breaks the pool twice fails with BrokenExecutor.
+
+    Parameters:
+    - create_executor: callable returning the ThreadPoolExecutor or ProcessPoolExecutor.
+    - max_in_flight: tasks handed to the executor at once (normally its size).
+    """
+
+    def __init__(self, create_executor, max_in_flight):
+        self._create_executor = create_executor
+        self._executor = create_executor()
+        self._max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._queues = OrderedDict()
+        self._condition = threading.Condition()
+        threading.Thread(target=self._dispatch, name="fair-scheduler", daemon=True).start()
+
+    def submit(self, user, function, *args):
+        future = Future()
+        with self._condition:
+            self._queues.setdefault(user, deque()).append((future, function, args, False))
+            self._condition.notify()
+        return future
+
+    def for_user(self, user):
+        """
+        Executor-like view whose submit() queues the task under `user`.
+        """
+        return _UserExecutor(self, user)
+
+    def queued(self):
+        with self._condition:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def _dispatch(self):
+        # Diserahkan dari thread sendiri, bukan dari done-callback thread milik executor
+        while True:
+            with self._condition:
+                while self._in_flight >= self._max_in_flight or not self._queues:
+                    self._condition.wait()
+                user, queue = self._queues.popitem(last=False)
+                task = queue.popleft()
+                if queue:
+                    # Giliran user ini pindah ke belakang
+                    self._queues[user] = queue
+                future, function, args, retried = task
+                # Task yang diulang sudah berstatus running
+                if not retried and not future.set_running_or_notify_cancel():
+                    continue
+                self._in_flight += 1
+                executor = self._executor
+            try:
+                inner = executor.submit(function, *args)
+            except BrokenExecutor:
+                self._release()
+                self._replace(executor)
+                self._retry(user, task, BrokenExecutor("worker pool broke while the task was submitted"))
+                continue
+            except Exception as e:
+                self._release()
+                future.set_exception(e)
+                continue
+            inner.add_done_callback(lambda inner, user=user, task=task, executor=executor: self._finish(inner, user, task, executor))
+
+    def _finish(self, inner, user, task, executor):
+        self._release()
+        future = task[0]
+        error = inner.exception()
+        if isinstance(error, BrokenExecutor):
+            self._replace(executor)
+            self._retry(user, task, error)
+        elif error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(inner.result())
+
+    def _retry(self, user, task, error):
+        future, function, args, retried = task
+        if retried:
+            future.set_exception(error)
+            return
+        with self._condition:
+            # Diulang paling depan di antrean user-nya
+            self._queues.setdefault(user, deque()).appendleft((future, function, args, True))
+            self._queues.move_to_end(user, last=False)
+            self._condition.notify()
+
+    def _replace(self, broken):
+        with self._condition:
+            # Beberapa task gagal bersamaan karena pool yang sama; pool hanya diganti sekali
+            if self._executor is not broken:
+                return
+            self._executor = self._create_executor()
+        logging.error("Worker pool broke (a worker process died); started a new pool")
+        broken.shutdown(wait=False)
+
+    def _release(self):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+class _UserExecutor:
+    def __init__(self, scheduler, user):
+        self._scheduler = scheduler
+        self._user = user
+
+    def submit(self, function, *args):
+        return self._scheduler.submit(self._user, function, *args)
+
+class Job:
+    """
+    One deck submission and everything the UI needs to show it: status, progress,
+    the issues of finished slides (in completion order) and, once done, the CSV
+    report and the highlighted deck. Those two are kept on disk and read when
+    downloaded, so retained jobs do not hold large decks in memory.
+    """
+
+    def __init__(self, user, name, data, options):
+        self.id = uuid.uuid4().hex
+        self.user = user
+        self.name = name
+        self.data = data
+        self.size = len(data)
+        self.options = options
+        self.status = 'queued'
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.done = 0
+        self.total = 0
+        self.rows = []
+        self.issues = None
+        self.report = {}
+        self.csv_path = None
+        self.ppt_path = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    @property
+    def csv_output(self):
+        return _read_output(self.csv_path)
+
+    @property
+    def ppt_output(self):
+        return _read_output(self.ppt_path)
+
+    def remove_outputs(self):
+        for path in (self.csv_path, self.ppt_path):
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+    def add_slide(self, slide_index, slide_issues):
+        with self._lock:
+            self.rows.extend(slide_issues)
+
+    def set_progress(self, done, total):
+        self.done, self.total = done, total
+
+    def rows_since(self, start):
+        with self._lock:
+            return self.rows[start:]
+
+    def snapshot(self):
+        return {
+            'id': self.id,
+            'user': self.user,
+            'name': self.name,
+            'status': self.status,
+            'done': self.done,
+            'total': self.total,
+            'issues': len(self.rows),
+            'submitted': self.submitted,
+            'started': self.started,
+            'finished': self.finished,
+            'error': self.error,
+        }
+
+def _read_output(path):
+    if path is None:
+        return None
+    with open(path, 'rb') as file:
+        return file.read()
+
+class JobService:
+    """
+    In-process validation service shared by every Streamlit session.
+
+    Jobs are admitted against a global and a per-user limit, started round-robin
+    per user (at most `max_running` at a time) and their slide chunks run on one
+    shared pool sized to the CPU count, so five analysts uploading at once share
+    the cores instead of each starting a pool of their own. Finished jobs are
+    kept for `retention` seconds, so a page refresh can still fetch the result.
+
+    Parameters:
+    - mode: "process" or "thread" pool for the slide chunks.
+    - workers: pool size (None = CPU count).
+    - max_running: decks being extracted/validated/highlighted at once.
+    - max_queued: queued plus running jobs before submissions are rejected.
+    - max_queued_bytes: total size of the decks of queued plus running jobs (their
+      bytes are held in memory until validated) before submissions are rejected.
+    - max_per_user: queued plus running jobs of one user.
+    - retention: seconds a finished job stays retrievable.
+    - start_method: multiprocessing start method of the process workers ("forkserver" or "spawn").
+    - result_dir: directory for the reports and highlighted decks of finished jobs
+      (None = a new temporary directory).
+    """
+
+    def __init__(self, mode=JOB_EXECUTION_MODE, workers=JOB_WORKERS, max_running=JOB_MAX_RUNNING,
+                 max_queued=JOB_QUEUE_LIMIT, max_per_user=JOB_USER_LIMIT, retention=JOB_RETENTION,
+                 start_method=JOB_START_METHOD, max_queued_bytes=JOB_QUEUE_BYTES, result_dir=JOB_RESULT_DIR):
+        self.mode = mode
+        self.workers = workers or os.cpu_count()
+        self.max_queued = max_queued
+        self.max_queued_bytes = max_queued_bytes
+        self.result_dir = result_dir or tempfile.mkdtemp(prefix="validation-jobs-")
+        os.makedirs(self.result_dir, exist_ok=True)
+        self.max_per_user = max_per_user
+        self.retention = retention
+        if mode == "process":
+            # Worker tidak di-fork dari server yang sedang menjalankan banyak thread: lock yang kebetulan
+            # dipegang thread lain (mis. GrammarCache._lock) akan ikut tersalin dalam keadaan terkunci.
+            # Worker memuat kamus dan klien sendiri di _init_worker.
+            mp_context = multiprocessing.get_context(start_method)
+            if start_method == "forkserver":
+                # Modul berat diimpor sekali di proses forkserver, bukan di setiap worker
+                mp_context.set_forkserver_preload(['utils.pipeline'])
+            create_pool = lambda: ProcessPoolExecutor(max_workers=self.workers, mp_context=mp_context, initializer=_init_worker,
+                                                      initargs=(resources.registrations(),))
+        elif mode == "thread":
+            create_pool = lambda: ThreadPoolExecutor(max_workers=self.workers)
+        else:
+            raise ValueError(f"Unknown execution mode: {mode}")
+        self._chunks = FairScheduler(create_pool, self.workers)
+        # Thread job hampir selalu menunggu chunk; yang berat dikerjakan pool bersama
+        self._jobs_scheduler = FairScheduler(lambda: ThreadPoolExecutor(max_workers=max_running, thread_name_prefix="validation-job"), max_running)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, user, data, name, default_font, decimal_places, start_slide=1, end_slide=None):
+        """
+        Queue a deck for validation.
+
+        Parameters:
+        - user: key used for fairness and the per-user limit.
+        - data: the .pptx file as bytes.
+        - name: file name, for display.
+        - default_font, decimal_places, start_slide, end_slide: validation options.
+
+        Returns:
+        - the job id.
+
+        Raises:
+        - JobRejected when the queue or the user's share of it is full.
+        """
+        with self._lock:
+            self._purge()
+            active = [job for job in self._jobs.values() if job.finished is None]
+            if len(active) >= self.max_queued:
+                raise JobRejected(f"The validation queue is full ({len(active)} decks). Please try again in a few minutes.")
+            if len(data) > self.max_queued_bytes:
+                raise JobRejected(f"This deck ({len(data) / 1024 / 1024:.0f} MB) is larger than the validation service accepts "
+                                  f"({self.max_queued_bytes / 1024 / 1024:.0f} MB).")
+            # Deck antrean disimpan di memori sampai selesai divalidasi, jadi ukurannya juga dibatasi
+            queued_bytes = sum(job.size for job in active)
+            if queued_bytes + len(data) > self.max_queued_bytes:
+                raise JobRejected(f"The validation queue is full ({queued_bytes / 1024 / 1024:.0f} MB of decks waiting). Please try again in a few minutes.")
+            if sum(1 for job in active if job.user == user) >= self.max_per_user:
+                raise JobRejected(f"You already have {self.max_per_user} decks queued or running. Please wait for one to finish.")
+            job = Job(user, name, data, {
+                'default_font': default_font,
+                'decimal_places': decimal_places,
+                'start_slide': start_slide,
+                'end_slide': end_slide,
+            })
+            self._jobs[job.id] = job
+        self._jobs_scheduler.submit(user, self._run, job)
+        logging.info(f"Job {job.id} queued for {user}: {name}")
+        return job.id
+
+    def _run(self, job):
+        job.status = 'running'
+        job.started = time.time()
+        options = job.options
+        try:
+            # Klien grammar induk; di mode proses worker memakai kliennya sendiri
+            grammar_tool = resources.get('grammar_tool')
+            # Selalu python-pptx: deck yang di-highlight butuh Presentation, apa pun EXTRACTION_BACKEND
+            presentation, _, issues = validate_deck(
+                io.BytesIO(job.data), options['default_font'], grammar_tool, options['decimal_places'],
+                options['start_slide'], options['end_slide'], backend="python-pptx", mode=self.mode,
+                executor=self._chunks.for_user(job.user), report=job.report,
+                progress_callback=job.set_progress, slide_callback=job.add_slide,
+            )
+            # Hasil ditulis ke disk; yang disimpan di memori selama masa retensi hanya daftar issue
+            csv_output = io.StringIO()
+            save_to_csv(issues, csv_output)
+            job.csv_path = self._write_output(f"{job.id}.csv", csv_output.getvalue().encode('utf-8'))
+            job.ppt_path = self._write_output(f"{job.id}.pptx", highlight_to_buffer(io.BytesIO(job.data), presentation, issues).getbuffer())
+            job.issues = issues
+            job.status = 'done'
+        except Exception as e:
+            logging.exception(f"Job {job.id} failed")
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = 'failed'
+        finally:
+            # Deck asli tidak dibutuhkan lagi setelah selesai
+            job.data = None
+            job.finished = time.time()
+
+    def _write_output(self, name, data):
+        path = os.path.join(self.result_dir, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def get(self, job_id):
+        """
+        Return the Job, or None when the id is unknown or has expired.
+        """
+        with self._lock:
+            self._purge()
+            return self._jobs.get(job_id)
+
+    def status(self, job_id):
+        """
+        Status snapshot of a job (see Job.snapshot), with 'queued_ahead' for queued jobs.
+        """
+        with self._lock:
+            self._purge()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = job.snapshot()
+            if job.status == 'queued':
+                snapshot['queued_ahead'] = sum(1 for other in self._jobs.values()
+                                               if other.status == 'queued' and other.submitted < job.submitted)
+            return snapshot
+
+    def jobs(self, user=None):
+        """
+        Snapshots of the retained jobs, oldest first, optionally of one user only.
+        """
+        with self._lock:
+            self._purge()
+            return [job.snapshot() for job in sorted(self._jobs.values(), key=lambda job: job.submitted)
+                    if user is None or job.user == user]
+
+    def load(self):
+        """
+        Current load: jobs per status and slide chunks waiting for the shared pool.
+        """
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            'queued': statuses.count('queued'),
+            'running': statuses.count('running'),
+            'workers': self.workers,
+            'queued_chunks': self._chunks.queued(),
+        }
+
+    def _purge(self):
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished is not None and time.time() - job.finished > self.retention]
+        for job_id in expired:
+            self._jobs.pop(job_id).remove_outputs()
+
+def create_job_service():
+    return JobService()
@@ -37,41 +37,117 @@
 
 import re  
 import logging  # Pastikan ini ada  
+from collections import namedtuple  
+from utils.extraction import iter_runs, run_location  
+from utils.numeric_lexer import lex_numbers  
   
-def validate_million_notations(slide, slide_index):  
-    issues = []  
-    million_patterns = {  
-        r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*[Mm]\b': 'M',  # M atau m  
-        r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*Million\b': 'Million',   
-        r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*mn\b': 'mn',   
-        r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*m\b': 'm',  
-        r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*MM\b': 'MM',   
-        r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*Millions\b': 'Millions',   
-        r'\b[€$£]?\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*Juta\b': 'Juta'  
-    }  
+# Satuan juta dari lexer angka dan kelas notasinya; "M" dan "m" dibedakan dari hurufnya  
+MILLION_NOTATIONS = {'millions': 'Millions', 'million': 'Million', 'juta': 'Juta', 'mm': 'MM', 'mn': 'mn', 'm': None}  
+  
+# Teks literal di format angka chart, mis. 0.0"m" atau #,##0" Million"  
+FORMAT_SUFFIX = re.compile(r'"\s*([A-Za-z]+)\s*"')  
+  
+MillionNotation = namedtuple('MillionNotation', ['text', 'value', 'currency', 'suffix', 'notation', 'span'])  
+  
+def scan_million_notations(text):  
+    """  
+    Pick the million notations out of the shared numeric token stream.  
+  
+    Returns:  
+    - list of MillionNotation (value plus suffix as written, value, currency symbol or None, suffix, notation class, span of the text).  
+      The currency symbol is reported separately and left out of `text`, as in the previous per-pattern matches.  
+    """  
+    notations = []  
+    for token in lex_numbers(text):  
+        if token.suffix is None or token.suffix.lower() not in MILLION_NOTATIONS:  
+            continue  
+        notation = MILLION_NOTATIONS[token.suffix.lower()] or token.suffix  
+        notations.append(MillionNotation(token.text, token.number, token.currency, token.suffix, notation, token.span))  
+    return notations  
+  
+def validate_million_notations(slide_record, slide_index):  
     notation_set = set()  
-    all_matches = []  
+    # Teks match -> semua posisinya, urutan kemunculan dipertahankan  
+    all_matches = {}  
     logging.debug(f"Slide {slide_index}: Checking shapes for million notations")    
-    for shape in slide.shapes:  
-        if not shape.has_text_frame:  
-            continue  
-        for paragraph in shape.text_frame.paragraphs:  
-            for run in paragraph.runs:  
-                for pattern, notation in million_patterns.items():  
-                    matches = re.findall(pattern, run.text, re.IGNORECASE)  
-                    all_matches.extend(matches)  
-                    for match in matches:  
-                        notation_set.add(notation)  
+    for run in iter_runs(slide_record):  
+        for notation in scan_million_notations(run.text):  
+            all_matches.setdefault(notation.text, []).append(run_location(run, *notation.span))  
+            notation_set.add(notation.notation)  
+    return _notation_issues(all_matches, notation_set, slide_index)  
+  
+def validate_chart_million_notations(texts, number_formats, slide_index):  
+    """  
+    Million notation consistency over the text of the slide's charts.  
   
+    Parameters:  
+    - texts: dict mapping each distinct chart text (titles, labels, categories, series names) to the RunRecords holding it.  
+    - number_formats: dict mapping each distinct number format code to its RunRecords; a quoted  
+      suffix such as '0.0"m"' counts as the notation the labels are displayed with.  
+    """  
+    notation_set = set()  
+    all_matches = {}  
+    for text, runs in texts.items():  
+        for notation in scan_million_notations(text):  
+            all_matches.setdefault(notation.text, []).extend(run_location(run, *notation.span) for run in runs)  
+            notation_set.add(notation.notation)  
+    for format_code, runs in number_formats.items():  
+        for literal in FORMAT_SUFFIX.findall(format_code):  
+            if literal.lower() in MILLION_NOTATIONS:  
+                all_matches.setdefault(format_code, []).extend(run_location(run) for run in runs)  
+                notation_set.add(MILLION_NOTATIONS[literal.lower()] or literal)  
+    return _notation_issues(all_matches, notation_set, slide_index)  
+  
+def validate_column_million_notations(column, slide_index, column_number):  
+    """  
+    Million notation consistency inside one table column (e.g. "5.2m" next to "3 mn").  
+  
+    The notation most values of the column use is taken as the column's own; values  
+    written with another notation are reported, once per distinct value with every  
+    cell holding it in 'locations'.  
+  
+    Parameters:  
+    - column: TABLE_CELL RunRecords of the column, in row order.  
+    - column_number: 1-based column number used in the details.  
+    """  
+    cells = {}  
+    for run in column:  
+        cells.setdefault(run.text, []).append(run)  
+    counts = {}  
+    for text, runs in cells.items():  
+        for notation in scan_million_notations(text):  
+            counts[notation.notation] = counts.get(notation.notation, 0) + len(runs)  
+    if len(counts) < 2:  
+        return []  
+    # Seri: notasi yang muncul lebih dulu di kolom dianggap notasi kolom  
+    expected = max(counts, key=counts.get)  
+    outliers = {}  
+    for text, runs in cells.items():  
+        for notation in scan_million_notations(text):  
+            if notation.notation != expected:  
+                outliers.setdefault(notation.text, []).extend(run_location(run, *notation.span) for run in runs)  
+    issues = []  
+    for match, locations in outliers.items():  
+        issues.append({  
+            'slide': slide_index,  
+            'issue': 'Inconsistent Million Notations',  
+            'text': match,  
+            'details': f'Column {column_number} of the table uses {expected} ({counts[expected]} of {sum(counts.values())} values), found "{match}".',  
+            'locations': locations  
+        })  
+    return issues  
+  
+def _notation_issues(all_matches, notation_set, slide_index):  
+    issues = []  
     # Cek konsistensi notasi  
     if len(notation_set) > 1:  
-        # Hanya catat masalah unik  
-        unique_matches = set(all_matches)  # Menggunakan set untuk menghindari duplikasi  
-        for match in unique_matches:  
+        # Hanya catat masalah unik; setiap kemunculan tetap di-highlight lewat locations  
+        for match, locations in all_matches.items():  
             issues.append({  
                 'slide': slide_index,  
                 'issue': 'Inconsistent Million Notations',  
                 'text': match,  
-                'details': f'Found inconsistent million notations: [using {", ".join(notation_set)}]'  
+                'details': f'Found inconsistent million notations: [using {", ".join(sorted(notation_set))}]',  
+                'locations': locations  
             })  
     return issues  
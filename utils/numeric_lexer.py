@@ -0,0 +1,74 @@
+# utils/numeric_lexer.py
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Angka (dengan pemisah ribuan/desimal), opsional diawali simbol mata uang dan diikuti satuan.
+# Lookbehind/lookahead mencegah regex memotong angka di tengah (mis. "12" dari "12.5x", "2.3" dari "v1.2.3").
+NUMBER_PATTERN = re.compile(
+    r'(?:(?P<currency>[€$£])\s*)?'
+    r'(?<!\d[.,])\b(?P<number>\d+(?:[.,]\d+)*)(?![.,]?\d)'
+    r'(?:\s*(?P<suffix>Millions|Million|Juta|MM|mn|bn|k|m)\b|(?!\w))',
+    re.IGNORECASE
+)
+
+# Satu angka di dalam teks.
+# - text: angka dan satuan seperti tertulis (tanpa simbol mata uang), span menunjuk ke teks ini
+# - number: angka saja; integer: bagian bulat termasuk pemisah ribuan
+# - separator/decimals: pemisah desimal dan digit di belakangnya (None/'' kalau bilangan bulat)
+# - grouping: pemisah ribuan atau None
+# - currency, suffix: simbol mata uang dan satuan seperti tertulis, atau None
+NumericToken = namedtuple('NumericToken', ['text', 'number', 'integer', 'separator', 'decimals', 'grouping', 'currency', 'suffix', 'span'])
+
+def _split_number(number):
+    """
+    Split a number into (integer, decimal separator, decimals, grouping separator).
+
+    "1,250.75" and "1.250,75" use the last separator as the decimal one. A single
+    comma followed by exactly three digits ("1,250") is read as thousands grouping.
+    Layouts that are neither (versions, dates such as "12.05.2023") return None.
+    """
+    separators = [char for char in number if char in '.,']
+    if not separators:
+        return number, None, '', None
+    groups = re.split(r'[.,]', number)
+    if len(set(separators)) == 1:
+        separator = separators[0]
+        if len(separators) == 1:
+            if separator == ',' and len(groups[1]) == 3 and len(groups[0]) <= 3:
+                return number, None, '', ','
+            return groups[0], separator, groups[1], None
+        if len(groups[0]) <= 3 and all(len(group) == 3 for group in groups[1:]):
+            return number, None, '', separator
+        return None
+    decimal_separator = separators[-1]
+    grouping = separators[0]
+    if separators[:-1].count(grouping) != len(separators) - 1 or grouping == decimal_separator:
+        return None
+    if len(groups[0]) > 3 or any(len(group) != 3 for group in groups[1:-1]):
+        return None
+    return number[:number.rindex(decimal_separator)], decimal_separator, groups[-1], grouping
+
+@lru_cache(maxsize=16384)
+def lex_numbers(text):
+    """
+    Tokenize every number in a text once.
+
+    Results are cached per text, so the decimal and million checks (and any other
+    numeric rule) share one scan of the same run.
+
+    Returns:
+    - tuple of NumericToken in text order.
+    """
+    tokens = []
+    for match in NUMBER_PATTERN.finditer(text):
+        number = match.group('number')
+        parts = _split_number(number)
+        if parts is None:
+            continue
+        integer, separator, decimals, grouping = parts
+        start, end = match.start('number'), match.end('suffix') if match.group('suffix') else match.end('number')
+        tokens.append(NumericToken(text[start:end], number, integer, separator, decimals, grouping,
+                                   match.group('currency'), match.group('suffix'), (start, end)))
+    return tuple(tokens)
@@ -0,0 +1,93 @@
+# utils/package_writer.py
+
+import io
+import logging
+import struct
+import zipfile
+
+# Ukuran potongan saat menyalin data terkompresi apa adanya
+COPY_CHUNK_SIZE = 1024 * 1024
+
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+
+def _copy_raw_member(source, target, info):
+    """
+    Append one member of `source` to `target` without decompressing it: the
+    compressed bytes are copied from the source file as they are.
+    """
+    source.fp.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(source.fp.read(_LOCAL_HEADER.size))
+    source.fp.seek(header[-2] + header[-1], io.SEEK_CUR)  # nama file + extra field lokal
+
+    new_info = zipfile.ZipInfo(info.filename, info.date_time)
+    new_info.compress_type = info.compress_type
+    new_info.external_attr = info.external_attr
+    new_info.create_system = info.create_system
+    new_info.CRC = info.CRC
+    new_info.compress_size = info.compress_size
+    new_info.file_size = info.file_size
+    # Ukuran dan CRC langsung ditulis di header lokal, jadi tanpa data descriptor (bit 3)
+    new_info.flag_bits = info.flag_bits & ~0x08
+    new_info.header_offset = target.fp.tell()
+    target.fp.write(new_info.FileHeader())
+
+    remaining = info.compress_size
+    while remaining:
+        chunk = source.fp.read(min(COPY_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member {info.filename}")
+        target.fp.write(chunk)
+        remaining -= len(chunk)
+
+    # Daftarkan member supaya central directory ditulis saat target ditutup
+    target.filelist.append(new_info)
+    target.NameToInfo[new_info.filename] = new_info
+    target.start_dir = target.fp.tell()
+    target._didModify = True
+
+def write_package(source, replacements, output=None):
+    """
+    Write a copy of a zip package (a .pptx) with some members replaced.
+
+    Members in `replacements` are written compressed from the new bytes; every
+    other member is copied byte-for-byte without being decompressed or
+    recompressed, so embedded media costs a raw copy only.
+
+    Parameters:
+    - source: path or binary file object of the original package.
+    - replacements: dict mapping member names ("ppt/slides/slide3.xml") to bytes.
+    - output: binary file object to write to; a new BytesIO when None.
+
+    Returns:
+    - the output file object, positioned at the start.
+    """
+    output = output if output is not None else io.BytesIO()
+    with zipfile.ZipFile(source) as package, zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as target:
+        missing = set(replacements) - set(package.namelist())
+        if missing:
+            logging.warning(f"Package members not found, not written: {sorted(missing)}")
+        for info in package.infolist():
+            if info.filename in replacements:
+                replaced = zipfile.ZipInfo(info.filename, info.date_time)
+                replaced.compress_type = zipfile.ZIP_DEFLATED
+                replaced.external_attr = info.external_attr
+                target.writestr(replaced, replacements[info.filename])
+            else:
+                _copy_raw_member(package, target, info)
+    output.seek(0)
+    return output
+
+def changed_slide_parts(presentation, slide_numbers, partnames):
+    """
+    Serialized XML of the given slides, keyed by their zip member name in the source package.
+
+    python-pptx renames slide parts to match presentation order as soon as
+    `presentation.slides` is used, so the part's own partname is not the member
+    it was read from when the slides were reordered in PowerPoint. `partnames`
+    (utils.xml_extraction.slide_partnames of the source zip) gives the original
+    member of every slide, so the XML lands next to its own .rels.
+    """
+    replacements = {}
+    for slide_number in slide_numbers:
+        replacements[partnames[slide_number - 1]] = presentation.slides[slide_number - 1].part.blob
+    return replacements
@@ -0,0 +1,96 @@
+# utils/phrase_matcher.py
+
+from collections import deque
+
+def _fold(char):
+    # Huruf kecil per karakter; karakter yang berubah panjang saat di-lower dibiarkan supaya offset tetap sama
+    lowered = char.lower()
+    return lowered if len(lowered) == 1 else char
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of phrases.
+
+    The automaton is built once; `find` then scans a text in one pass whose cost
+    depends on the text length and the number of hits, not on how many phrases
+    there are. Matching is case-insensitive and only whole words count: a hit
+    must not start or end inside a word.
+
+    Parameters:
+    - phrases: iterable of strings such as "Principal Component Analysis" or "REST API".
+    """
+
+    def __init__(self, phrases):
+        self._goto = [{}]
+        self._fail = [0]
+        # Panjang frasa yang berakhir di tiap state (termasuk lewat tautan fail)
+        self._output = [()]
+        for phrase in phrases:
+            self._add(''.join(_fold(char) for char in phrase))
+        self._build()
+
+    def _add(self, phrase):
+        if not phrase:
+            return
+        state = 0
+        for char in phrase:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] += (len(phrase),)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def find(self, text):
+        """
+        Return the (start, end) spans of every whole-word phrase occurrence in text.
+        """
+        spans = []
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, char in enumerate(text):
+            char = _fold(char)
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            end = index + 1
+            if end < len(text) and _is_word_char(text[end]):
+                continue
+            for length in output[state]:
+                start = end - length
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                spans.append((start, end))
+        return spans
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+def merge_spans(spans):
+    """
+    Merge overlapping (start, end) spans into a sorted, disjoint list.
+    """
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
@@ -0,0 +1,325 @@
+# utils/pipeline.py
+
+import logging
+import os
+import time
+from contextlib import nullcontext
+from pptx import Presentation
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from utils.extraction import extract_slide
+from utils.xml_extraction import iter_slide_records
+from utils.grammar_guard import GrammarBudget
+from utils.result_store import ResultStore, dictionary_version, slide_fingerprint
+from utils.font_validation import validate_fonts_slide
+from utils.grammar_validation import validate_grammar_slide, grammar_cache
+from utils.spelling_validation import validate_spelling_slide, checked_words, filter_unknown, correct_words, correction_cache
+from utils.decimal_validation import validate_decimal_consistency
+from utils.million_notation_validation import validate_million_notations
+from utils.validation import validate_tables, validate_charts
+from utils.resources import resources
+from config import (EXECUTION_MODE, EXTRACTION_BACKEND, MAX_WORKERS, CHUNK_SIZE, SPELLING_MODE, CORRECTION_CHUNK_SIZE, GRAMMAR_DECK_BUDGET,
+                    RESULT_STORE_PATH, RESULT_STORE_MAX_BYTES)
+
+def validate_slide_record(slide_record, default_font, grammar_tool, decimal_places, vocabulary=None, budget=None, check_grammar=True):
+    slide_issues = []
+    slide_index = slide_record.slide_index
+    start_time = time.time()
+
+    # Validate Spelling
+    slide_issues.extend(validate_spelling_slide(slide_record, slide_index, vocabulary))
+    # Validate Fonts
+    slide_issues.extend(validate_fonts_slide(slide_record, slide_index, default_font))
+    # Validate Grammar (dimatikan dengan check_grammar=False: tanpa baris 'Grammar Not Checked')
+    if budget is None:
+        # Tanpa batas waktu, tetapi slide yang tidak dicek tetap ditandai
+        budget = GrammarBudget()
+    if check_grammar:
+        slide_issues.extend(validate_grammar_slide(slide_record, slide_index, grammar_tool, budget))
+    if slide_index in budget.incomplete:
+        # Tandai di laporan bahwa grammar slide ini tidak (seluruhnya) dicek
+        slide_issues.append({
+            'slide': slide_index,
+            'issue': 'Grammar Not Checked',
+            'text': '',
+            'details': f'Grammar coverage partial: {budget.incomplete[slide_index]}'
+        })
+    # Validate Decimal Consistency
+    slide_issues.extend(validate_decimal_consistency(slide_record, slide_index, decimal_places))
+    # Validate Million Notations
+    slide_issues.extend(validate_million_notations(slide_record, slide_index))
+    # Validate Tables
+    slide_issues.extend(validate_tables(slide_record, slide_index, vocabulary, decimal_places))
+    # Validate Charts
+    slide_issues.extend(validate_charts(slide_record, slide_index, vocabulary, decimal_places))
+
+    elapsed_time = time.time() - start_time
+    logging.debug(f"Slide {slide_index} validation completed in {elapsed_time:.2f} seconds.")
+
+    return slide_issues
+
+def validate_slide(slide, slide_index, default_font, spell, grammar_tool, decimal_places):
+    # Extract the slide text once; every validator works on the same record
+    slide_record = extract_slide(slide, slide_index + 1)
+    return validate_slide_record(slide_record, default_font, grammar_tool, decimal_places)
+
+# Hasil per slide dari versi deck sebelumnya, dicari lewat fingerprint
+result_store = ResultStore(RESULT_STORE_PATH, RESULT_STORE_MAX_BYTES) if RESULT_STORE_PATH else None
+
+def _init_worker(registrations=None):
+    # Worker hasil fork mewarisi kamus dari induk; worker forkserver/spawn memuatnya di sini.
+    # `registrations` menyalin factory induk (mis. pengganti grammar_tool) ke worker yang tidak di-fork.
+    for name, spec in (registrations or {}).items():
+        resources.register(name, *spec)
+    resources.get('spell_checker')
+    resources.get('phrase_matcher')
+    resources.get('grammar_tool')
+
+def _validate_chunk(slide_records, default_font, decimal_places, vocabulary=None, budget=None, grammar_tool=None, in_worker=False, check_grammar=True):
+    if budget is not None:
+        # Batas waktu deck dihitung sejak chunk pertama benar-benar jalan, bukan sejak masuk antrean
+        budget.start()
+    if in_worker and check_grammar:
+        # Diambil per chunk dari registry: klien yang gagal dibuat dicoba lagi setelah RESOURCE_RETRY_INTERVAL
+        grammar_tool = resources.get('grammar_tool')
+    # Hit/miss cache dihitung per chunk dan dijumlahkan di induk: cache worker tidak terlihat dari sana,
+    # dan penghitung bersama di file cache ikut menghitung job lain
+    with correction_cache.counting() as spelling_counts, \
+            grammar_cache.counting() if grammar_cache else nullcontext({}) as grammar_counts:
+        results = [
+            (slide_record.slide_index, validate_slide_record(slide_record, default_font, grammar_tool, decimal_places, vocabulary, budget, check_grammar))
+            for slide_record in slide_records
+        ]
+    if in_worker:
+        # Worker proses tidak punya hook saat keluar, jadi koreksi baru disimpan per chunk
+        correction_cache.save()
+    return results, {'spelling_cache': spelling_counts, 'grammar_cache': grammar_counts}
+
+def _correct_chunk(words, in_worker=False):
+    with correction_cache.counting() as spelling_counts:
+        vocabulary = correct_words(words)
+    if in_worker:
+        correction_cache.save()
+    return vocabulary, {'spelling_cache': spelling_counts}
+
+def _add_cache_counts(cache_reports, chunk_counts):
+    for cache_name, counts in chunk_counts.items():
+        cache_report = cache_reports.get(cache_name)
+        if cache_report is None or not counts:
+            continue
+        for name, value in counts.items():
+            cache_report[name] += value
+        lookups = cache_report['hits'] + cache_report['misses']
+        cache_report['hit_rate'] = cache_report['hits'] / lookups if lookups else 0.0
+
+def iter_slide_results(slide_records, default_font, grammar_tool, decimal_places, mode=None, max_workers=None, chunksize=None, spelling_mode=None, report=None, executor=None, check_grammar=True):
+    """
+    Validate slide records in a thread or process pool.
+
+    Parameters:
+    - slide_records: SlideRecord objects from utils.extraction.
+    - default_font, decimal_places: validation parameters.
+    - grammar_tool: grammar client used in thread mode; process workers build their own.
+    - mode: "thread" or "process" (default config.EXECUTION_MODE).
+    - max_workers: pool size (default config.MAX_WORKERS, None lets the executor decide).
+    - chunksize: slides sent to a worker per task (default config.CHUNK_SIZE).
+    - spelling_mode: "deck" resolves each distinct unknown word of the deck once
+      (corrections run in the pool, in chunks of config.CORRECTION_CHUNK_SIZE words,
+      and a slide chunk starts as soon as its words are resolved), "run" checks
+      word by word (default config.SPELLING_MODE).
+    - report: optional dict; 'reused_slides' is set to the number of slides whose
+      issues came from the result store, 'spelling_cache' and 'grammar_cache' (when
+      the grammar cache is enabled) to this run's cache hits and misses, summed over
+      the chunks whichever process ran them.
+    - executor: shared executor to submit the chunks to instead of creating a pool
+      (see utils.job_service); `mode` must match its kind, and for "process" its
+      workers must be started with `_init_worker`. It is not shut down here.
+    - check_grammar: False skips the grammar check on purpose (e.g. batch --no-grammar):
+      unlike a missing or failing client, no 'Grammar Not Checked' rows are added,
+      so the results are stored (under their own fingerprints).
+
+    Yields:
+    - (slide_index, issues) tuples in completion order. Slides unchanged since an
+      earlier run come first, straight from the result store.
+    """
+    mode = mode or EXECUTION_MODE
+    max_workers = max_workers or MAX_WORKERS
+    chunksize = max(1, chunksize or CHUNK_SIZE)
+    slide_records = list(slide_records)
+
+    # Disimpan per slide: slide yang grammarnya tidak (seluruhnya) dicek membawa baris 'Grammar Not Checked'
+    # dan tidak disimpan. Di mode proses grammar memakai klien worker, bukan `grammar_tool` di sini.
+    store = result_store
+    fingerprints = {}
+    reused = []
+    if store is not None:
+        dictionary = dictionary_version()
+        fingerprints = {
+            slide_record.slide_index: slide_fingerprint(slide_record, default_font, decimal_places, dictionary, check_grammar)
+            for slide_record in slide_records
+        }
+        stored = store.get_many(fingerprints.values())
+        pending = []
+        for slide_record in slide_records:
+            stored_issues = stored.get(fingerprints[slide_record.slide_index])
+            if stored_issues is None:
+                pending.append(slide_record)
+            else:
+                reused.append((slide_record.slide_index, [dict(slide=slide_record.slide_index, **issue) for issue in stored_issues]))
+        slide_records = pending
+    cache_reports = {'spelling_cache': {'hits': 0, 'misses': 0, 'hit_rate': 0.0}}
+    if grammar_cache:
+        cache_reports['grammar_cache'] = {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'bytes_saved': 0}
+    if report is not None:
+        report['reused_slides'] = len(reused)
+        report.update(cache_reports)
+    for slide_index, slide_issues in reused:
+        yield slide_index, slide_issues
+    if not slide_records:
+        return
+
+    chunks = [slide_records[i:i + chunksize] for i in range(0, len(slide_records), chunksize)]
+
+    # Mode "deck": kata yang tidak ada di kamus dikumpulkan per chunk sesuai urutan kemunculan pertama.
+    # Koreksinya (bagian paling mahal) dikerjakan di pool juga, per potongan CORRECTION_CHUNK_SIZE kata.
+    # Tiap chunk hanya menerima koreksi kata-katanya sendiri, bukan vocabulary seluruh deck.
+    words = []
+    words_needed = [0] * len(chunks)
+    chunk_words = [None] * len(chunks)
+    deck_vocabulary = (spelling_mode or SPELLING_MODE) == "deck"
+    if deck_vocabulary:
+        seen = set()
+        for chunk_index, chunk in enumerate(chunks):
+            chunk_words[chunk_index] = checked_words(chunk)
+            words.extend(filter_unknown(chunk_words[chunk_index], seen))
+            words_needed[chunk_index] = len(words)
+    # Batas waktu grammar untuk seluruh deck (mulai saat chunk pertama jalan); validator lain tetap jalan setelah habis
+    budget = GrammarBudget(GRAMMAR_DECK_BUDGET)
+
+    shared_executor = executor is not None
+    if mode == "process":
+        # Hanya record teks (picklable) yang dikirim ke worker, bukan objek Slide
+        if not shared_executor:
+            # Muat kamus sebelum fork supaya worker berbagi halamannya, bukan memuat ulang
+            resources.get('spell_checker')
+            resources.get('phrase_matcher')
+            executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+        submit_args = (budget, None, True, check_grammar)
+        in_worker = True
+    elif mode == "thread":
+        if not shared_executor:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        submit_args = (budget, grammar_tool, False, check_grammar)
+        in_worker = False
+    else:
+        raise ValueError(f"Unknown execution mode: {mode}")
+
+    # Pool bersama dipakai juga oleh job lain, jadi tidak ditutup di sini
+    with nullcontext() if shared_executor else executor:
+        correction_size = max(1, CORRECTION_CHUNK_SIZE)
+        # Potongan koreksi dikirim bertahap (paling banyak satu per worker), supaya chunk slide
+        # yang sudah siap tidak mengantre di belakang koreksi seluruh deck
+        correction_window = max_workers or os.cpu_count() or 1
+        corrections = {}
+        next_word = 0
+        corrected = set()
+        resolved = 0
+        vocabulary = {} if deck_vocabulary else None
+        slide_futures = set()
+        next_chunk = 0
+        while corrections or slide_futures or next_chunk < len(chunks):
+            # Chunk slide dikirim begitu semua kata barunya (dan kata chunk sebelumnya) sudah dikoreksi,
+            # jadi hasil slide pertama tidak menunggu kosakata seluruh deck
+            while next_chunk < len(chunks) and words_needed[next_chunk] <= resolved:
+                chunk_vocabulary = None
+                if deck_vocabulary:
+                    chunk_vocabulary = {word: vocabulary[word] for word in chunk_words[next_chunk] if word in vocabulary}
+                    chunk_words[next_chunk] = None
+                slide_futures.add(executor.submit(_validate_chunk, chunks[next_chunk], default_font, decimal_places, chunk_vocabulary, *submit_args))
+                next_chunk += 1
+            while next_word < len(words) and len(corrections) < correction_window:
+                corrections[executor.submit(_correct_chunk, words[next_word:next_word + correction_size], in_worker)] = next_word
+                next_word += correction_size
+            done, _ = wait(set(corrections) | slide_futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in corrections:
+                    chunk_vocabulary, counts = future.result()
+                    _add_cache_counts(cache_reports, counts)
+                    vocabulary.update(chunk_vocabulary)
+                    corrected.add(corrections.pop(future))
+                    while resolved in corrected:
+                        resolved = min(resolved + correction_size, len(words))
+                    continue
+                slide_futures.discard(future)
+                chunk_results, counts = future.result()
+                _add_cache_counts(cache_reports, counts)
+                for slide_index, slide_issues in chunk_results:
+                    if store is not None and not any(issue['issue'] == 'Grammar Not Checked' for issue in slide_issues):
+                        store.put(fingerprints[slide_index], [
+                            {key: value for key, value in issue.items() if key != 'slide'} for issue in slide_issues
+                        ])
+                    yield slide_index, slide_issues
+
+def validate_slides(slide_records, default_font, grammar_tool, decimal_places, mode=None, max_workers=None, chunksize=None, spelling_mode=None, progress_callback=None, report=None, slide_callback=None, executor=None, check_grammar=True):
+    """
+    Validate slide records and merge the results into one issue list ordered by slide.
+
+    Parameters are the same as iter_slide_results. Slides are consumed in completion
+    order: `slide_callback(slide_index, issues)` receives each slide's issues as soon
+    as the slide is done, then `progress_callback(done, total)` is called. If `report`
+    is a dict it is filled with run statistics (cache hit rates and similar).
+    """
+    slide_records = list(slide_records)
+    # Statistik run dikumpulkan juga kalau pemanggil tidak meminta report, untuk log
+    run_report = report if report is not None else {}
+    results = {}
+    for slide_index, slide_issues in iter_slide_results(slide_records, default_font, grammar_tool, decimal_places, mode, max_workers, chunksize, spelling_mode, run_report, executor, check_grammar):
+        results[slide_index] = slide_issues
+        if slide_callback:
+            slide_callback(slide_index, slide_issues)
+        if progress_callback:
+            progress_callback(len(results), len(slide_records))
+
+    correction_cache.save()
+    logging.info(f"Spelling correction cache: {run_report['spelling_cache']}")
+    unchecked = sorted(slide_index for slide_index, slide_issues in results.items()
+                       if any(issue['issue'] == 'Grammar Not Checked' for issue in slide_issues))
+    if unchecked:
+        logging.warning(f"Grammar coverage partial: {len(unchecked)} of {len(results)} slides not fully checked")
+    if report is not None:
+        report['grammar_coverage'] = {'slides': len(results), 'unchecked': unchecked, 'partial': bool(unchecked), 'disabled': not check_grammar}
+    if 'grammar_cache' in run_report:
+        logging.info(f"Grammar cache: {run_report['grammar_cache']}")
+
+    issues = []
+    for slide_index in sorted(results):
+        issues.extend(results[slide_index])
+    return issues
+
+def validate_deck(source, default_font, grammar_tool, decimal_places, start_slide=1, end_slide=None, backend=None, **options):
+    """
+    Open a .pptx, extract the slide range and validate it.
+
+    Parameters:
+    - source: path or binary file object of the deck.
+    - default_font, grammar_tool, decimal_places: as for validate_slides.
+    - start_slide, end_slide: 1-based inclusive range (default: every slide).
+    - backend: "python-pptx" loads the Presentation (needed to highlight it),
+      "streaming" reads the slide XML straight from the zip and returns no
+      Presentation (default config.EXTRACTION_BACKEND).
+    - options: passed on to validate_slides (mode, max_workers, report, callbacks, check_grammar).
+
+    Returns:
+    - (presentation or None, slide_records, issues)
+    """
+    backend = backend or EXTRACTION_BACKEND
+    if backend == "streaming":
+        presentation = None
+        slide_records = list(iter_slide_records(source, start_slide, end_slide))
+    elif backend == "python-pptx":
+        presentation = Presentation(source)
+        end_slide = min(end_slide or len(presentation.slides), len(presentation.slides))
+        slide_records = [extract_slide(presentation.slides[slide_index], slide_index + 1) for slide_index in range(start_slide - 1, end_slide)]
+    else:
+        raise ValueError(f"Unknown extraction backend: {backend}")
+    issues = validate_slides(slide_records, default_font, grammar_tool, decimal_places, **options)
+    return presentation, slide_records, issues
@@ -0,0 +1,114 @@
+# utils/resources.py
+
+import importlib
+import logging
+import os
+import threading
+import time
+from config import RESOURCE_RETRY_INTERVAL
+
+class ResourceRegistry:
+    """
+    Heavy validation resources created lazily on first use and shared by every
+    thread (and every Streamlit session) of the process.
+
+    A resource is registered as a module and a factory function in it; `get`
+    imports the module and calls the factory once, timing both steps.
+    Resources registered with `per_process=True` (network clients) are created
+    again in a forked worker instead of reusing the parent's copy.
+    A factory that returns None (e.g. LanguageTool could not be reached) is not
+    cached: `get` returns None for `retry_interval` seconds and then calls the
+    factory again.
+    """
+
+    def __init__(self, retry_interval=RESOURCE_RETRY_INTERVAL):
+        self.retry_interval = retry_interval
+        self._specs = {}
+        self._values = {}
+        self._failures = {}
+        self._timings = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, module_name, factory_name, per_process=False):
+        with self._lock:
+            self._specs[name] = (module_name, factory_name, per_process)
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name):
+        """
+        Return the resource, creating it on the first call. Concurrent first
+        calls wait for the same initialization instead of running it twice.
+        """
+        value = self._ready_value(name)
+        if value is not _MISSING:
+            return value
+        with self._locks[name]:
+            value = self._ready_value(name)
+            if value is not _MISSING:
+                return value
+            failure = self._failures.get(name)
+            if failure is not None and failure[0] == os.getpid() and time.monotonic() - failure[1] < self.retry_interval:
+                # Gagal baru-baru ini; belum dicoba lagi supaya setiap slide tidak menunggu inisialisasi
+                return None
+            module_name, factory_name, _ = self._specs[name]
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            imported = time.perf_counter()
+            value = getattr(module, factory_name)()
+            initialized = time.perf_counter()
+            self._timings[name] = {
+                'import_ms': (imported - start) * 1000,
+                'init_ms': (initialized - imported) * 1000,
+                'pid': os.getpid(),
+                'available': value is not None,
+            }
+            if value is None:
+                # Hasil gagal tidak disimpan; dicoba lagi setelah retry_interval
+                self._failures[name] = (os.getpid(), time.monotonic())
+                logging.warning(f"Resource {name} is unavailable; retrying in {self.retry_interval:.0f} s")
+                return None
+            self._failures.pop(name, None)
+            self._values[name] = (os.getpid(), value)
+            logging.info(f"Resource {name}: import {self._timings[name]['import_ms']:.0f} ms, init {self._timings[name]['init_ms']:.0f} ms")
+            return value
+
+    def _ready_value(self, name):
+        if name not in self._specs:
+            raise KeyError(f"Unknown resource: {name}")
+        entry = self._values.get(name)
+        if entry is None:
+            return _MISSING
+        pid, value = entry
+        if self._specs[name][2] and pid != os.getpid():
+            return _MISSING
+        return value
+
+    def registrations(self):
+        """
+        {name: (module_name, factory_name, per_process)} of every registered resource,
+        to register the same factories in a worker that was not forked from this process.
+        """
+        with self._lock:
+            return dict(self._specs)
+
+    def reset(self, name):
+        # Resource dibuat ulang pada get() berikutnya (mis. setelah server LanguageTool diganti)
+        with self._locks[name]:
+            self._values.pop(name, None)
+            self._failures.pop(name, None)
+
+    def timings(self):
+        """
+        Import and init time per created resource, in milliseconds.
+        """
+        return {name: dict(timing) for name, timing in self._timings.items()}
+
+_MISSING = object()
+
+resources = ResourceRegistry()
+resources.register('spell_checker', 'utils.dictionary_artifact', 'load_spell_checker')
+resources.register('symspell_index', 'utils.spelling_validation', 'build_symspell_index')
+resources.register('phrase_matcher', 'utils.exemptions', 'build_phrase_matcher')
+resources.register('grammar_tool', 'utils.grammar_validation', 'initialize_language_tool', per_process=True)
+resources.register('job_service', 'utils.job_service', 'create_job_service')
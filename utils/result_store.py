@@ -0,0 +1,109 @@
+# utils/result_store.py
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import spellchecker
+from config import TECHNICAL_TERMS, RESULT_STORE_VERSION
+from utils.exemptions import EXEMPTION_PATTERN
+
+def dictionary_version():
+    """
+    Short hash of everything that decides which words are known or exempt.
+    """
+    digest = hashlib.sha256()
+    digest.update(spellchecker.__version__.encode('utf-8'))
+    for term in sorted(TECHNICAL_TERMS):
+        digest.update(term.encode('utf-8') + b'\0')
+    digest.update(EXEMPTION_PATTERN.pattern.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def slide_fingerprint(slide_record, default_font, decimal_places, dictionary, check_grammar=True):
+    """
+    Fingerprint of a slide's extracted content plus the validation parameters.
+    The slide number is left out so a slide that only moved is still reused.
+    Results validated without grammar get their own fingerprint.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([RESULT_STORE_VERSION, default_font, decimal_places, dictionary, check_grammar]).encode('utf-8'))
+    for run in slide_record.runs:
+        digest.update(json.dumps(list(run)).encode('utf-8'))
+    return digest.hexdigest()
+
+class ResultStore:
+    """
+    Per-slide issue lists stored by fingerprint in a local SQLite file.
+
+    Parameters:
+    - path: SQLite file; the directory is created when needed.
+    - max_bytes: size budget; least recently used slides are evicted.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+
+    def _connect(self):
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS slide_results ("
+                "fingerprint TEXT PRIMARY KEY, issues TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS slide_results_last_used ON slide_results (last_used)")
+            connection.commit()
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def get_many(self, fingerprints):
+        """
+        Return {fingerprint: issues} for the fingerprints that are stored.
+        """
+        found = {}
+        with self._lock:
+            connection = self._connect()
+            now = time.time()
+            for fingerprint in set(fingerprints):
+                row = connection.execute("SELECT issues FROM slide_results WHERE fingerprint = ?", (fingerprint,)).fetchone()
+                if row is not None:
+                    found[fingerprint] = json.loads(row[0])
+                    connection.execute("UPDATE slide_results SET last_used = ? WHERE fingerprint = ?", (now, fingerprint))
+            connection.commit()
+        return found
+
+    def put(self, fingerprint, issues):
+        serialized = json.dumps(issues, default=str)
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO slide_results (fingerprint, issues, size, last_used) VALUES (?, ?, ?, ?)",
+                (fingerprint, serialized, len(serialized), time.time()),
+            )
+            connection.commit()
+            self._evict(connection)
+
+    def _evict(self, connection):
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM slide_results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        evicted = []
+        for fingerprint, size in connection.execute("SELECT fingerprint, size FROM slide_results ORDER BY last_used").fetchall():
+            if total <= target:
+                break
+            evicted.append((fingerprint,))
+            total -= size
+        connection.executemany("DELETE FROM slide_results WHERE fingerprint = ?", evicted)
+        connection.commit()
+        logging.debug(f"Result store evicted {len(evicted)} slides")
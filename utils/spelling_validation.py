@@ -2,49 +2,211 @@
 
 import re
 import string
-from spellchecker import SpellChecker
-from config import TECHNICAL_TERMS  
+import bisect
+import logging
+from config import SPELLING_CACHE_SIZE, SPELLING_CACHE_PATH, SPELLING_BACKEND  
+from utils.extraction import TEXT_FRAME, run_location
+from utils.correction_cache import CorrectionCache
+from utils.symspell import SymSpellIndex
+from utils.exemptions import is_exempt, exempt_phrase_spans
+from utils.resources import resources
 
-spell = SpellChecker()
-spell.word_frequency.load_words(TECHNICAL_TERMS)
+def get_spell_checker():
+    # Kamus gabungan dimuat sekali per proses dari artefak biner; worker fork berbagi halaman memorinya
+    return resources.get('spell_checker')
 
-def is_exempted(word, TECHNICAL_TERMS):
-    return word in TECHNICAL_TERMS or re.match(r"^\d+\+?$", word)
+def build_symspell_index():
+    spell = get_spell_checker()
+    return SymSpellIndex(spell.word_frequency.dictionary, spell.distance)
 
-def validate_spelling_slide(slide, slide_index):
-    issues = []
-    for shape in slide.shapes:
-        if shape.has_text_frame:
-            for paragraph in shape.text_frame.paragraphs:
-                for run in paragraph.runs:
-                    words = re.findall(r"\b[\w+]+\b", run.text)
-                    for word in words:
-                        clean_word = word.strip(string.punctuation)
-                        if is_exempted(clean_word, TECHNICAL_TERMS):
-                            continue
-                        if clean_word.lower() not in spell:
-                            correction = spell.correction(clean_word)
-                            if correction and correction != clean_word:
-                                issues.append({
-                                    'slide': slide_index,
-                                    'issue': 'Misspelling',
-                                    'text': word,
-                                    'corrected': correction
-                                })
-    return issues
+def get_symspell_index():
+    # Index symmetric-delete dibangun saat pertama kali dipakai
+    return resources.get('symspell_index')
 
-def validate_spelling_in_text(text, slide_index):
-    issues = []
-    words = re.findall(r"\b[\w+]+\b", text)
-    for word in words:
+def __getattr__(name):
+    # `spell` tetap bisa diimpor seperti dulu, tetapi baru dibuat saat diminta
+    if name == 'spell':
+        return get_spell_checker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Cache koreksi dipakai bersama semua thread proses ini; worker proses hanya berbagi lewat SPELLING_CACHE_PATH
+correction_cache = CorrectionCache(SPELLING_CACHE_SIZE, SPELLING_CACHE_PATH)
+
+def _correct_normalized(word):
+    if SPELLING_BACKEND == "symspell":
+        return get_symspell_index().correction(word)
+    return get_spell_checker().correction(word)
+
+def cached_correction(word):
+    # spell.correction selalu bekerja dengan huruf kecil, jadi kunci cache dinormalisasi
+    correction = correction_cache.get(word.lower(), _correct_normalized)
+    if correction == word.lower():
+        # Kata yang tidak dicek (angka, kata terlalu panjang) dikembalikan apa adanya
+        return word
+    return correction
+
+def _lookup_correction(clean_word, vocabulary=None):
+    # Dengan vocabulary (mode deck), status kata sudah diselesaikan sekali per deck
+    if vocabulary is not None:
+        return vocabulary.get(clean_word)
+    if clean_word.lower() not in get_spell_checker():
+        return cached_correction(clean_word)
+    return None
+
+WORD_PATTERN = re.compile(r"\b[\w+]+\b")
+
+def _in_spans(start, end, spans):
+    # spans terurut dan tidak tumpang tindih
+    position = bisect.bisect_right(spans, (start, float('inf'))) - 1
+    return position >= 0 and spans[position][0] <= start and end <= spans[position][1]
+
+def iter_checked_words(text, exempt_spans=None):
+    """
+    Yield (word, clean_word, start, end) for every token of `text` that should be spell checked.
+
+    Tokens inside a multi-word technical term and exempt tokens (terms, numbers,
+    periods, dates) are skipped. `exempt_spans` can be passed when the phrase spans
+    were found on a longer text such as the whole paragraph.
+    """
+    if exempt_spans is None:
+        exempt_spans = exempt_phrase_spans(text)
+    for match in WORD_PATTERN.finditer(text):
+        if exempt_spans and _in_spans(match.start(), match.end(), exempt_spans):
+            continue
+        word = match.group()
         clean_word = word.strip(string.punctuation)
-        if clean_word.lower() not in spell:
-            correction = spell.correction(clean_word)
+        if is_exempt(clean_word):
+            continue
+        yield word, clean_word, match.start(), match.end()
+
+def iter_paragraph_runs(runs):
+    """
+    Yield (run, exempt_spans) for text frame runs, with phrase spans found once per
+    paragraph so a term split over several runs is still recognised.
+    """
+    paragraph = []
+    for run in runs:
+        if run.origin != TEXT_FRAME:
+            continue
+        if paragraph and (run.shape_id, run.shape_index, run.paragraph_index) != (paragraph[0].shape_id, paragraph[0].shape_index, paragraph[0].paragraph_index):
+            yield from _split_paragraph_spans(paragraph)
+            paragraph = []
+        paragraph.append(run)
+    if paragraph:
+        yield from _split_paragraph_spans(paragraph)
+
+def _split_paragraph_spans(paragraph):
+    spans = exempt_phrase_spans(''.join(run.text for run in paragraph))
+    offset = 0
+    for run in paragraph:
+        end = offset + len(run.text)
+        run_spans = tuple((max(start, offset) - offset, min(stop, end) - offset) for start, stop in spans if start < end and stop > offset)
+        yield run, run_spans
+        offset = end
+
+def validate_spelling_slide(slide_record, slide_index, vocabulary=None):
+    issues = []
+    for run, exempt_spans in iter_paragraph_runs(slide_record.runs):
+        for word, clean_word, start, end in iter_checked_words(run.text, exempt_spans):
+            correction = _lookup_correction(clean_word, vocabulary)
             if correction and correction != clean_word:
                 issues.append({
                     'slide': slide_index,
                     'issue': 'Misspelling',
                     'text': word,
-                    'corrected': correction
+                    'corrected': correction,
+                    'locations': [run_location(run, start, end)]
                 })
     return issues
+
+def validate_spelling_in_text(text, slide_index, vocabulary=None, run=None):
+    # `run` is the RunRecord the text came from (table cell, chart label), used for the issue locations
+    issues = []
+    for word, clean_word, start, end in iter_checked_words(text):
+        correction = _lookup_correction(clean_word, vocabulary)
+        if correction and correction != clean_word:
+            issue = {
+                'slide': slide_index,
+                'issue': 'Misspelling',
+                'text': word,
+                'corrected': correction
+            }
+            if run is not None:
+                issue['locations'] = [run_location(run, start, end)]
+            issues.append(issue)
+    return issues
+
+def build_deck_vocabulary(slide_records):
+    """
+    Resolve every distinct word of the deck once.
+
+    Parameters:
+    - slide_records: SlideRecord objects (text runs, table cells and chart labels).
+
+    Returns:
+    - dict mapping each misspelt word (as it appears after stripping punctuation)
+      to its correction. Pass it as `vocabulary` to the spelling validators.
+    """
+    return correct_words(unknown_words(slide_records))
+
+def checked_words(slide_records):
+    """
+    Distinct words the spelling validators look up in the records, in order of first appearance.
+
+    Phrase exemptions are found the way the validators find them: per paragraph
+    in text frames (validate_spelling_slide), per text in table cells and charts
+    (validate_spelling_in_text).
+    """
+    words = {}
+    for slide_record in slide_records:
+        for run, exempt_spans in iter_paragraph_runs(slide_record.runs):
+            for _, clean_word, _, _ in iter_checked_words(run.text, exempt_spans):
+                words.setdefault(clean_word)
+        for run in slide_record.runs:
+            if run.origin != TEXT_FRAME:
+                for _, clean_word, _, _ in iter_checked_words(run.text):
+                    words.setdefault(clean_word)
+    return list(words)
+
+def unknown_words(slide_records, seen=None):
+    """
+    Distinct words of the records that are not in the dictionary, in order of first appearance.
+
+    Parameters:
+    - slide_records: SlideRecord objects.
+    - seen: optional set of words already handled (e.g. found in earlier slides);
+      those are skipped and the new words are added to it.
+
+    Returns:
+    - list of words that need a correction lookup (see correct_words).
+    """
+    return filter_unknown(checked_words(slide_records), seen)
+
+def filter_unknown(words, seen=None):
+    """
+    The words (from checked_words) that are not in `seen` and not in the dictionary;
+    `seen` is updated with every new word.
+    """
+    seen = set() if seen is None else seen
+    new_words = [word for word in words if word not in seen]
+    seen.update(new_words)
+
+    # Satu panggilan berbasis set untuk semua kata baru
+    unknown = get_spell_checker().unknown(new_words)
+    return [word for word in new_words if word.lower() in unknown]
+
+def correct_words(words):
+    """
+    Look up corrections for unknown words (the expensive part of the deck vocabulary;
+    the pipeline runs it in the worker pool, in chunks).
+
+    Returns:
+    - dict mapping each misspelt word to its correction.
+    """
+    vocabulary = {}
+    for word in words:
+        correction = cached_correction(word)
+        if correction and correction != word:
+            vocabulary[word] = correction
+    logging.debug(f"Deck vocabulary: {len(words)} unknown words, {len(vocabulary)} misspelt")
+    return vocabulary
@@ -0,0 +1,120 @@
+# utils/symspell.py
+
+import string
+
+def _deletes(word, max_distance):
+    # Semua string yang didapat dengan menghapus sampai max_distance karakter
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+def edit_distance(source, target, max_distance):
+    """
+    Damerau-Levenshtein distance (adjacent transpositions allowed anywhere in the
+    edit path), the same metric pyspellchecker reaches by chaining single edits.
+    Returns max_distance + 1 when the lengths alone already exceed the limit.
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+    big = len(source) + len(target)
+    last_row_of = {}
+    rows = [[big] * (len(target) + 2)]
+    rows.append([big] + list(range(len(target) + 1)))
+    for i in range(1, len(source) + 1):
+        row = [big, i] + [0] * len(target)
+        last_match_col = 0
+        for j in range(1, len(target) + 1):
+            k = last_row_of.get(target[j - 1], 0)
+            l = last_match_col
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            if cost == 0:
+                last_match_col = j
+            row[j + 1] = min(
+                rows[i][j] + cost,
+                row[j] + 1,
+                rows[i][j + 1] + 1,
+                rows[k][l] + (i - k - 1) + 1 + (j - l - 1),
+            )
+        rows.append(row)
+        last_row_of[source[i - 1]] = i
+    return rows[len(source) + 1][len(target) + 1]
+
+class SymSpellIndex:
+    """
+    Symmetric-delete correction index that answers like SpellChecker.correction().
+
+    Parameters:
+    - word_frequency: mapping of lower-cased word to its frequency.
+    - max_distance: maximum edit distance for suggestions (pyspellchecker uses 2).
+    - prefix_length: only this many leading characters are indexed, which keeps
+      the index small without losing candidates.
+    """
+
+    def __init__(self, word_frequency, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._frequency = dict(word_frequency)
+        self._longest_word_length = max((len(word) for word in self._frequency), default=0)
+        self._index = {}
+        for word in self._frequency:
+            if not self._should_check(word):
+                continue
+            for key in _deletes(word[:prefix_length], max_distance):
+                self._index.setdefault(key, []).append(word)
+
+    def __len__(self):
+        return len(self._index)
+
+    def _should_check(self, word):
+        # Aturan yang sama dengan SpellChecker._check_if_should_check
+        if len(word) == 1 and word in string.punctuation:
+            return False
+        if len(word) > self._longest_word_length + 3:
+            return False
+        if word.lower() == 'nan':
+            return True
+        try:
+            float(word)
+            return False
+        except ValueError:
+            pass
+        return True
+
+    def candidates(self, word):
+        """
+        Return the known words closest to `word` (distance 1 first, then 2), or None.
+        """
+        lowered = word.lower()
+        if lowered in self._frequency and self._should_check(lowered):
+            return {word}
+        if not self._should_check(word):
+            return {word}
+        word = lowered
+
+        by_distance = {}
+        seen = set()
+        for key in _deletes(word[:self.prefix_length], self.max_distance):
+            for candidate in self._index.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = edit_distance(word, candidate, self.max_distance)
+                if distance <= self.max_distance:
+                    by_distance.setdefault(distance, set()).add(candidate)
+        for distance in sorted(by_distance):
+            return by_distance[distance]
+        return None
+
+    def correction(self, word):
+        candidates = self.candidates(word)
+        if not candidates:
+            return None
+        # Pemecah seri sama seperti pyspellchecker: frekuensi tertinggi, lalu urutan alfabet
+        return max(sorted(candidates), key=lambda candidate: self._frequency.get(candidate, 0))
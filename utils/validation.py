@@ -1,47 +1,72 @@
 import re        
 import logging        
 import string        
-import pandas as pd  # Pastikan pandas diimpor    
 from utils.spelling_validation import validate_spelling_slide, validate_spelling_in_text        
-from utils.million_notation_validation import validate_million_notations  # Pastikan ini ada  
+from utils.million_notation_validation import validate_chart_million_notations, validate_column_million_notations  # Pastikan ini ada  
+from utils.decimal_validation import validate_decimals_in_text, validate_number_format, validate_column_decimals  
+from utils.extraction import iter_runs, run_location, table_columns, TABLE_CELL, CHART_ORIGINS, CHART_NUMBER_FORMAT  
   
-def validate_tables(slide, slide_index):    
+def validate_tables(slide_record, slide_index, vocabulary=None, decimal_places=None):    
+    """  
+    Validate the tables of a slide.  
+  
+    Every distinct cell text is spell checked once (headers and row labels repeat  
+    across large tables); the issue lists every cell holding it. Decimal precision  
+    and million notations are compared within each column, not against the rest  
+    of the slide.  
+  
+    Parameters:  
+    - slide_record: SlideRecord of the slide.  
+    - vocabulary: deck vocabulary (see build_deck_vocabulary), if any.  
+    - decimal_places: configured decimal places, used when a column has no majority precision.  
+    """  
     issues = []        
-    for shape in slide.shapes:        
-        if shape.has_table:        
-            table = shape.table        
-            for row in table.rows:        
-                for cell in row.cells:        
-                    # Validasi teks di dalam sel        
-                    text = cell.text.strip()        
-                    if text:  # Jika ada teks        
-                        issues.extend(validate_spelling_in_text(text, slide_index))        
-            
-    # Validasi notasi juta menggunakan objek slide      
-    issues.extend(validate_million_notations(slide, slide_index))  # Memanggil fungsi baru dengan objek slide        
-            
+    texts = {}  
+    for cell in iter_runs(slide_record, TABLE_CELL):  
+        if cell.text.strip():  # Jika ada teks        
+            texts.setdefault(cell.text, []).append(cell)  
+  
+    # Validasi ejaan per teks sel unik (teks utuh, supaya posisi kata cocok dengan isi sel)        
+    issues.extend(_spelling_issues(texts, slide_index, vocabulary))  
+  
+    # Aturan angka per kolom: presisi desimal dan notasi juta  
+    for columns in table_columns(slide_record).values():  
+        for col_index, column in enumerate(columns):  
+            issues.extend(validate_column_decimals(column, slide_index, col_index + 1, decimal_places))  
+            issues.extend(validate_column_million_notations(column, slide_index, col_index + 1))  
     return issues        
   
-def validate_charts(slide, slide_index):    
+def _spelling_issues(texts, slide_index, vocabulary=None):  
+    # Satu pengecekan per teks unik; locations diperluas ke semua run yang memuat teks itu  
+    issues = []  
+    for text, runs in texts.items():  
+        for issue in validate_spelling_in_text(text, slide_index, vocabulary, runs[0]):  
+            location = issue['locations'][0]  
+            issue['locations'] = [run_location(run, location['start'], location['end']) for run in runs]  
+            issues.append(issue)  
+    return issues  
+  
+def validate_charts(slide_record, slide_index, vocabulary=None, decimal_places=None):    
     issues = []        
-    for shape in slide.shapes:        
-        if shape.has_chart:        
-            chart = shape.chart        
-            # Validasi data di dalam chart        
-            for series in chart.series:        
-                for point in series.points:        
-                    label = point.data_label.text.strip()        
-                    if label:        
-                        issues.extend(validate_spelling_in_text(label, slide_index))        
-            # Jika chart memiliki data yang ditampilkan dalam tabel, validasi juga        
-            if chart.has_data_table:        
-                for row in chart.data_table.rows:        
-                    for cell in row.cells:        
-                        text = cell.text.strip()        
-                        if text:        
-                            issues.extend(validate_spelling_in_text(text, slide_index))        
-            
-    # Validasi notasi juta menggunakan objek slide      
-    issues.extend(validate_million_notations(slide, slide_index))  # Memanggil fungsi baru dengan objek slide        
-            
-    return issues
+    # Teks chart dikumpulkan sekali per teks unik (kategori dan label sering berulang); semua posisinya masuk locations  
+    texts = {}  
+    number_formats = {}  
+    for run in slide_record.runs:  
+        if run.origin == CHART_NUMBER_FORMAT:  
+            number_formats.setdefault(run.text, []).append(run)  
+        elif run.origin in CHART_ORIGINS and run.text.strip():  
+            texts.setdefault(run.text, []).append(run)  
+  
+    # Validasi ejaan judul, sumbu, kategori, nama series dan label data  
+    issues.extend(_spelling_issues(texts, slide_index, vocabulary))  
+  
+    # Validasi desimal pada teks chart dan format angka yang tersimpan di chart  
+    if decimal_places is not None:  
+        for text, runs in texts.items():  
+            issues.extend(validate_decimals_in_text(text, slide_index, decimal_places, runs))  
+        for format_code, runs in number_formats.items():  
+            issues.extend(validate_number_format(format_code, slide_index, decimal_places, runs))  
+  
+    # Validasi notasi juta di dalam chart (text frame slide sudah dicek validate_million_notations)  
+    issues.extend(validate_chart_million_notations(texts, number_formats, slide_index))  
+    return issues  
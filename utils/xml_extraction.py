@@ -0,0 +1,148 @@
+# utils/xml_extraction.py
+
+import posixpath
+import zipfile
+from lxml import etree
+from utils.extraction import RunRecord, SlideRecord, TEXT_FRAME, TABLE_CELL, chart_records, text_body_text
+
+_NS = {
+    'p': "http://schemas.openxmlformats.org/presentationml/2006/main",
+    'a': "http://schemas.openxmlformats.org/drawingml/2006/main",
+    'c': "http://schemas.openxmlformats.org/drawingml/2006/chart",
+    'r': "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    'rel': "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+def _qn(tag):
+    prefix, name = tag.split(':')
+    return f"{{{_NS[prefix]}}}{name}"
+
+# Elemen anak p:spTree yang dianggap shape oleh python-pptx (slide.shapes)
+_SHAPE_TAGS = tuple(_qn(tag) for tag in ('p:sp', 'p:grpSp', 'p:graphicFrame', 'p:cxnSp', 'p:pic', 'p:contentPart'))
+_SP_TREE = _qn('p:spTree')
+_TABLE_URI = "http://schemas.openxmlformats.org/drawingml/2006/table"
+_CHART_URI = "http://schemas.openxmlformats.org/drawingml/2006/chart"
+
+def _read_relationships(package, partname):
+    """
+    Return {rId: member name} for the internal relationships of a part.
+    """
+    directory, name = posixpath.split(partname)
+    rels_name = posixpath.join(directory, '_rels', f"{name}.rels")
+    if rels_name not in package.NameToInfo:
+        return {}
+    relationships = {}
+    root = etree.fromstring(package.read(rels_name))
+    for relationship in root.iterfind('rel:Relationship', _NS):
+        if relationship.get('TargetMode') == 'External':
+            continue
+        target = relationship.get('Target')
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        relationships[relationship.get('Id')] = target
+    return relationships
+
+def slide_partnames(package):
+    """
+    Member names of the slides in presentation order (p:sldIdLst), as python-pptx numbers them.
+    """
+    relationships = _read_relationships(package, 'ppt/presentation.xml')
+    root = etree.fromstring(package.read('ppt/presentation.xml'))
+    return [relationships[slide_id.get(_qn('r:id'))] for slide_id in root.iterfind('p:sldIdLst/p:sldId', _NS)]
+
+def _text_frame_records(shape, shape_id, shape_index):
+    text_body = shape.find('p:txBody', _NS)
+    if text_body is None:
+        return
+    for paragraph_index, paragraph in enumerate(text_body.iterfind('a:p', _NS)):
+        for run_index, run in enumerate(paragraph.iterfind('a:r', _NS)):
+            latin = run.find('a:rPr/a:latin', _NS)
+            font_name = latin.get('typeface') if latin is not None else None
+            yield RunRecord(run.findtext('a:t', '', _NS), font_name, shape_id, paragraph_index, run_index, TEXT_FRAME, None, shape_index)
+
+def _table_records(table, shape_id, shape_index):
+    for row_index, row in enumerate(table.iterfind('a:tr', _NS)):
+        for col_index, cell in enumerate(row.iterfind('a:tc', _NS)):
+            yield RunRecord(text_body_text(cell.find('a:txBody', _NS)), None, shape_id, None, None, TABLE_CELL, (row_index, col_index), shape_index)
+
+def _chart_part_records(package, chart_partname, shape_id, shape_index):
+    # Chart part dibaca utuh sekali; semua teks chart diambil dalam satu lintasan
+    with package.open(chart_partname) as stream:
+        chart_space = etree.parse(stream).getroot()
+    return chart_records(chart_space, shape_id, shape_index)
+
+def _shape_records(package, shape, shape_index, relationships):
+    if shape.tag == _qn('p:sp'):
+        shape_id = int(shape.find('p:nvSpPr/p:cNvPr', _NS).get('id'))
+        yield from _text_frame_records(shape, shape_id, shape_index)
+    elif shape.tag == _qn('p:graphicFrame'):
+        shape_id = int(shape.find('p:nvGraphicFramePr/p:cNvPr', _NS).get('id'))
+        graphic_data = shape.find('a:graphic/a:graphicData', _NS)
+        uri = graphic_data.get('uri') if graphic_data is not None else None
+        if uri == _TABLE_URI:
+            table = graphic_data.find('a:tbl', _NS)
+            if table is not None:
+                yield from _table_records(table, shape_id, shape_index)
+        elif uri == _CHART_URI:
+            chart = graphic_data.find('c:chart', _NS)
+            chart_partname = relationships.get(chart.get(_qn('r:id'))) if chart is not None else None
+            if chart_partname in package.NameToInfo:
+                yield from _chart_part_records(package, chart_partname, shape_id, shape_index)
+
+def extract_slide_part(package, partname, slide_index):
+    """
+    Extract one slide straight from its XML part, without python-pptx objects.
+
+    The part is parsed incrementally: every top-level shape is turned into
+    RunRecords as soon as its closing tag is read and then cleared, so only one
+    shape is held in memory at a time. Tables are read from the slide part and
+    chart text from the chart part the shape refers to; media parts are never
+    opened.
+
+    Parameters:
+    - package: open zipfile.ZipFile of the .pptx.
+    - partname: member name of the slide, e.g. "ppt/slides/slide3.xml".
+    - slide_index: 1-based slide number used in the issues.
+
+    Returns:
+    - SlideRecord equal to what utils.extraction.extract_slide produces.
+    """
+    relationships = _read_relationships(package, partname)
+    runs = []
+    # Posisi shape di slide.shapes (semua jenis shape tingkat atas, termasuk gambar dan group)
+    shape_index = 0
+    with package.open(partname) as stream:
+        for _, shape in etree.iterparse(stream, events=('end',), tag=_SHAPE_TAGS):
+            parent = shape.getparent()
+            # Shape di dalam group tidak termasuk slide.shapes; dibersihkan bersama group-nya
+            if parent is None or parent.tag != _SP_TREE:
+                continue
+            runs.extend(_shape_records(package, shape, shape_index, relationships))
+            shape_index += 1
+            shape.clear()
+            while shape.getprevious() is not None:
+                del parent[0]
+    return SlideRecord(slide_index, tuple(runs))
+
+def iter_slide_records(source, start_slide=1, end_slide=None):
+    """
+    Yield SlideRecords for a slide range of a .pptx, one slide at a time.
+
+    Parameters:
+    - source: path or binary file object of the deck.
+    - start_slide, end_slide: 1-based inclusive range (default: every slide).
+    """
+    with zipfile.ZipFile(source) as package:
+        partnames = slide_partnames(package)
+        end_slide = min(end_slide or len(partnames), len(partnames))
+        for slide_number in range(start_slide, end_slide + 1):
+            yield extract_slide_part(package, partnames[slide_number - 1], slide_number)
+
+def count_slides(source):
+    """
+    Number of slides of a .pptx, read from ppt/presentation.xml only.
+    """
+    with zipfile.ZipFile(source) as package:
+        return len(slide_partnames(package))